@@ -0,0 +1,341 @@
+"""
+Mode batch - Optimisateur d'investissement
+Résolution non interactive de plusieurs datasets × algorithmes × budgets
+dans un pool de processus
+
+Exemple:
+    python batch.py --datasets "data/*.csv" --algorithms greedy dynamic_programming \
+        --budgets 300000 500000 --workers 4 --timeout 60 --output-dir results/batch
+"""
+import argparse
+import contextlib
+import functools
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from controllers.algorithm_controller import AlgorithmController, BRUTE_FORCE_MAX_ACTIONS
+from controllers.export_controller import ExportController
+from controllers.file_controller import FileController
+from utils.calibration import calibrate, load_rates
+from utils.checkpoint import CHECKPOINT_INTERVAL, SolveCheckpoints
+from utils.dataset_cache import DatasetCache
+from utils.dp_table import DP_STORAGES
+from utils.instance_generator import load_instance_metadata
+from utils.metrics import SolverMetrics
+from utils.profiler import PROFILE_ENV, PROFILE_MODES
+from utils.progress import CallbackProgress
+from utils.result_cache import ResultCache
+from views.console_view import ConsoleView
+
+ALGORITHMS = AlgorithmController.ALGORITHMS
+
+
+def emit_progress(dataset, algorithm_name, budget, event):
+    """Écrit un événement de progression (JSON Lines sur stderr, stdout reste aux résultats)"""
+    line = json.dumps(
+        {'dataset': dataset, 'algorithm': algorithm_name, 'budget': budget, **event},
+        ensure_ascii=False
+    )
+    print(line, file=sys.stderr, flush=True)
+
+
+def run_job(dataset, algorithm_name, budget, timeout=None, use_cache=True, memory_limit_mb=None,
+            collect_metrics=False, report_progress=False, checkpoints=None, dp_storage='dict',
+            dp_memory_mb=None, brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS):
+    """
+    Worker: charge un dataset et exécute un algorithme
+
+    La résolution tourne dans un processus isolé (délai strict, mémoire
+    plafonnée): un dataset pathologique produit un statut 'timeout' ou
+    'out_of_memory' sans faire tomber le worker ni le batch.
+
+    Returns:
+        dict: statut, totaux et portefeuille (pour l'export), et instantané
+        des métriques du job si collect_metrics (fusionné par le parent)
+    """
+    result = {
+        'dataset': dataset,
+        'algorithm': algorithm_name,
+        'budget': budget,
+        'status': 'ok',
+        'n_actions': 0,
+        'portfolio': None,
+        'execution_time': 0.0,
+        'error': None,
+        'metrics': None
+    }
+    metrics = SolverMetrics() if collect_metrics else None
+    progress = None
+    if report_progress:
+        # Fonction de module partielle: transmissible au processus isolé
+        progress = CallbackProgress(functools.partial(emit_progress, dataset, algorithm_name, budget))
+    start_time = time.perf_counter()
+    try:
+        # Les contrôleurs affichent leur progression: inutile en batch
+        with contextlib.redirect_stdout(io.StringIO()):
+            cache = DatasetCache() if use_cache else None
+            actions = FileController.load_store(
+                dataset, cache=cache, verbose=False, budget=budget, metrics=metrics
+            ).to_actions()
+            result['n_actions'] = len(actions)
+
+            controller = AlgorithmController(
+                budget=budget, result_cache=ResultCache() if use_cache else None, metrics=metrics,
+                progress=progress, checkpoints=checkpoints,
+                dp_storage=dp_storage, dp_memory_mb=dp_memory_mb,
+                brute_force_max_actions=brute_force_max_actions
+            )
+            if controller.profiler is not None:
+                controller.profiler.dataset_name = dataset
+            portfolio, execution_time = controller.execute_algorithm(
+                algorithm_name, actions,
+                isolated=True, timeout=timeout, memory_limit_mb=memory_limit_mb
+            )
+
+        result['status'] = portfolio.status
+        result['execution_time'] = execution_time
+        if portfolio.status == 'ok':
+            result['portfolio'] = portfolio
+        else:
+            result['error'] = portfolio.error
+    except MemoryError:
+        result['status'] = 'out_of_memory'
+        result['execution_time'] = time.perf_counter() - start_time
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+        result['execution_time'] = time.perf_counter() - start_time
+
+    if metrics is not None:
+        if result['status'] in ('error', 'out_of_memory') and not result['n_actions']:
+            # Échec avant la résolution (chargement)
+            metrics.observe_solve(algorithm_name, 0, result['execution_time'], result['status'])
+        result['metrics'] = metrics.registry.snapshot()
+    return result
+
+
+def expand_datasets(patterns):
+    """Développe les motifs glob en une liste triée de fichiers supportés"""
+    files = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            if path.lower().endswith(('.xlsx', '.xls', '.csv')) and path not in files:
+                files.append(path)
+    return files
+
+
+def dataset_budgets(dataset, args):
+    """Budgets d'un dataset: celui de l'instance générée si demandé, sinon --budgets"""
+    if args.instance_budget:
+        metadata = load_instance_metadata(dataset)
+        if metadata is not None:
+            return [metadata['budget']]
+    return args.budgets
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Résolution non interactive de portefeuilles (datasets × algorithmes × budgets)"
+    )
+    parser.add_argument('--datasets', nargs='+', default=['data/*.csv'],
+                        help="Fichiers ou motifs glob (défaut: data/*.csv)")
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHMS,
+                        default=['dynamic_programming', 'greedy'])
+    parser.add_argument('--budgets', nargs='+', type=int, default=[500000])
+    parser.add_argument('--instance-budget', action='store_true',
+                        help="Instances générées: budget du fichier compagnon .json au lieu de --budgets")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Limite de temps par résolution (secondes)")
+    parser.add_argument('--memory-limit-mb', type=float, default=None,
+                        help="Plafond mémoire (RLIMIT_AS) de chaque résolution (Mo)")
+    parser.add_argument('--output-dir', default=os.path.join('results', 'batch'))
+    parser.add_argument('--format', choices=ExportController.FORMATS, default='jsonl')
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Désactiver les caches de datasets et de résultats")
+    parser.add_argument('--calibrate', action='store_true',
+                        help="Calibrer les débits de la machine avant le batch")
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=None,
+                        help="Profiler chaque résolution dans results/profiles/ (défaut: cprofile)")
+    parser.add_argument('--metrics-file', default=None,
+                        help="Exporter les métriques OpenMetrics dans ce fichier (mis à jour à chaque job)")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Servir les métriques OpenMetrics sur http://127.0.0.1:PORT/metrics pendant le batch")
+    parser.add_argument('--progress', action='store_true',
+                        help="Progression des résolutions en JSON Lines sur stderr (débit, temps restant)")
+    parser.add_argument('--checkpoint-interval', type=float, default=None,
+                        help="Enregistrer un point de reprise (force brute, DP) toutes les N secondes")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reprendre les résolutions interrompues (délai dépassé, batch arrêté; "
+                             "force brute et DP par dictionnaire)")
+    parser.add_argument('--brute-force-max-actions', type=int, default=BRUTE_FORCE_MAX_ACTIONS,
+                        help="Taille maximale de la force brute (au-delà de 20: avec --checkpoint-interval)")
+    parser.add_argument('--dp-storage', choices=DP_STORAGES, default='dict',
+                        help="DP par dictionnaire, par tables NumPy, ou tables avec décisions sur disque")
+    parser.add_argument('--dp-memory-mb', type=float, default=None,
+                        help="Budget mémoire de la DP par tables (Mo, défaut: moitié du plafond)")
+    parser.add_argument('--estimate-only', action='store_true',
+                        help="Afficher les temps/mémoires estimés (JSON Lines) sans résoudre")
+    return parser.parse_args(argv)
+
+
+def estimate_jobs(jobs, use_cache=True):
+    """
+    Prévisions par résolution, sans rien exécuter (pour un ordonnanceur)
+
+    Yields:
+        dict: dataset, algorithme, budget, nombre d'actions, temps et mémoire estimés
+    """
+    cache = DatasetCache() if use_cache else None
+    loaded = {}
+    for dataset, algorithm_name, budget in jobs:
+        if (dataset, budget) not in loaded:
+            actions = FileController.load_store(
+                dataset, cache=cache, verbose=False, budget=budget
+            ).to_actions()
+            controller = AlgorithmController(budget=budget)
+            loaded[dataset, budget] = (actions, controller, controller.plan(actions))
+        actions, controller, plan = loaded[dataset, budget]
+
+        if algorithm_name == "race":
+            estimate = plan['estimates'].get("race")
+        else:
+            estimate = controller.estimate(algorithm_name, actions)
+        yield {
+            'dataset': dataset,
+            'algorithm': algorithm_name,
+            'budget': budget,
+            'n_actions': len(actions),
+            'estimated_time': estimate['time'] if estimate else None,
+            'estimated_memory_mb': estimate['memory_mb'] if estimate else None,
+            'calibrated': plan['calibrated']
+        }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    datasets = expand_datasets(args.datasets)
+    if not datasets:
+        ConsoleView.display_error(f"Aucun dataset trouvé pour: {' '.join(args.datasets)}")
+        return 1
+
+    jobs = [
+        (dataset, algorithm_name, budget)
+        for dataset in datasets
+        for budget in dataset_budgets(dataset, args)
+        for algorithm_name in args.algorithms
+    ]
+
+    if args.calibrate:
+        with contextlib.redirect_stdout(sys.stderr):
+            calibrate()
+    elif load_rates() is None:
+        print("[INFO] Machine non calibree: estimations par defaut (--calibrate)", file=sys.stderr)
+
+    if args.estimate_only:
+        with contextlib.redirect_stdout(io.StringIO()):
+            estimates = list(estimate_jobs(jobs, use_cache=not args.no_cache))
+        for row in estimates:
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+
+    # Variable d'environnement: héritée par les workers et leurs processus isolés
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = os.path.join(args.output_dir, f"batch_{stamp}.{args.format}")
+
+    # Pré-chargement: chaque dataset est analysé une seule fois, les workers lisent le cache
+    if not args.no_cache:
+        cache = DatasetCache()
+        for dataset in datasets:
+            FileController.load_store(dataset, cache=cache, verbose=False)
+
+    ConsoleView.display_info(
+        f"{len(jobs)} résolutions ({len(datasets)} datasets) sur {args.workers} processus"
+    )
+    collect_metrics = bool(args.metrics_file or args.metrics_port)
+    metrics = SolverMetrics() if collect_metrics else None
+    checkpoints = None
+    if args.checkpoint_interval is not None or args.resume:
+        interval = CHECKPOINT_INTERVAL if args.checkpoint_interval is None else args.checkpoint_interval
+        checkpoints = SolveCheckpoints(interval=interval, resume=args.resume)
+    server = None
+    if args.metrics_port:
+        server = metrics.registry.serve(args.metrics_port)
+        ConsoleView.display_info(f"Métriques: http://127.0.0.1:{args.metrics_port}/metrics")
+
+    start_time = time.perf_counter()
+    rows = []
+    # Parquet ne supporte pas l'ajout: écriture unique en fin de batch
+    pending = []
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                run_job, dataset, algorithm_name, budget,
+                args.timeout, not args.no_cache, args.memory_limit_mb, collect_metrics,
+                args.progress, checkpoints, args.dp_storage, args.dp_memory_mb,
+                args.brute_force_max_actions
+            ): (dataset, algorithm_name, budget)
+            for dataset, algorithm_name, budget in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # Worker tué pendant le chargement (ex: OOM killer)
+                dataset, algorithm_name, budget = futures[future]
+                result = {
+                    'dataset': dataset, 'algorithm': algorithm_name, 'budget': budget,
+                    'status': 'error', 'n_actions': 0, 'portfolio': None,
+                    'execution_time': 0.0, 'error': str(e), 'metrics': None
+                }
+                if metrics is not None:
+                    metrics.observe_solve(algorithm_name, 0, 0.0, 'error')
+            rows.append(result)
+
+            if metrics is not None:
+                if result['metrics']:
+                    metrics.registry.merge(result['metrics'])
+                if args.metrics_file:
+                    metrics.registry.write(args.metrics_file)
+
+            if result['status'] != 'ok':
+                continue
+            export = ExportController.make_result(
+                os.path.basename(result['dataset']),
+                result['algorithm'],
+                result['portfolio'],
+                result['execution_time'],
+                result['budget']
+            )
+            if args.format == 'parquet':
+                pending.append(export)
+            else:
+                # Écriture au fil de l'eau: un job terminé est immédiatement sur disque
+                ExportController.export(output_file, [export], fmt=args.format, append=True)
+
+    if pending:
+        ExportController.export(output_file, pending, fmt=args.format)
+
+    ConsoleView.display_batch_summary(rows, time.perf_counter() - start_time)
+    ConsoleView.display_success(f"Résultats: {output_file}")
+    if args.metrics_file:
+        ConsoleView.display_success(f"Métriques: {args.metrics_file}")
+    if server is not None:
+        server.shutdown()
+    return 0 if all(row['status'] == 'ok' for row in rows) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
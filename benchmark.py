@@ -0,0 +1,251 @@
+"""
+Banc d'essai des solveurs de production
+Mesure AlgorithmController et BruteForceController sur une grille (n, budget)
+d'instances générées avec une graine fixe, et détecte les régressions
+
+Exemples:
+    python benchmark.py run --repeats 7 --output results/benchmarks/courant.json
+    python benchmark.py compare results/benchmarks/reference.json results/benchmarks/courant.json \
+        --threshold 0.10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from controllers.algorithm_controller import AlgorithmController, solver_version
+from controllers.brute_force_controller import BruteForceController
+from utils.calibration import benchmark_instance, host_id
+from utils.instance_generator import INSTANCE_CLASSES, generate_actions
+from views.console_view import ConsoleView
+
+# Version du format des fichiers de résultats
+BENCHMARK_FORMAT = 1
+
+# Solveurs mesurés: clé -> méthode appelée sur (contrôleur, actions, budget)
+SOLVERS = {
+    "brute_force": lambda controller, actions, budget: controller.brute_force(actions),
+    "brute_force_controller": lambda controller, actions, budget:
+        BruteForceController().optimize(actions, budget),
+    "dynamic_programming": lambda controller, actions, budget: controller.dynamic_programming(actions),
+    "branch_and_bound": lambda controller, actions, budget: controller.branch_and_bound(actions),
+    "greedy": lambda controller, actions, budget: controller.greedy_optimized(actions)
+}
+
+# Planificateur: clé du modèle de coût pour chaque solveur mesuré
+PLANNER_KEYS = {"brute_force_controller": "brute_force"}
+
+
+def machine_tag():
+    """Description de la machine jointe aux résultats"""
+    return {
+        'host': host_id(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'solver_version': solver_version()
+    }
+
+
+def percentile(sorted_values, fraction):
+    """Percentile par interpolation linéaire (valeurs triées)"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Médiane, écart interquartile, p95, min et max (secondes)"""
+    ordered = sorted(samples)
+    return {
+        'median': statistics.median(ordered),
+        'iqr': percentile(ordered, 0.75) - percentile(ordered, 0.25),
+        'p95': percentile(ordered, 0.95),
+        'min': ordered[0],
+        'max': ordered[-1]
+    }
+
+
+def case_instance(n, instance_class=None):
+    """Instance d'une case: référence de la calibration ou classe difficile (graine fixe)"""
+    if instance_class is None:
+        return benchmark_instance(n)
+    return generate_actions(instance_class, n)
+
+
+def measure_case(solver_name, n, budget, warmup, repeats, instance_class=None):
+    """
+    Mesure un solveur sur une instance
+
+    Les exécutions chronométrées se font sans tracemalloc; une exécution
+    supplémentaire mesure le pic d'allocation.
+    """
+    actions = case_instance(n, instance_class)
+    controller = AlgorithmController(budget=budget)
+    solve = SOLVERS[solver_name]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            solve(controller, actions, budget)
+
+        samples = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            solve(controller, actions, budget)
+            samples.append(time.perf_counter() - start_time)
+
+        tracemalloc.start()
+        try:
+            solve(controller, actions, budget)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'solver': solver_name,
+        'instance_class': instance_class,
+        'n': n,
+        'budget': budget,
+        'repeats': repeats,
+        'samples': samples,
+        'stats': summarize(samples),
+        'peak_memory_mb': peak / (1024 * 1024)
+    }
+
+
+def run(args):
+    cases = []
+    skipped = []
+    for solver_name in args.solvers:
+        for n in args.sizes:
+            for budget in args.budgets:
+                if solver_name.startswith("brute_force") and n > 20:
+                    continue
+                # Cases trop longues d'après le modèle de coût calibré
+                controller = AlgorithmController(budget=budget)
+                estimate = controller.estimate(
+                    PLANNER_KEYS.get(solver_name, solver_name), case_instance(n, args.instance_class)
+                )
+                if estimate['time'] * (args.repeats + args.warmup) > args.max_case_seconds:
+                    skipped.append((solver_name, n, budget, estimate['time']))
+                    continue
+
+                case = measure_case(solver_name, n, budget, args.warmup, args.repeats,
+                                    args.instance_class)
+                cases.append(case)
+                print(f"  {solver_name:<24} n={n:<6} W={budget:<9,} "
+                      f"médiane {case['stats']['median'] * 1000:10.3f} ms", file=sys.stderr)
+
+    report = {
+        'format': BENCHMARK_FORMAT,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_tag(),
+        'settings': {'warmup': args.warmup, 'repeats': args.repeats,
+                     'instance_class': args.instance_class},
+        'cases': cases
+    }
+
+    output = args.output or os.path.join(
+        'results', 'benchmarks',
+        f"bench_{host_id()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=1)
+
+    ConsoleView.display_benchmark_results(cases)
+    for solver_name, n, budget, estimated in skipped:
+        ConsoleView.display_warning(
+            f"Ignoré: {solver_name} n={n} W={budget:,} (~{estimated:.1f}s par exécution estimées)"
+        )
+    ConsoleView.display_success(f"Résultats: {output}")
+    return 0
+
+
+def compare(args):
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    with open(args.current, 'r', encoding='utf-8') as file:
+        current = json.load(file)
+
+    if baseline['machine']['host'] != current['machine']['host']:
+        ConsoleView.display_warning(
+            f"Machines différentes ({baseline['machine']['host']} / {current['machine']['host']}): "
+            "comparaison peu significative"
+        )
+
+    def case_key(case):
+        return case['solver'], case.get('instance_class'), case['n'], case['budget']
+
+    reference = {case_key(c): c for c in baseline['cases']}
+    rows = []
+    for case in current['cases']:
+        key = case_key(case)
+        if key not in reference:
+            continue
+        before = reference[key]['stats']
+        after = case['stats']
+        ratio = after['median'] / before['median'] if before['median'] > 0 else 1.0
+        # Régression: médiane plus lente au-delà du seuil ET au-delà du bruit (IQR des deux séries)
+        regression = (ratio > 1 + args.threshold
+                      and after['median'] - before['median'] > before['iqr'] + after['iqr'])
+        rows.append({
+            'solver': case['solver'],
+            'n': case['n'],
+            'budget': case['budget'],
+            'before': before['median'],
+            'after': after['median'],
+            'ratio': ratio,
+            'regression': regression
+        })
+
+    ConsoleView.display_benchmark_comparison(rows, args.threshold)
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des solveurs de production")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Mesurer les solveurs")
+    run_parser.add_argument('--solvers', nargs='+', choices=list(SOLVERS), default=list(SOLVERS))
+    run_parser.add_argument('--sizes', nargs='+', type=int, default=[10, 16, 50, 200])
+    run_parser.add_argument('--budgets', nargs='+', type=int, default=[100000, 500000])
+    run_parser.add_argument('--instance-class', choices=INSTANCE_CLASSES, default=None,
+                            help="Classe d'instances difficiles (défaut: instance de calibration)")
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--repeats', type=int, default=7)
+    run_parser.add_argument('--max-case-seconds', type=float, default=20.0,
+                            help="Ignorer les cases dont la durée estimée dépasse cette limite")
+    run_parser.add_argument('--output', default=None)
+
+    compare_parser = commands.add_parser('compare', help="Comparer à une référence")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Ralentissement relatif toléré (0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        return run(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
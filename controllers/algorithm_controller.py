@@ -1,39 +1,196 @@
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import signal
 import time
-from itertools import combinations
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+from controllers.planner_controller import BRUTE_FORCE_MAX_ACTIONS, PlannerController
 from models.portfolio import Portfolio
+from utils.calibration import format_duration
+from utils.cancellation import CancellationToken, SolveCancelled
+from utils import dp_table
+from utils.checkpoint import DISABLED_CHECKPOINTS
+from utils.exhaustive import best_subset
+from utils.metrics import DISABLED_METRICS
+from utils.performance_tracker import DISABLED_TRACKER
+from utils.profiler import SolveProfiler
+from utils.progress import NULL_PROGRESS
+from utils.result_cache import dataset_digest
+
+# À incrémenter lors d'un changement de comportement des solveurs
+SOLVER_VERSION = "1"
+
+
+# Fréquence des vérifications d'annulation dans les boucles internes
+CANCEL_CHECK_INTERVAL = 4096
+
+
+# Modules dont le source change les résultats des solveurs (chemins depuis la racine)
+SOLVER_MODULES = (
+    "controllers/algorithm_controller.py",
+    "controllers/race_controller.py",
+    "controllers/planner_controller.py",
+    "utils/dp_table.py",
+    "utils/knapsack_bounds.py",
+    "utils/checkpoint.py",
+    "utils/exhaustive.py",
+    "models/action.py",
+    "models/portfolio.py",
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=1)
+def solver_version():
+    """Version du code des solveurs: constante + empreinte du source des modules des solveurs"""
+    source_hash = hashlib.blake2b(digest_size=8)
+    for module in SOLVER_MODULES:
+        with open(os.path.join(ROOT_DIR, module), 'rb') as file:
+            source_hash.update(module.encode('utf-8'))
+            source_hash.update(file.read())
+    return f"{SOLVER_VERSION}-{source_hash.hexdigest()}"
+
+
+def _limit_memory(memory_limit_mb):
+    """Plafonne l'espace d'adressage du processus courant (RLIMIT_AS)"""
+    try:
+        import resource
+    except ImportError:
+        return  # Non disponible sous Windows
+    limit = int(memory_limit_mb * 1024 * 1024)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _isolated_worker(algorithm_name, actions, budget, dp_precision, memory_limit_mb, connection,
+                     profiler=None, progress=None, checkpoints=None, dp_storage='dict',
+                     dp_memory_mb=None, brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS):
+    """
+    Processus fils du mode isolé: renvoie statut, indices choisis, temps et
+    résumé du profil (profileur du parent, fichiers écrits par le fils)
+    """
+    # Ctrl-C est géré par le parent, qui décide de l'annulation
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        if memory_limit_mb:
+            _limit_memory(memory_limit_mb)
+        controller = AlgorithmController(
+            budget=budget, dp_precision=dp_precision, profiler=profiler, progress=progress,
+            checkpoints=checkpoints, dp_storage=dp_storage, dp_memory_mb=dp_memory_mb,
+            brute_force_max_actions=brute_force_max_actions
+        )
+        portfolio, execution_time = controller.execute_algorithm(algorithm_name, actions)
+        profile = controller.profiler.last if controller.profiler is not None else None
+        if portfolio.status != 'ok':
+            connection.send((portfolio.status, portfolio.error, execution_time, profile))
+            return
+        positions = {id(action): i for i, action in enumerate(actions)}
+        connection.send((
+            'ok',
+            ([positions[id(action)] for action in portfolio.actions], portfolio.proven),
+            execution_time,
+            profile
+        ))
+    except MemoryError:
+        connection.send(('out_of_memory', None, 0.0, None))
+    except BaseException as e:
+        connection.send(('error', str(e), 0.0, None))
+
 
 class AlgorithmController:
     """Contrôleur optimisé pour les algorithmes d'optimisation"""
     
-    def __init__(self, budget=500000):
+    # Algorithmes disponibles dans execute_algorithm
+    ALGORITHMS = ("brute_force", "dynamic_programming", "branch_and_bound", "greedy", "race")
+    
+    # Algorithmes dont la solution peut être optimale (voir _is_proven:
+    # la DP arrondie et la course interrompue ne le sont pas toujours)
+    EXACT_ALGORITHMS = ("brute_force", "dynamic_programming", "branch_and_bound", "race")
+    
+    def __init__(self, budget=500000, result_cache=None, race_deadline=60.0,
+                 dp_precision=None, memory_limit_mb=1024, tracker=None, profiler=None,
+                 metrics=None, progress=None, checkpoints=None, dp_storage='dict', dp_memory_mb=None,
+                 brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS):
         self.budget = budget
+        # PerformanceTracker optionnel: phases et compteurs des solveurs
+        self.tracker = tracker or DISABLED_TRACKER
+        # SolveProfiler (None: selon la variable d'environnement INVEST_PROFILE)
+        self.profiler = profiler or SolveProfiler.from_environment()
+        # SolverMetrics optionnel: durées, issues et débits des résolutions
+        self.metrics = metrics or DISABLED_METRICS
+        # ProgressReporter optionnel: progression des solveurs longs
+        self.progress = progress or NULL_PROGRESS
+        # SolveCheckpoints optionnel: reprise de la force brute et de la DP
+        self.checkpoints = checkpoints or DISABLED_CHECKPOINTS
+        # Précision de la DP en F CFA (None: 100 au-delà de 100 000 F, sinon 1).
+        # Exacte si elle divise tous les coûts (voir plan)
+        self.dp_precision = dp_precision
+        # Plafond mémoire utilisé par le planificateur (Mo)
+        self.memory_limit_mb = memory_limit_mb
+        # Stockage de la DP: 'dict' (états et listes d'actions), 'table'
+        # (tables NumPy, décisions en bits, sur disque si trop grandes) ou
+        # 'memmap' (décisions toujours sur disque), voir utils.dp_table
+        if dp_storage not in dp_table.DP_STORAGES:
+            raise ValueError(f"Stockage DP inconnu: {dp_storage}")
+        self.dp_storage = dp_storage
+        # Budget de mémoire résidente de la DP par tables (Mo, None: moitié du plafond)
+        self.dp_memory_mb = dp_memory_mb or memory_limit_mb / 2
+        # Taille maximale de la force brute (à relever avec des points de
+        # reprise: au-delà de 2^25 combinaisons, une résolution dure des heures)
+        self.brute_force_max_actions = brute_force_max_actions
+        # Délai maximal (secondes) de l'algorithme "race"
+        self.race_deadline = race_deadline
+        self.last_node_count = 0
+        # ResultCache optionnel: consulté avant chaque exécution
+        self.result_cache = result_cache
+        # Jeton de la résolution en cours (voir execute_algorithm)
+        self.cancel_token = None
+    
+    def _check_cancelled(self):
+        """Point d'annulation sûr: lève SolveCancelled si demandé"""
+        if self.cancel_token is not None:
+            self.cancel_token.check()
     
     def brute_force(self, actions):
         """
         Algorithme de force brute avec sécurité
         Complexité: O(2^n)
         """
-        if len(actions) > 20:
-            print("⚠️  Force brute désactivée: trop d'actions (>20)")
-            print("   → Utilisez debug_actions.csv ou test_actions.csv")
-            return Portfolio()
+        if len(actions) > self.brute_force_max_actions:
+            print(f"⚠️  Force brute désactivée: trop d'actions (>{self.brute_force_max_actions})")
+            print("   → Utilisez debug_actions.csv ou test_actions.csv, ou relevez la limite "
+                  "(--brute-force-max-actions, avec --checkpoint-interval)")
+            # Statut d'échec: un refus n'est ni une solution ni un résultat à mettre en cache
+            return self._failed(
+                'error', f"force brute désactivée: {len(actions)} actions > {self.brute_force_max_actions}"
+            )
         
-        best_portfolio = Portfolio()
         total_combinations = 2 ** len(actions)
         
         print(f"🔍 Force brute: {len(actions)} actions, {total_combinations:,} combinaisons")
         
-        # Génère TOUTES les combinaisons possibles
-        for r in range(len(actions) + 1):  # Inclure combinaison vide (r=0)
-            for combination in combinations(actions, r):
-                portfolio = Portfolio(list(combination))
-                
-                # ⚠️ VÉRIFICATION STRICTE DU BUDGET
-                if portfolio.total_cost <= self.budget:
-                    if portfolio.total_profit > best_portfolio.total_profit:
-                        best_portfolio = portfolio
+        # Énumération partagée avec BruteForceController (reprise comprise)
+        checkpoint = self.checkpoints.open("brute_force", actions, self.budget, {'solver': solver_version()})
+        best_combination, _, _, tested = best_subset(
+            actions, self.budget, checkpoint, self.progress,
+            check_cancelled=self._check_cancelled, check_interval=CANCEL_CHECK_INTERVAL
+        )
         
-        return best_portfolio
+        self.tracker.count('subsets', tested)
+        return Portfolio(best_combination)
+    
+    def _dp_precision(self):
+        """Précision effective de la DP (F CFA)"""
+        if self.dp_precision:
+            return self.dp_precision  # Choisie par le planificateur
+        if self.budget > 100000:
+            return 100  # Regrouper par 100 F CFA
+        return 1
     
     def dynamic_programming(self, actions):
         """
@@ -42,14 +199,13 @@ class AlgorithmController:
         """
         if not actions:
             return Portfolio()
+        if self.dp_storage != 'dict':
+            return self._dynamic_programming_table(actions)
             
         n = len(actions)
         
         # OPTIMISATION: Réduction de précision pour économiser la mémoire
-        if self.budget > 100000:
-            precision = 100  # Regrouper par 100 F CFA
-        else:
-            precision = 1
+        precision = self._dp_precision()
             
         reduced_budget = self.budget // precision
         
@@ -58,50 +214,227 @@ class AlgorithmController:
         # Utilisation d'un dictionnaire pour économiser la mémoire
         # budget_réduit -> (profit_total, liste_actions)
         dp = {0: (0, [])}
+        cells = 0
+        start = 0
         
-        for action in actions:
-            cost = action.cost
-            profit = action.profit
-            reduced_cost = max(1, cost // precision)
-            
-            new_dp = {}
-            
-            for budget_used, (current_profit, current_actions) in dp.items():
-                # Option 1: NE PAS prendre cette action
-                if budget_used not in new_dp or current_profit > new_dp[budget_used][0]:
-                    new_dp[budget_used] = (current_profit, current_actions)
+        # Point de reprise: prochaine action et table dp (listes d'indices)
+        checkpoint = self.checkpoints.open(
+            "dynamic_programming", actions, self.budget,
+            {'precision': precision, 'solver': solver_version()}
+        )
+        state = checkpoint.restore()
+        if state is not None:
+            start, cells = state['index'], state['cells']
+            dp = self._dp_from_state(state['dp'], actions)
+            print(f"♻️  Reprise: action {start}/{n}")
+        
+        with self.progress.task("DP", total=n, unit="actions", completed=start) as task:
+            for index in range(start, n):
+                action = actions[index]
+                self._check_cancelled()
+                task.update(index)
+                if checkpoint.due():
+                    checkpoint.save({'index': index, 'cells': cells, 'dp': self._dp_state(dp, actions)})
+                cells += len(dp)
+                cost = action.cost
+                profit = action.profit_fp
+                reduced_cost = max(1, cost // precision)
                 
-                # Option 2: PRENDRE cette action
-                new_budget = budget_used + reduced_cost
+                new_dp = {}
                 
-                if new_budget <= reduced_budget:
-                    new_actions = current_actions + [action]
+                for budget_used, (current_profit, current_actions) in dp.items():
+                    # Option 1: NE PAS prendre cette action
+                    if budget_used not in new_dp or current_profit > new_dp[budget_used][0]:
+                        new_dp[budget_used] = (current_profit, current_actions)
                     
-                    # ⚠️ VÉRIFICATION CRITIQUE: Calculer le coût RÉEL
-                    real_cost = sum(a.cost for a in new_actions)
+                    # Option 2: PRENDRE cette action
+                    new_budget = budget_used + reduced_cost
                     
-                    # ⚠️ VÉRIFIER LE BUDGET RÉEL
-                    if real_cost <= self.budget:
-                        new_profit = current_profit + profit
+                    if new_budget <= reduced_budget:
+                        new_actions = current_actions + [action]
                         
-                        if new_budget not in new_dp or new_profit > new_dp[new_budget][0]:
-                            new_dp[new_budget] = (new_profit, new_actions)
-            
-            dp = new_dp
+                        # ⚠️ VÉRIFICATION CRITIQUE: Calculer le coût RÉEL
+                        real_cost = sum(a.cost for a in new_actions)
+                        
+                        # ⚠️ VÉRIFIER LE BUDGET RÉEL
+                        if real_cost <= self.budget:
+                            new_profit = current_profit + profit
+                            
+                            if new_budget not in new_dp or new_profit > new_dp[new_budget][0]:
+                                new_dp[new_budget] = (new_profit, new_actions)
+                
+                dp = new_dp
+            task.update(n)
+        checkpoint.complete()
+        
+        self.tracker.count('dp_cells', cells)
         
         # Trouver la meilleure solution valide
-        best_profit = 0
-        best_actions = []
+        with self.tracker.span('reconstruct'):
+            best_profit = 0
+            best_actions = []
+            
+            for budget_used, (profit, actions_list) in dp.items():
+                # ⚠️ DOUBLE VÉRIFICATION du coût réel
+                real_cost = sum(a.cost for a in actions_list)
+                
+                if real_cost <= self.budget and profit > best_profit:
+                    best_profit = profit
+                    best_actions = actions_list
+        
+        return Portfolio(best_actions)
+    
+    def _dynamic_programming_table(self, actions):
+        """
+        Programmation dynamique par tables NumPy (voir utils.dp_table)
+        Complexité: O(n * W/precision) en temps, O(W/precision) en mémoire
+        plus n * W/(8 * precision) octets de décisions (en mémoire ou sur disque)
+        
+        Les coûts sont arrondis au supérieur: toute solution respecte le
+        budget réel (exacte si la précision divise tous les coûts).
+        """
+        if self.checkpoints.enabled:
+            print("⚠️  Points de reprise sans effet avec la DP par tables "
+                  "(--resume et --checkpoint-interval: --dp-storage dict)")
+        
+        n = len(actions)
+        precision = self._dp_precision()
+        capacity = self.budget // precision
+        costs = np.array([-(-action.cost // precision) for action in actions], dtype=np.int64)
+        profits = np.array([action.profit_fp for action in actions], dtype=np.int64)
+        
+        with dp_table.open_matrix(n, capacity, self.dp_storage, self.dp_memory_mb) as matrix:
+            print(f"⚡ DP par tables: {n} actions, précision: {precision}F, "
+                  f"{capacity + 1:,} capacités, décisions en {matrix.location}")
+            
+            with self.progress.task("DP", total=n, unit="actions") as task:
+                def on_item(index):
+                    self._check_cancelled()
+                    task.update(index)
+                
+                dp_table.forward(costs, profits, capacity, matrix, on_item)
+                task.update(n)
+            
+            self.tracker.count('dp_cells', n * (capacity + 1))
+            
+            with self.tracker.span('reconstruct'):
+                selected = dp_table.reconstruct(costs, capacity, matrix)
         
+        return Portfolio([actions[i] for i in selected])
+    
+    @staticmethod
+    def _dp_state(dp, actions):
+        """
+        Table dp sérialisable: listes d'actions remplacées par leurs indices
+        
+        Les listes partagées entre cases restent partagées (converties une
+        fois, mémorisées par pickle): la taille du point suit celle de la table.
+        """
+        positions = {id(action): i for i, action in enumerate(actions)}
+        converted = {}
+        table = {}
         for budget_used, (profit, actions_list) in dp.items():
-            # ⚠️ DOUBLE VÉRIFICATION du coût réel
-            real_cost = sum(a.cost for a in actions_list)
+            indices = converted.get(id(actions_list))
+            if indices is None:
+                indices = converted[id(actions_list)] = [positions[id(a)] for a in actions_list]
+            table[budget_used] = (profit, indices)
+        return table
+    
+    @staticmethod
+    def _dp_from_state(table, actions):
+        """Table dp reconstruite depuis _dp_state (même ordre, mêmes profits)"""
+        converted = {}
+        dp = {}
+        for budget_used, (profit, indices) in table.items():
+            actions_list = converted.get(id(indices))
+            if actions_list is None:
+                actions_list = converted[id(indices)] = [actions[i] for i in indices]
+            dp[budget_used] = (profit, actions_list)
+        return dp
+    
+    def branch_and_bound(self, actions, incumbent=None, on_improve=None, should_stop=None):
+        """
+        Séparation et évaluation (parcours en profondeur, borne de Dantzig)
+        Complexité: O(2^n) au pire, quasi linéaire en pratique
+        
+        Args:
+            actions: Liste d'objets Action
+            incumbent: Fonction -> meilleur profit connu ailleurs (virgule fixe, élagage partagé)
+            on_improve: Fonction(profit en virgule fixe, actions) appelée à chaque amélioration
+            should_stop: Fonction -> True pour interrompre la recherche
+        """
+        if not actions:
+            return Portfolio()
+        
+        with self.tracker.span('presolve'):
+            # Tri par ratio profit/coût décroissant
+            items = sorted(actions, key=lambda a: a.profit_fp / a.cost, reverse=True)
+            costs = [a.cost for a in items]
+            profits = [a.profit_fp for a in items]
+            n = len(items)
             
-            if real_cost <= self.budget and profit > best_profit:
-                best_profit = profit
-                best_actions = actions_list
+            cost_prefix = [0]
+            profit_prefix = [0]
+            for cost, profit in zip(costs, profits):
+                cost_prefix.append(cost_prefix[-1] + cost)
+                profit_prefix.append(profit_prefix[-1] + profit)
         
-        return Portfolio(best_actions)
+        def upper_bound(i, capacity):
+            """Relaxation linéaire sur les objets i..n-1 (partie entière, exacte)"""
+            k = bisect_right(cost_prefix, cost_prefix[i] + capacity) - 1
+            bound = profit_prefix[k] - profit_prefix[i]
+            if k < n:
+                remaining = capacity - (cost_prefix[k] - cost_prefix[i])
+                bound += remaining * profits[k] // costs[k]
+            return bound
+        
+        best_profit = 0
+        best_path = []
+        path = []
+        nodes = 0
+        
+        # Pile de nœuds: (prochain objet, coût, profit, longueur du chemin parent, objet ajouté)
+        stack = [(0, 0, 0, 0, -1)]
+        
+        # Nombre de nœuds inconnu à l'avance: débit affiché, sans temps restant
+        with self.progress.task("Séparation et évaluation", unit="nœuds") as task:
+            while stack:
+                i, weight, profit, path_len, added = stack.pop()
+                del path[path_len:]
+                if added >= 0:
+                    path.append(added)
+                
+                nodes += 1
+                if nodes % 1024 == 0:
+                    self._check_cancelled()
+                    if should_stop is not None and should_stop():
+                        break
+                
+                if profit > best_profit:
+                    best_profit = profit
+                    best_path = list(path)
+                    if on_improve is not None:
+                        on_improve(best_profit, [items[j] for j in best_path])
+                
+                if i == n:
+                    continue
+                
+                # Élagage: ce sous-arbre ne peut pas battre la meilleure solution connue
+                bound_to_beat = best_profit
+                if incumbent is not None:
+                    bound_to_beat = max(bound_to_beat, incumbent())
+                if profit + upper_bound(i, self.budget - weight) <= bound_to_beat:
+                    continue
+                
+                # Empiler "sans l'objet i" puis "avec" (exploré en premier)
+                stack.append((i + 1, weight, profit, len(path), -1))
+                if weight + costs[i] <= self.budget:
+                    stack.append((i + 1, weight + costs[i], profit + profits[i], len(path), i))
+            task.update(nodes)
+        
+        self.last_node_count = nodes
+        self.tracker.count('nodes', nodes)
+        return Portfolio([items[j] for j in best_path])
     
     def greedy_optimized(self, actions):
         """
@@ -123,8 +456,13 @@ class AlgorithmController:
         # Stratégie 3: Coût faible d'abord
         strategies.append(self._greedy_by_cost(actions))
         
+        # Stratégie 4: Meilleure action seule. Avec la stratégie 1, garantit
+        # au moins la moitié du profit optimal
+        strategies.append(self._best_single_action(actions))
+        
         # Retourner la meilleure stratégie
-        best = max(strategies, key=lambda p: p.total_profit)
+        best = max(strategies, key=lambda p: p.total_profit_fp)
+        self.tracker.count('items', len(actions) * len(strategies))
         
         # ⚠️ VÉRIFICATION FINALE DU BUDGET
         if best.total_cost > self.budget:
@@ -139,7 +477,7 @@ class AlgorithmController:
         actions_list = list(portfolio.actions)
         
         # Trier par ratio décroissant
-        actions_list.sort(key=lambda a: a.profit / a.cost if a.cost > 0 else 0, reverse=True)
+        actions_list.sort(key=lambda a: a.profit_fp / a.cost if a.cost > 0 else 0, reverse=True)
         
         total_cost = sum(a.cost for a in actions_list)
         
@@ -163,7 +501,7 @@ class AlgorithmController:
         """Glouton par profit absolu"""
         sorted_actions = sorted(
             actions,
-            key=lambda x: x.profit,
+            key=lambda x: x.profit_fp,
             reverse=True
         )
         return self._select_greedy(sorted_actions)
@@ -176,6 +514,13 @@ class AlgorithmController:
         )
         return self._select_greedy(sorted_actions)
     
+    def _best_single_action(self, actions):
+        """Action la plus rentable qui tient seule dans le budget"""
+        affordable = [a for a in actions if a.cost <= self.budget]
+        if not affordable:
+            return Portfolio()
+        return Portfolio([max(affordable, key=lambda a: a.profit_fp)])
+    
     def _select_greedy(self, sorted_actions):
         """
         Sélection gloutonne standard
@@ -191,22 +536,79 @@ class AlgorithmController:
                 
         return Portfolio(selected_actions)
     
-    def execute_algorithm(self, algorithm_name, actions):
-        """Exécute un algorithme avec gestion des erreurs"""
+    def execute_algorithm(self, algorithm_name, actions, token=None,
+                          isolated=False, timeout=None, memory_limit_mb=None):
+        """
+        Exécute un algorithme avec gestion des erreurs
+        
+        Args:
+            algorithm_name: Clé de l'algorithme (voir ALGORITHMS)
+            actions: Liste d'objets Action
+            token: CancellationToken vérifié par les solveurs (optionnel)
+            isolated: Exécuter dans un processus fils (limites strictes)
+            timeout: Délai maximal en secondes
+            memory_limit_mb: Plafond mémoire du processus fils (mode isolé)
+            
+        Returns:
+            tuple: (portfolio, temps). portfolio.status vaut 'ok', 'timeout',
+            'cancelled', 'out_of_memory' ou 'error'
+        """
         if not actions:
             return Portfolio(), 0.0
-            
+        
+        portfolio, execution_time = self._execute(
+            algorithm_name, actions, token, isolated, timeout, memory_limit_mb
+        )
+        if not portfolio.from_cache:
+            self.metrics.observe_solve(algorithm_name, len(actions), execution_time, portfolio.status)
+        return portfolio, execution_time
+    
+    def _execute(self, algorithm_name, actions, token, isolated, timeout, memory_limit_mb):
+        """Corps de execute_algorithm (cache, mode isolé ou résolution en place)"""
+        if self.profiler is not None:
+            self.profiler.last = None
+        
+        # Résultat déjà calculé pour ce (dataset, budget, algorithme) ?
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(
+                dataset_digest(actions), self.budget, self._cache_name(algorithm_name), solver_version()
+            )
+            record = self.result_cache.get(cache_key)
+            self.metrics.observe_cache('result', record is not None)
+            if record is not None:
+                portfolio = Portfolio([actions[i] for i in record['indices']])
+                portfolio.from_cache = True
+                portfolio.proven = record.get('proven', False)
+                return portfolio, record['execution_time']
+        
+        if isolated:
+            with self.tracker.span(f"solve {algorithm_name} (isolé)"):
+                portfolio, execution_time = self._execute_isolated(
+                    algorithm_name, actions, timeout, memory_limit_mb, token
+                )
+            if cache_key is not None and self._cacheable(algorithm_name, portfolio):
+                self._store_result(cache_key, algorithm_name, actions, portfolio, execution_time)
+            return portfolio, execution_time
+        
+        if token is None and timeout:
+            token = CancellationToken(timeout)
+        self.cancel_token = token
+        
+        if algorithm_name in ("brute_force", "dynamic_programming", "branch_and_bound"):
+            estimate = self.estimate(algorithm_name, actions)
+            source = "calibré" if estimate['calibrated'] else "débits par défaut"
+            print(f"⏱️  Temps estimé: {format_duration(estimate['time'])} ({source})")
+        
         start_time = time.time()
         
         try:
-            if algorithm_name == "brute_force":
-                portfolio = self.brute_force(actions)
-            elif algorithm_name == "dynamic_programming":
-                portfolio = self.dynamic_programming(actions)
-            elif algorithm_name == "greedy":
-                portfolio = self.greedy_optimized(actions)
-            else:
-                raise ValueError(f"Algorithme inconnu: {algorithm_name}")
+            with self.tracker.span(f"solve {algorithm_name}"):
+                self.tracker.count('actions', len(actions))
+                with self._profiling(algorithm_name, actions):
+                    portfolio = self._run_solver(algorithm_name, actions, token)
+            if algorithm_name != "race":
+                portfolio.proven = self._is_proven(algorithm_name, actions)
             
             execution_time = time.time() - start_time
             
@@ -221,32 +623,208 @@ class AlgorithmController:
                 portfolio = self._fix_budget_overflow(portfolio)
                 print(f"   ✓ Corrigé: {portfolio.total_cost:,} F CFA")
             
+            if cache_key is not None and self._cacheable(algorithm_name, portfolio):
+                self._store_result(cache_key, algorithm_name, actions, portfolio, execution_time)
+            
             return portfolio, execution_time
             
+        except SolveCancelled as e:
+            label = "Délai dépassé" if e.reason == 'timeout' else "Annulé"
+            print(f"⏹️  {label}: {algorithm_name}")
+            return self._failed('cancelled' if e.reason == 'cancelled' else 'timeout'), time.time() - start_time
         except MemoryError:
             print(f"💥 Mémoire insuffisante pour {algorithm_name}")
-            return Portfolio(), time.time() - start_time
+            return self._failed('out_of_memory'), time.time() - start_time
         except Exception as e:
             print(f"❌ Erreur {algorithm_name}: {e}")
             import traceback
             traceback.print_exc()
-            return Portfolio(), time.time() - start_time
+            return self._failed('error', str(e)), time.time() - start_time
+        finally:
+            self.cancel_token = None
+    
+    def _profiling(self, algorithm_name, actions):
+        """Contexte de profilage d'une résolution (vide si le profilage est désactivé)"""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.profile(algorithm_name, fallback_name=dataset_digest(actions)[:12])
+    
+    def _run_solver(self, algorithm_name, actions, token):
+        if algorithm_name == "brute_force":
+            return self.brute_force(actions)
+        if algorithm_name == "dynamic_programming":
+            return self.dynamic_programming(actions)
+        if algorithm_name == "branch_and_bound":
+            return self.branch_and_bound(actions)
+        if algorithm_name == "greedy":
+            return self.greedy_optimized(actions)
+        if algorithm_name == "race":
+            # Import local: race_controller dépend de ce module
+            from controllers.race_controller import RaceController
+            race = RaceController(self.budget, self.brute_force_max_actions)
+            portfolio = race.run(actions, deadline=self.race_deadline, token=token)
+            portfolio.proven = race.proven
+            return portfolio
+        raise ValueError(f"Algorithme inconnu: {algorithm_name}")
+    
+    def _is_proven(self, algorithm_name, actions):
+        """Vrai si la solution de l'algorithme (hors course) est optimale"""
+        if algorithm_name == "brute_force":
+            return len(actions) <= self.brute_force_max_actions  # Au-delà: force brute désactivée
+        if algorithm_name == "branch_and_bound":
+            return True
+        if algorithm_name == "dynamic_programming":
+            # Arrondi des coûts sans effet si la précision les divise tous
+            precision = self._dp_precision()
+            return all(action.cost % precision == 0 for action in actions)
+        return False
+    
+    @staticmethod
+    def _failed(status, error=None):
+        """Portefeuille vide portant le statut d'échec"""
+        portfolio = Portfolio()
+        portfolio.status = status
+        portfolio.error = error
+        return portfolio
     
-    def get_recommended_algorithms(self, num_actions):
+    def _execute_isolated(self, algorithm_name, actions, timeout, memory_limit_mb, token):
         """
-        Retourne les algorithmes recommandés selon la taille du dataset
+        Exécute l'algorithme dans un processus fils
+        
+        Le délai est strict (le fils est tué à l'échéance, même au milieu
+        d'une boucle sans point d'annulation) et la mémoire est plafonnée
+        par RLIMIT_AS: un dépassement lève MemoryError dans le fils au lieu
+        de déclencher l'OOM killer sur la machine.
         """
-        recommendations = []
+        if token is None:
+            token = CancellationToken(timeout)
+        elif timeout:
+            token.deadline = min(token.deadline or float('inf'), time.monotonic() + timeout)
+        
+        # La DP par tables reste sous le plafond du fils (RLIMIT_AS)
+        dp_memory_mb = self.dp_memory_mb
+        if memory_limit_mb:
+            dp_memory_mb = min(dp_memory_mb, memory_limit_mb / 2)
         
-        if num_actions <= 20:
-            recommendations.append("brute_force")
+        # Pipe plutôt que Queue: envoi synchrone, sans thread à créer dans
+        # un fils dont la mémoire est déjà épuisée
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_isolated_worker,
+            args=(algorithm_name, actions, self.budget, self.dp_precision, memory_limit_mb, sender,
+                  self.profiler, self.progress, self.checkpoints, self.dp_storage, dp_memory_mb,
+                  self.brute_force_max_actions)
+        )
+        start_time = time.time()
+        process.start()
+        sender.close()
         
-        if num_actions <= 1000:
-            recommendations.append("dynamic_programming")
+        try:
+            while True:
+                if receiver.poll(0.1):
+                    try:
+                        status, payload, execution_time, profile = receiver.recv()
+                        # Profil de la résolution du fils (fichiers écrits par le fils)
+                        if self.profiler is not None:
+                            self.profiler.last = profile
+                        break
+                    except EOFError:
+                        # Fils terminé sans réponse: SIGKILL (OOM killer) ou plantage natif
+                        process.join()
+                        code = process.exitcode
+                        status = 'out_of_memory' if code == -9 else 'error'
+                        payload, execution_time = f"processus terminé (code {code})", time.time() - start_time
+                        break
+                if token.cancelled:
+                    status, payload, execution_time = token.reason, None, time.time() - start_time
+                    print(f"⏹️  {'Délai dépassé' if status == 'timeout' else 'Annulé'}: {algorithm_name}")
+                    break
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            receiver.close()
         
-        recommendations.append("greedy")  # Toujours disponible
+        if status == 'ok':
+            indices, proven = payload
+            portfolio = Portfolio([actions[i] for i in indices])
+            portfolio.proven = proven
+            return portfolio, execution_time
+        return self._failed(status, payload), execution_time
+    
+    @staticmethod
+    def _cacheable(algorithm_name, portfolio):
+        """
+        Vrai si le résultat peut être réutilisé: résolution aboutie et, pour
+        la course, optimalité prouvée (une course arrêtée par son délai
+        dépend de la charge de la machine: elle est relancée)
+        """
+        return portfolio.status == 'ok' and (algorithm_name != "race" or portfolio.proven)
+    
+    def _store_result(self, cache_key, algorithm_name, actions, portfolio, execution_time):
+        """Enregistre les indices choisis et les totaux dans le cache de résultats"""
+        positions = {id(action): i for i, action in enumerate(actions)}
+        self.result_cache.put(cache_key, {
+            'algorithm': algorithm_name,
+            'budget': self.budget,
+            'solver_version': solver_version(),
+            'indices': [positions[id(action)] for action in portfolio.actions],
+            'total_cost': portfolio.total_cost,
+            'total_profit': portfolio.total_profit,
+            'proven': portfolio.proven,
+            'execution_time': execution_time
+        })
+    
+    def _cache_name(self, algorithm_name):
+        """
+        Nom de l'algorithme dans la clé de cache (la précision change le
+        résultat de la DP, la limite de taille celui de la force brute)
+        """
+        if algorithm_name == "brute_force":
+            return f"{algorithm_name}/max{self.brute_force_max_actions}"
+        if algorithm_name != "dynamic_programming":
+            return algorithm_name
+        name = algorithm_name
+        if self.dp_precision:
+            name = f"{name}/p{self.dp_precision}"
+        if self.dp_storage != 'dict':
+            # Arrondi des coûts différent: résultat propre aux tables (mémoire ou disque)
+            name = f"{name}/table"
+        return name
+    
+    def _planner(self, time_limit=60.0):
+        """Planificateur configuré comme ce contrôleur (limite de la force brute, stockage de la DP)"""
+        return PlannerController(
+            self.budget, memory_limit_mb=self.memory_limit_mb, time_limit=time_limit,
+            brute_force_max_actions=self.brute_force_max_actions,
+            dp_storage=self.dp_storage, dp_memory_mb=self.dp_memory_mb
+        )
+    
+    def plan(self, actions, time_limit=60.0):
+        """
+        Planifie la résolution d'un dataset (voir PlannerController)
         
-        return recommendations
+        Returns:
+            dict: algorithme conseillé, estimations temps/mémoire, algorithmes
+            proposés et précision de la DP
+        """
+        return self._planner(time_limit).plan(actions)
+    
+    def estimate(self, algorithm_name, actions):
+        """
+        Estime le temps et la mémoire d'une résolution (débits calibrés de
+        la machine si disponibles, voir utils.calibration)
+        """
+        planner = self._planner()
+        precision = self._dp_precision() if algorithm_name == "dynamic_programming" else None
+        return planner.estimate(algorithm_name, planner.dataset_stats(actions), precision)
+    
+    def get_recommended_algorithms(self, actions):
+        """
+        Retourne les algorithmes recommandés pour un dataset: ceux dont le
+        temps et la mémoire estimés tiennent dans les limites
+        """
+        return self.plan(actions)['recommended']
     
     @staticmethod
     def get_complexity(algorithm_name):
@@ -267,8 +845,24 @@ class AlgorithmController:
                 "space": "O(W/p)",
                 "best": "O(n × W/p)",
                 "worst": "O(n × W/p)",
-                "description": "Programmation dynamique avec précision p (p=100 par défaut)",
-                "note": "W = budget (500,000), p = précision, n = nombre d'actions"
+                "description": "Programmation dynamique avec précision p (exacte si p = PGCD des coûts)",
+                "note": "W = budget (500,000), p = précision choisie par le planificateur, n = nombre d'actions"
+            },
+            "branch_and_bound": {
+                "time": "O(2^n)",
+                "space": "O(n)",
+                "best": "O(n log n)",
+                "worst": "O(2^n)",
+                "description": "Séparation et évaluation avec borne de Dantzig (relaxation linéaire)",
+                "note": "Exact; l'élagage rend la plupart des instances quasi linéaires"
+            },
+            "race": {
+                "time": "min des stratégies",
+                "space": "somme des stratégies",
+                "best": "O(n log n)",
+                "worst": "délai maximal",
+                "description": "Stratégies en parallèle avec bornes partagées, arrêt à l'optimalité prouvée",
+                "note": "Glouton + borne LP, puis séparation et évaluation, DP (et force brute si n ≤ 20)"
             },
             "greedy": {
                 "time": "O(n log n)",
@@ -276,7 +870,7 @@ class AlgorithmController:
                 "best": "O(n log n)",
                 "worst": "O(n log n)",
                 "description": "Tri + sélection gloutonne par ratio profit/coût",
-                "note": "Rapide mais ne garantit pas l'optimalité"
+                "note": "Rapide; garantit au moins 50% de l'optimum (meilleure action seule incluse)"
             }
         }
         return complexities.get(algorithm_name, {})
\ No newline at end of file
@@ -1,6 +1,15 @@
 
-from itertools import combinations
 import time
+
+from controllers.algorithm_controller import solver_version
+from controllers.planner_controller import PlannerController
+from models.action import PROFIT_SCALE
+from utils.calibration import load_rates
+from utils.checkpoint import DISABLED_CHECKPOINTS
+from utils.exhaustive import best_subset
+from utils.progress import NULL_PROGRESS, TqdmProgress
+
+
 class BruteForceController:
     """
     Contrôleur pour l'algorithme de force brute
@@ -15,13 +24,16 @@ class BruteForceController:
         self.max_items = max_items
         self.name = "Force Brute"
     
-    def optimize(self, actions, budget=500000):
+    def optimize(self, actions, budget=500000, token=None, progress=None, checkpoints=None):
         """
         Optimisation par énumération exhaustive
         
         Args:
             actions: Liste d'objets Action
             budget: Budget maximum (500,000 F CFA)
+            token: CancellationToken optionnel (lève SolveCancelled)
+            progress: ProgressReporter optionnel (débit et temps restant mesurés)
+            checkpoints: SolveCheckpoints optionnel (reprise après interruption)
             
         Returns:
             dict avec: selected, cost, profit, duration, valid
@@ -50,49 +62,31 @@ class BruteForceController:
         
         start_time = time.time()
         
-        best_profit = 0
-        best_combination = []
-        best_cost = 0
-        combinations_tested = 0
+        # Point de reprise: même énumération et même version que AlgorithmController
+        checkpoint = (checkpoints or DISABLED_CHECKPOINTS).open(
+            "brute_force_controller", actions, budget, {'solver': solver_version()}
+        )
+        
+        # Progression mesurée (par défaut: barre tqdm pour les datasets >= 18 actions)
+        if progress is None:
+            progress = TqdmProgress() if n_actions >= 18 else NULL_PROGRESS
         
         # Explorer TOUTES les combinaisons (2^n)
-        for r in range(len(actions) + 1):
-            for combo in combinations(actions, r):
-                combinations_tested += 1
-                
-                # Afficher progression pour datasets >= 18 actions
-                if n_actions >= 18 and combinations_tested % 100000 == 0:
-                    elapsed = time.time() - start_time
-                    progress = (combinations_tested / total_combinations) * 100
-                    print(f"   Progression: {progress:.1f}% ({combinations_tested:,}/{total_combinations:,} combinaisons, {elapsed:.1f}s)", end='\r')
-                
-                # Calculer le coût total
-                total_cost = sum(action.cost for action in combo)
-                
-                # Vérifier contrainte budget
-                if total_cost <= budget:
-                    # Calculer le profit total
-                    total_profit = sum(action.profit for action in combo)
-                    
-                    # Garder la meilleure solution
-                    if total_profit > best_profit:
-                        best_profit = total_profit
-                        best_combination = list(combo)
-                        best_cost = total_cost
+        best_combination, best_profit, best_cost, combinations_tested = best_subset(
+            actions, budget, checkpoint, progress,
+            check_cancelled=token.check if token is not None else None
+        )
         
         duration = time.time() - start_time
         
-        # Effacer ligne de progression
-        if n_actions >= 18:
-            print(" " * 100)
-        
         # Vérification finale
         valid = best_cost <= budget
         
         return {
             'selected': best_combination,
             'cost': best_cost,
-            'profit': best_profit,
+            'profit': best_profit / PROFIT_SCALE,
+            'profit_fp': best_profit,
             'duration': duration,
             'count': len(best_combination),
             'valid': valid,
@@ -112,8 +106,10 @@ class BruteForceController:
         """
         combinations = 2 ** n_actions
         
-        # Estimation basée sur ~1 million de combinaisons par seconde
-        seconds = combinations / 1_000_000
+        # Débit calibré sur cette machine (python -m utils.calibration),
+        # sinon débit par défaut du planificateur. Unités: combinaison × (1 + n/2)
+        rate = (load_rates() or PlannerController.DEFAULT_RATES)["brute_force"]
+        seconds = combinations * (1 + n_actions / 2) / rate
         
         if seconds < 1:
             return "< 1 seconde"
@@ -0,0 +1,220 @@
+import contextlib
+import io
+import multiprocessing
+import queue as queue_module
+import signal
+
+from controllers.algorithm_controller import AlgorithmController
+from models.portfolio import Portfolio
+from utils.cancellation import CancellationToken
+from utils.metrics import DISABLED_METRICS, SolverMetrics
+from utils.performance_tracker import DISABLED_TRACKER, PerformanceTracker
+from utils.result_cache import ResultCache
+
+
+def _terminate(signum, frame):
+    """SIGTERM (annulation): sortie par exception pour arrêter aussi les processus du solveur"""
+    raise SystemExit(0)
+
+
+def _solve_worker(algorithm_name, actions, settings, use_cache, timeout, memory_limit_mb, results,
+                  trace=None, collect_metrics=False):
+    """
+    Processus fils: exécute un algorithme et renvoie les indices choisis
+
+    Avec trace (None, 'spans' ou 'memory') et collect_metrics, le processus
+    mesure sa résolution et renvoie ses phases et un instantané de ses
+    métriques, que le parent rattache aux siens.
+    """
+    # Ctrl-C est géré par le parent, qui annule les processus encore en cours
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _terminate)
+    tracker = PerformanceTracker(trace_memory=trace == 'memory') if trace else None
+    metrics = SolverMetrics() if collect_metrics else None
+
+    def instrumentation():
+        return (tracker.roots if tracker is not None else [],
+                metrics.registry.snapshot() if metrics is not None else None)
+
+    try:
+        # Les affichages des solveurs s'entremêleraient: on les masque
+        with contextlib.redirect_stdout(io.StringIO()):
+            controller = AlgorithmController(
+                result_cache=ResultCache() if use_cache else None,
+                tracker=tracker, metrics=metrics, **settings
+            )
+            portfolio, execution_time = controller.execute_algorithm(
+                algorithm_name, actions, token=CancellationToken(timeout),
+                isolated=memory_limit_mb is not None, memory_limit_mb=memory_limit_mb
+            )
+        if portfolio.status != 'ok':
+            results.put(('failed', algorithm_name, (portfolio.status, portfolio.error), execution_time,
+                         False, instrumentation()))
+            return
+        positions = {id(action): i for i, action in enumerate(actions)}
+        results.put((
+            'result',
+            algorithm_name,
+            ([positions[id(action)] for action in portfolio.actions], portfolio.proven),
+            execution_time,
+            portfolio.from_cache,
+            instrumentation()
+        ))
+    except SystemExit:
+        return  # Annulé par le parent: aucun résultat attendu
+    except BaseException as e:
+        results.put(('error', algorithm_name, str(e), 0.0, False, instrumentation()))
+
+
+class ConcurrentController:
+    """
+    Exécute plusieurs algorithmes en parallèle (un processus chacun)
+
+    Les résultats sont produits dans l'ordre où ils se terminent. Dès qu'un
+    algorithme rend une solution prouvée optimale, les autres peuvent être
+    annulés.
+
+    Les phases (PerformanceTracker) et métriques (SolverMetrics) de chaque
+    processus sont rattachées à celles du parent à la réception de son
+    résultat; un processus annulé ne renvoie rien.
+    """
+
+    def __init__(self, budget=500000, result_cache=None, dp_precision=None, timeout=None,
+                 memory_limit_mb=None, race_deadline=60.0, progress=None, checkpoints=None,
+                 dp_storage='dict', dp_memory_mb=None, brute_force_max_actions=None,
+                 tracker=None, metrics=None):
+        """
+        Args:
+            budget: Budget des résolutions
+            result_cache: ResultCache (chaque processus ouvre le même dossier)
+            dp_precision: Précision de la DP (None: automatique)
+            timeout: Délai maximal par algorithme (secondes)
+            memory_limit_mb: Si défini, chaque algorithme tourne dans un
+                processus isolé plafonné à cette mémoire (Mo)
+            race_deadline, progress, checkpoints, dp_storage, dp_memory_mb,
+            brute_force_max_actions:
+                Paramètres transmis à l'AlgorithmController de chaque processus
+            tracker: PerformanceTracker recevant les phases des processus
+            metrics: SolverMetrics recevant les métriques des processus
+        """
+        self.budget = budget
+        self.dp_precision = dp_precision
+        self.use_cache = result_cache is not None
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.race_deadline = race_deadline
+        self.progress = progress
+        self.checkpoints = checkpoints
+        self.dp_storage = dp_storage
+        self.dp_memory_mb = dp_memory_mb
+        self.brute_force_max_actions = brute_force_max_actions
+        self.tracker = tracker or DISABLED_TRACKER
+        self.metrics = metrics or DISABLED_METRICS
+
+    @classmethod
+    def from_controller(cls, controller, timeout=None, memory_limit_mb=None):
+        """Exécution en parallèle avec la configuration d'un AlgorithmController"""
+        return cls(
+            controller.budget, controller.result_cache, dp_precision=controller.dp_precision,
+            timeout=timeout, memory_limit_mb=memory_limit_mb, race_deadline=controller.race_deadline,
+            progress=controller.progress, checkpoints=controller.checkpoints,
+            dp_storage=controller.dp_storage, dp_memory_mb=controller.dp_memory_mb,
+            brute_force_max_actions=controller.brute_force_max_actions,
+            tracker=controller.tracker, metrics=controller.metrics
+        )
+
+    def _settings(self, index):
+        """Paramètres de l'AlgorithmController du index-ième processus"""
+        settings = {
+            'budget': self.budget,
+            'dp_precision': self.dp_precision,
+            'race_deadline': self.race_deadline,
+            'progress': self.progress.for_worker(index) if self.progress is not None else None,
+            'checkpoints': self.checkpoints,
+            'dp_storage': self.dp_storage,
+            'dp_memory_mb': self.dp_memory_mb
+        }
+        if self.memory_limit_mb is not None:
+            settings['memory_limit_mb'] = self.memory_limit_mb
+        if self.brute_force_max_actions is not None:
+            settings['brute_force_max_actions'] = self.brute_force_max_actions
+        return settings
+
+    def run(self, algorithm_keys, actions, cancel_on_exact=True):
+        """
+        Générateur d'événements:
+            ('result', clé, portfolio, temps)   (portfolio.status: issue de la résolution)
+            ('error', clé, message, 0.0)
+            ('cancelled', clé, None, 0.0)
+
+        Un Ctrl-C pendant l'attente annule les algorithmes encore en cours.
+        """
+        results = multiprocessing.Queue()
+        processes = {}
+        trace = None
+        if self.tracker.enabled:
+            trace = 'memory' if self.tracker.trace_memory else 'spans'
+        for index, algorithm_name in enumerate(algorithm_keys):
+            process = multiprocessing.Process(
+                target=_solve_worker,
+                args=(algorithm_name, actions, self._settings(index), self.use_cache,
+                      self.timeout, self.memory_limit_mb, results, trace, self.metrics.enabled)
+            )
+            process.start()
+            processes[algorithm_name] = process
+
+        try:
+            while processes:
+                try:
+                    message = results.get(timeout=0.2)
+                except queue_module.Empty:
+                    # Processus mort sans réponse (ex: tué par le système)
+                    for name, process in list(processes.items()):
+                        if process.exitcode not in (None, 0):
+                            del processes[name]
+                            yield 'error', name, f"processus terminé (code {process.exitcode})", 0.0
+                    continue
+
+                kind, algorithm_name, payload, execution_time, from_cache, instrumentation = message
+                processes.pop(algorithm_name).join()
+                self._adopt(*instrumentation)
+
+                if kind == 'error':
+                    yield 'error', algorithm_name, payload, execution_time
+                    continue
+
+                if kind == 'failed':
+                    yield 'result', algorithm_name, AlgorithmController._failed(*payload), execution_time
+                    continue
+
+                indices, proven = payload
+                portfolio = Portfolio([actions[i] for i in indices])
+                portfolio.from_cache = from_cache
+                portfolio.proven = proven
+                yield 'result', algorithm_name, portfolio, execution_time
+
+                # Seule une solution prouvée optimale rend les autres inutiles
+                # (DP arrondie ou course interrompue: on attend les autres)
+                if cancel_on_exact and portfolio.actions and portfolio.proven:
+                    yield from self._cancel(processes)
+
+        except KeyboardInterrupt:
+            yield from self._cancel(processes)
+        finally:
+            for process in processes.values():
+                process.terminate()
+            results.close()
+
+    def _adopt(self, spans, snapshot):
+        """Rattache les phases et métriques d'un processus à celles du parent"""
+        self.tracker.adopt(spans)
+        if snapshot is not None and self.metrics.enabled:
+            self.metrics.registry.merge(snapshot)
+
+    @staticmethod
+    def _cancel(processes):
+        for algorithm_name, process in list(processes.items()):
+            process.terminate()
+            process.join()
+            del processes[algorithm_name]
+            yield 'cancelled', algorithm_name, None, 0.0
@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+import os
+
+
+class ExportController:
+    """
+    Contrôleur pour l'export des résultats en masse
+
+    Formats:
+    - jsonl   : un enregistrement JSON par résultat (métadonnées + actions)
+    - csv     : une ligne par action sélectionnée + métadonnées dans
+                <fichier>.meta.jsonl (un enregistrement JSON par résultat)
+    - parquet : mêmes colonnes que le CSV (nécessite pyarrow)
+
+    Chaque export construit tout le contenu en mémoire puis l'écrit en un
+    seul appel. Avec append=True, plusieurs couples (dataset, algorithme)
+    s'accumulent dans le même fichier: jsonl et csv sont ouverts en ajout
+    (coût proportionnel au seul résultat ajouté), parquet est réécrit.
+    """
+
+    FORMATS = ('jsonl', 'csv', 'parquet')
+    ROW_FIELDS = ['dataset', 'algorithm', 'action_id', 'cost', 'profit', 'profit_pct']
+    # Types pyarrow des colonnes (même ordre que ROW_FIELDS)
+    ROW_TYPES = ['string', 'string', 'string', 'int64', 'float64', 'float64']
+
+    @staticmethod
+    def make_result(dataset, algorithm_name, portfolio, execution_time, budget):
+        """Regroupe un résultat de résolution pour l'export"""
+        return {
+            'dataset': dataset,
+            'algorithm': algorithm_name,
+            'portfolio': portfolio,
+            'execution_time': execution_time,
+            'budget': budget
+        }
+
+    @staticmethod
+    def _metadata(result):
+        portfolio = result['portfolio']
+        return {
+            'dataset': result['dataset'],
+            'algorithm': result['algorithm'],
+            'execution_time': result['execution_time'],
+            'budget': result['budget'],
+            'total_cost': portfolio.total_cost,
+            'total_profit': portfolio.total_profit,
+            'budget_remaining': result['budget'] - portfolio.total_cost,
+            'action_count': len(portfolio.actions),
+            'from_cache': getattr(portfolio, 'from_cache', False)
+        }
+
+    @classmethod
+    def _rows(cls, results):
+        for result in results:
+            for action in result['portfolio'].actions:
+                yield (
+                    result['dataset'],
+                    result['algorithm'],
+                    action.id,
+                    action.cost,
+                    action.profit,
+                    action.profit_pct
+                )
+
+    @staticmethod
+    def _prepare(filename):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Formats
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def export_jsonl(cls, filename, results, append=False):
+        """Un résultat par ligne: métadonnées + liste des actions sélectionnées"""
+        cls._prepare(filename)
+        lines = []
+        for result in results:
+            record = cls._metadata(result)
+            record['actions'] = [
+                {'id': a.id, 'cost': a.cost, 'profit': a.profit, 'profit_pct': a.profit_pct}
+                for a in result['portfolio'].actions
+            ]
+            lines.append(json.dumps(record, ensure_ascii=False))
+
+        with open(filename, 'a' if append else 'w', encoding='utf-8') as file:
+            file.write(''.join(line + '\n' for line in lines))
+
+    @classmethod
+    def export_csv(cls, filename, results, append=False):
+        """CSV plat (une ligne par action) + métadonnées dans <fichier>.meta.jsonl"""
+        cls._prepare(filename)
+        # En-tête seulement pour un fichier nouveau (ou vide)
+        write_header = not (append and os.path.exists(filename) and os.path.getsize(filename) > 0)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if write_header:
+            writer.writerow(cls.ROW_FIELDS)
+        writer.writerows(cls._rows(results))
+
+        with open(filename, 'a' if append else 'w', newline='', encoding='utf-8') as file:
+            file.write(buffer.getvalue())
+
+        # Métadonnées en JSON Lines: l'ajout ne relit pas les résultats précédents
+        lines = [json.dumps(cls._metadata(result), ensure_ascii=False) for result in results]
+        with open(f"{filename}.meta.jsonl", 'a' if append else 'w', encoding='utf-8') as file:
+            file.write(''.join(line + '\n' for line in lines))
+
+    @classmethod
+    def export_parquet(cls, filename, results, append=False):
+        """Parquet colonnaire (métadonnées dans les métadonnées du schéma)"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Export Parquet indisponible: pip install pyarrow")
+
+        cls._prepare(filename)
+        # Schéma explicite: un fichier sans action aurait sinon des colonnes de type null
+        schema = pa.schema([
+            (name, pa.type_for_alias(type_name)) for name, type_name in zip(cls.ROW_FIELDS, cls.ROW_TYPES)
+        ])
+        columns = list(zip(*cls._rows(results))) or [()] * len(cls.ROW_FIELDS)
+        table = pa.table({name: list(values) for name, values in zip(cls.ROW_FIELDS, columns)}, schema=schema)
+        metadata = [cls._metadata(result) for result in results]
+
+        if append and os.path.exists(filename):
+            previous = pq.read_table(filename)
+            previous_meta = (previous.schema.metadata or {}).get(b'results', b'[]')
+            metadata = json.loads(previous_meta) + metadata
+            table = pa.concat_tables([previous.replace_schema_metadata(None).cast(schema), table])
+
+        table = table.replace_schema_metadata({'results': json.dumps(metadata, ensure_ascii=False)})
+        pq.write_table(table, filename)
+
+    @classmethod
+    def export(cls, filename, results, fmt=None, append=False):
+        """
+        Exporte une liste de résultats (voir make_result)
+
+        Args:
+            filename: Fichier de sortie
+            results: Liste de résultats
+            fmt: 'jsonl', 'csv' ou 'parquet' (déduit de l'extension si None)
+            append: Ajouter au fichier existant au lieu de le remplacer
+        """
+        if fmt is None:
+            fmt = os.path.splitext(filename)[1].lower().lstrip('.')
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Format d'export inconnu: {fmt} (attendu: {', '.join(cls.FORMATS)})")
+
+        getattr(cls, f"export_{fmt}")(filename, results, append=append)
@@ -1,6 +1,187 @@
-import pandas as pd
+import csv
+import hashlib
+import inspect
+import io
 import os
-from models.action import Action
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from models.action_store import ActionStore
+from utils.knapsack_bounds import fixed_profits, lp_reduction_mask
+from utils.metrics import DISABLED_METRICS
+from utils.performance_tracker import DISABLED_TRACKER
+
+# Valeurs considérées comme manquantes (équivalent des NaN de pandas)
+MISSING_VALUES = {'', 'nan', 'NaN', 'NA', 'N/A', 'n/a', 'null', 'NULL', 'None', '#N/A'}
+REQUIRED_COLUMNS = ['id', 'cost', 'profit_pct']
+
+# En dessous de cette taille, le coût de démarrage des processus domine
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# À incrémenter lors d'un changement des règles de nettoyage
+CLEANING_RULES_VERSION = "1"
+
+
+def _silent(*args, **kwargs):
+    pass
+
+
+def _detect_columns(columns):
+    """Détection automatique du format: nom de colonne -> champ de l'action"""
+    column_mapping = {}
+
+    for col in columns:
+        col_lower = str(col).lower()
+        if 'action' in col_lower or 'name' in col_lower or 'id' in col_lower or 'share' in col_lower:
+            column_mapping['id'] = col
+        elif 'cout' in col_lower or 'cost' in col_lower or 'price' in col_lower or 'prix' in col_lower:
+            column_mapping['cost'] = col
+        elif 'benefice' in col_lower or 'profit' in col_lower or 'rendement' in col_lower or '%' in col_lower:
+            column_mapping['profit_pct'] = col
+
+    return column_mapping
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value  # NaN
+    if isinstance(value, str):
+        return value.strip() in MISSING_VALUES
+    return False
+
+
+def _clean_profit_pct(value):
+    """Nettoie la colonne profit_pct (enlève les %, virgules décimales) et normalise"""
+    if isinstance(value, str):
+        # Enlever les % et espaces
+        value = value.replace('%', '').strip()
+        # Remplacer les virgules par des points
+        value = value.replace(',', '.')
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if value != value:
+        return None
+    # Si le profit_pct est > 1, c'est probablement un pourcentage (15.5 → 0.155)
+    if value > 1:
+        value = value / 100.0
+    return value
+
+
+def _parse_row(row, indices):
+    """
+    Nettoie une ligne brute
+
+    Args:
+        row: Séquence de valeurs (ligne CSV ou Excel)
+        indices: Positions des colonnes (id, cost, profit_pct)
+
+    Returns:
+        tuple: ((id, coût, profit_pct), None) si la ligne est valide, sinon (None, motif)
+    """
+    id_idx, cost_idx, profit_idx = indices
+    try:
+        raw_id, raw_cost, raw_profit = row[id_idx], row[cost_idx], row[profit_idx]
+    except IndexError:
+        return None, 'ligne_incomplete'
+
+    if _is_missing(raw_id) or _is_missing(raw_cost) or _is_missing(raw_profit):
+        return None, 'valeur_manquante'
+
+    try:
+        cost = float(raw_cost.strip() if isinstance(raw_cost, str) else raw_cost)
+    except (TypeError, ValueError):
+        return None, 'cout_invalide'
+    if not cost > 0:
+        return None, 'cout_non_positif'
+
+    profit_pct = _clean_profit_pct(raw_profit)
+    if profit_pct is None:
+        return None, 'profit_invalide'
+
+    action_id = raw_id.strip() if isinstance(raw_id, str) else str(raw_id)
+    return (action_id, int(cost), profit_pct), None
+
+
+def _prefilter_reason(cost, profit_pct, budget):
+    """Motif d'exclusion d'une action valide qui ne peut pas être dans un portefeuille optimal"""
+    if cost > budget:
+        return 'cout_superieur_budget'
+    if profit_pct <= 0:
+        return 'profit_non_positif'
+    return None
+
+
+@lru_cache(maxsize=1)
+def cleaning_version():
+    """Version des règles de nettoyage: constante + empreinte du source des fonctions de nettoyage"""
+    rules = (_detect_columns, _is_missing, _clean_profit_pct, _parse_row, _prefilter_reason)
+    source = ''.join(inspect.getsource(rule) for rule in rules) + repr(sorted(MISSING_VALUES))
+    source_hash = hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{CLEANING_RULES_VERSION}-{source_hash}"
+
+
+def _ingest_rows(rows, indices, store, budget=None):
+    """
+    Alimente le store colonnaire en une seule passe (générateur consommé ligne à ligne)
+
+    Avec un budget, les actions trop chères ou sans profit sont écartées au fil de l'eau.
+    """
+    for row in rows:
+        store.total_rows += 1
+        values, reason = _parse_row(row, indices)
+        if values is None:
+            store.reject(reason)
+            continue
+        if budget is not None:
+            reason = _prefilter_reason(values[1], values[2], budget)
+            if reason is not None:
+                store.prune(reason)
+                continue
+        store.append(*values)
+    return store
+
+
+def _csv_chunk_offsets(filename, data_start, n_chunks):
+    """
+    Découpe le fichier en plages d'octets alignées sur des fins de ligne
+
+    Hypothèse: un enregistrement par ligne (pas de retour à la ligne dans
+    un champ entre guillemets).
+    """
+    size = os.path.getsize(filename)
+    chunk_size = max(1, (size - data_start) // n_chunks)
+    offsets = [data_start]
+
+    with open(filename, 'rb') as file:
+        for i in range(1, n_chunks):
+            target = data_start + i * chunk_size
+            if target <= offsets[-1]:
+                continue
+            file.seek(target)
+            file.readline()  # avancer jusqu'au début de la ligne suivante
+            position = file.tell()
+            if position >= size:
+                break
+            offsets.append(position)
+
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def _parse_csv_chunk(filename, start, end, indices, budget=None):
+    """Worker: nettoie une plage d'octets du CSV et retourne un ActionStore partiel"""
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+
+    rows = (row for row in csv.reader(io.StringIO(text, newline='')) if row)
+    return _ingest_rows(rows, indices, ActionStore(), budget)
+
 
 class FileController:
     """Contrôleur pour la gestion des fichiers"""
@@ -24,123 +205,261 @@ class FileController:
         return available_files
     
     @staticmethod
-    def read_actions(filename):
-        """Lit un fichier Excel ou CSV et retourne une liste d'actions"""
-        actions = []
+    def _iter_csv_rows(filename):
+        """Générateur: retourne l'en-tête puis chaque ligne du CSV, sans tout charger"""
+        with open(filename, 'r', newline='', encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            header = next(reader, [])
+            yield header
+            for row in reader:
+                if row:
+                    yield row
+
+    @staticmethod
+    def _iter_excel_rows(filename):
+        """
+        Générateur: retourne l'en-tête puis chaque ligne du classeur Excel
+
+        Les .xlsx sont lus en flux (openpyxl, read_only=True): seule la ligne
+        courante est en mémoire. Les .xls (ou l'absence d'openpyxl) passent
+        par pandas, qui charge la feuille entière.
+        """
+        if filename.lower().endswith('.xlsx'):
+            try:
+                import openpyxl
+            except ImportError:
+                openpyxl = None
+
+            if openpyxl is not None:
+                workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+                try:
+                    rows = workbook.active.iter_rows(values_only=True)
+                    header = next(rows, ())
+                    yield ['' if col is None else col for col in header]
+                    for row in rows:
+                        if any(value is not None for value in row):
+                            yield row
+                finally:
+                    workbook.close()
+                return
+
+        import pandas as pd
+
+        df = pd.read_excel(filename)
+        yield list(df.columns)
+        yield from df.itertuples(index=False, name=None)
+
+    @staticmethod
+    def load_store(filename, cache=None, verbose=True, workers=None, budget=None, tracker=None,
+                   metrics=None):
+        """
+        Lit un fichier Excel ou CSV en streaming et retourne un ActionStore colonnaire
+
+        Les lignes invalides sont rejetées et comptées par motif (store.rejected).
+
+        Args:
+            filename: Chemin du fichier
+            cache: DatasetCache optionnel (évite de ré-analyser un fichier inchangé)
+            verbose: Afficher les étapes du chargement
+            workers: Nombre de processus pour les gros CSV (None = lecture séquentielle)
+            budget: Si fourni, ne garde que les candidats utiles pour ce budget
+                (voir _prune_for_budget); le détail est dans store.pruned
+            tracker: PerformanceTracker optionnel (phases clean / presolve)
+            metrics: SolverMetrics optionnel (durée, actions, rejets, cache)
+        """
+        log = print if verbose else _silent
+        tracker = tracker or DISABLED_TRACKER
+        metrics = metrics or DISABLED_METRICS
+        start_time = time.perf_counter()
+        store = ActionStore()
+        # Le cache conserve le dataset complet: le filtrage se fait alors après coup
+        stream_budget = budget if cache is None else None
         try:
+            if cache is not None:
+                with tracker.span('cache'):
+                    cached_store = cache.get(filename)
+                metrics.observe_cache('dataset', cached_store is not None)
+                if cached_store is not None:
+                    log(f"⚡ Dataset chargé depuis le cache: {len(cached_store)} actions")
+                    if budget is not None:
+                        cached_store = FileController._presolve(cached_store, budget, log, tracker)
+                    metrics.observe_load(time.perf_counter() - start_time, len(cached_store), 0,
+                                         from_cache=True)
+                    return cached_store
+
             # Vérifier l'extension du fichier
             file_extension = os.path.splitext(filename)[1].lower()
-            
+
             if file_extension in ['.xlsx', '.xls']:
-                # Lecture fichier Excel
-                df = pd.read_excel(filename)
+                rows = FileController._iter_excel_rows(filename)
             elif file_extension == '.csv':
-                # Lecture fichier CSV
-                df = pd.read_csv(filename)
+                rows = FileController._iter_csv_rows(filename)
             else:
-                print(f"Format de fichier non supporté: {file_extension}")
-                return actions
-            
-            print(f"📊 Colonnes détectées: {list(df.columns)}")
-            print(f"📈 Nombre de lignes total: {len(df)}")
-            
-            # Détection automatique du format
-            column_mapping = {}
-            
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'action' in col_lower or 'name' in col_lower or 'id' in col_lower or 'share' in col_lower:
-                    column_mapping['id'] = col
-                elif 'cout' in col_lower or 'cost' in col_lower or 'price' in col_lower or 'prix' in col_lower:
-                    column_mapping['cost'] = col
-                elif 'benefice' in col_lower or 'profit' in col_lower or 'rendement' in col_lower or '%' in col_lower:
-                    column_mapping['profit_pct'] = col
-            
-            print(f"🔍 Mapping détecté: {column_mapping}")
-            
+                log(f"Format de fichier non supporté: {file_extension}")
+                return store
+
+            columns = next(rows, [])
+            log(f"📊 Colonnes détectées: {list(columns)}")
+
+            column_mapping = _detect_columns(columns)
+            log(f"🔍 Mapping détecté: {column_mapping}")
+
             # Vérifier que toutes les colonnes nécessaires sont trouvées
-            required_columns = ['id', 'cost', 'profit_pct']
-            if not all(col in column_mapping for col in required_columns):
-                print("❌ Format non reconnu. Colonnes attendues:")
-                print("   - Nom de l'action (Action-1, Share-XXXX, etc.)")
-                print("   - Coût (en euros/F CFA)")
-                print("   - Bénéfice (en pourcentage)")
-                print(f"📋 Colonnes trouvées: {list(df.columns)}")
-                return actions
-            
-            # Renommer les colonnes
-            df = df.rename(columns=column_mapping)
-            
-            # Nettoyer les données
-            df_clean = df.dropna(subset=required_columns)
-            
-            # Nettoyer la colonne profit_pct (enlever les % et convertir)
-            def clean_profit_pct(value):
-                if isinstance(value, str):
-                    # Enlever les % et espaces
-                    value = value.replace('%', '').strip()
-                    # Remplacer les virgules par des points
-                    value = value.replace(',', '.')
-                try:
-                    return float(value)
-                except:
-                    return None
-            
-            df_clean['profit_pct'] = df_clean['profit_pct'].apply(clean_profit_pct)
-            df_clean = df_clean.dropna(subset=['profit_pct'])
-            
-            # Filtrer les coûts positifs
-            df_clean = df_clean[df_clean['cost'] > 0]
-            
-            print(f"✅ Données valides après nettoyage: {len(df_clean)} actions")
-            
-            # Créer les objets Action
-            for index, row in df_clean.iterrows():
-                try:
-                    # Si le profit_pct est > 1, c'est probablement un pourcentage (15.5 → 0.155)
-                    profit_pct_value = row['profit_pct']
-                    if profit_pct_value > 1:
-                        profit_pct_value = profit_pct_value / 100.0
-                    
-                    action = Action(
-                        action_id=row['id'],
-                        cost=row['cost'],
-                        profit_pct=profit_pct_value
-                    )
-                    actions.append(action)
-                    
-                except (ValueError, KeyError, TypeError) as e:
-                    print(f"Erreur création action {row['id']}: {e}")
-                    continue
-                    
-            print(f"🎯 {len(actions)} actions créées avec succès")
-                    
+            if not all(col in column_mapping for col in REQUIRED_COLUMNS):
+                log("❌ Format non reconnu. Colonnes attendues:")
+                log("   - Nom de l'action (Action-1, Share-XXXX, etc.)")
+                log("   - Coût (en euros/F CFA)")
+                log("   - Bénéfice (en pourcentage)")
+                log(f"📋 Colonnes trouvées: {list(columns)}")
+                return store
+
+            columns = list(columns)
+            indices = tuple(columns.index(column_mapping[col]) for col in REQUIRED_COLUMNS)
+
+            with tracker.span('clean'):
+                if (workers and workers > 1 and file_extension == '.csv'
+                        and os.path.getsize(filename) >= PARALLEL_MIN_BYTES):
+                    rows.close()
+                    log(f"⚙️  Lecture parallèle: {workers} processus")
+                    FileController._ingest_csv_parallel(filename, indices, workers, store, stream_budget)
+                else:
+                    _ingest_rows(rows, indices, store, stream_budget)
+                tracker.count('rows', store.total_rows)
+                tracker.count('rejected', sum(store.rejected.values()))
+
+            log(f"📈 Nombre de lignes total: {store.total_rows}")
+            valid_rows = len(store) + sum(store.pruned.values())
+            log(f"✅ Données valides après nettoyage: {valid_rows} actions")
+            if store.rejected:
+                details = ", ".join(f"{reason}: {count}" for reason, count in store.rejected.most_common())
+                log(f"🧹 Lignes rejetées: {sum(store.rejected.values())} ({details})")
+
+            if cache is not None and len(store):
+                cache.put(filename, store)
+
+            if budget is not None:
+                store = FileController._presolve(store, budget, log, tracker)
+
+            metrics.observe_load(time.perf_counter() - start_time, len(store),
+                                 sum(store.rejected.values()))
+
         except FileNotFoundError:
             print(f"❌ Fichier {filename} non trouvé")
         except Exception as e:
             print(f"❌ Erreur lecture fichier {filename}: {e}")
-            
+
+        return store
+
+    @staticmethod
+    def _ingest_csv_parallel(filename, indices, workers, store, budget=None):
+        """
+        Nettoie le CSV par blocs dans un pool de processus
+
+        Les blocs sont concaténés dans l'ordre du fichier et les motifs de
+        rejet sont agrégés dans le store final.
+        """
+        with open(filename, 'rb') as file:
+            header_line = file.readline()
+        # Plusieurs blocs par processus pour équilibrer la charge
+        chunks = _csv_chunk_offsets(filename, len(header_line), workers * 4)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = executor.map(
+                _parse_csv_chunk,
+                [filename] * len(chunks),
+                [start for start, _ in chunks],
+                [end for _, end in chunks],
+                [indices] * len(chunks),
+                [budget] * len(chunks)
+            )
+            for part in parts:
+                store.ids.extend(part.ids)
+                store.costs.extend(part.costs)
+                store.profit_pcts.extend(part.profit_pcts)
+                store.total_rows += part.total_rows
+                store.rejected.update(part.rejected)
+                store.pruned.update(part.pruned)
+
+        return store
+
+    @staticmethod
+    def _presolve(store, budget, log, tracker):
+        with tracker.span('presolve'):
+            store = FileController._prune_for_budget(store, budget, log)
+            tracker.count('pruned', sum(store.pruned.values()))
+        return store
+
+    @staticmethod
+    def _prune_for_budget(store, budget, log=print):
+        """
+        Ne conserve que les candidats compatibles avec une solution optimale
+
+        1. Coût > budget ou profit <= 0 (si non déjà fait pendant la lecture)
+        2. Réduction par borne LP contre le glouton (utils.knapsack_bounds)
+        """
+        keep = []
+        for i, (cost, profit_pct) in enumerate(zip(store.costs, store.profit_pcts)):
+            reason = _prefilter_reason(cost, profit_pct, budget)
+            if reason is None:
+                keep.append(i)
+            else:
+                store.prune(reason)
+        if len(keep) < len(store):
+            store = store.subset(keep)
+
+        costs = np.asarray(store.costs, dtype=np.int64)
+        profits = fixed_profits(costs, store.profit_pcts)
+        mask, _ = lp_reduction_mask(costs, profits, budget)
+        dropped = int(len(mask) - mask.sum())
+        if dropped:
+            store.pruned['borne_lp'] += dropped
+            store = store.subset(np.flatnonzero(mask).tolist())
+
+        if store.pruned:
+            details = ", ".join(f"{reason}: {count}" for reason, count in store.pruned.most_common())
+            log(f"✂️  Pré-filtrage (budget {budget:,}): {sum(store.pruned.values())} écartées ({details})")
+        return store
+
+    @staticmethod
+    def read_actions(filename, cache=None, workers=None, budget=None, tracker=None, metrics=None):
+        """Lit un fichier Excel ou CSV et retourne une liste d'actions"""
+        tracker = tracker or DISABLED_TRACKER
+        with tracker.span('load'):
+            store = FileController.load_store(
+                filename, cache=cache, workers=workers, budget=budget, tracker=tracker,
+                metrics=metrics
+            )
+            with tracker.span('build'):
+                actions = store.to_actions()
+        if actions:
+            print(f"🎯 {len(actions)} actions créées avec succès")
         return actions
     
     @staticmethod
-    def export_results(filename, portfolio, algorithm_name, execution_time):
-        """Exporte les résultats dans un fichier CSV"""
+    def export_results(filename, portfolio, algorithm_name, execution_time, budget=500000):
+        """Exporte les résultats dans un fichier CSV (formats en masse: ExportController)"""
         try:
             # Créer le dossier si nécessaire
             os.makedirs(os.path.dirname(filename), exist_ok=True)
             
+            lines = [
+                f"Algorithme,{algorithm_name}",
+                f"Temps d'exécution,{execution_time:.4f}s",
+                f"Coût total,{portfolio.total_cost}",
+                f"Profit total,{portfolio.total_profit:.0f}",
+                f"Nombre d'actions,{len(portfolio.actions)}",
+                f"Budget restant,{budget - portfolio.total_cost}",
+                "",
+                "Actions sélectionnées,Coût,Profit,Rentabilité (%)"
+            ]
+            lines.extend(
+                f"{action.id},{action.cost},{action.profit:.0f},{action.profit_pct*100:.2f}%"
+                for action in portfolio.actions
+            )
+            
+            # Une seule écriture pour tout le fichier
             with open(filename, 'w', newline='', encoding='utf-8') as file:
-                file.write(f"Algorithme,{algorithm_name}\n")
-                file.write(f"Temps d'exécution,{execution_time:.4f}s\n")
-                file.write(f"Coût total,{portfolio.total_cost}\n")
-                file.write(f"Profit total,{portfolio.total_profit:.0f}\n")
-                file.write(f"Nombre d'actions,{len(portfolio.actions)}\n")
-                file.write(f"Budget restant,{500000 - portfolio.total_cost}\n")
-                file.write("\n")
-                file.write("Actions sélectionnées,Coût,Profit,Rentabilité (%)\n")
-                
-                for action in portfolio.actions:
-                    file.write(f"{action.id},{action.cost},{action.profit:.0f},{action.profit_pct*100:.2f}%\n")
+                file.write("\n".join(lines) + "\n")
                     
         except Exception as e:
-            print(f"❌ Erreur lors de l'export: {e}")
\ No newline at end of file
+            print(f"❌ Erreur lors de l'export: {e}")
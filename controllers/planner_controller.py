@@ -0,0 +1,276 @@
+import math
+from functools import reduce
+
+import numpy as np
+
+from utils.calibration import load_rates
+from utils.dp_table import MB, row_bytes, working_bytes
+from utils.knapsack_bounds import dantzig_upper_bound, greedy_lower_bound
+
+# Taille maximale par défaut de la force brute (2^20 combinaisons: quelques secondes)
+BRUTE_FORCE_MAX_ACTIONS = 20
+
+
+class PlannerController:
+    """
+    Planificateur de résolution: estime le temps et la mémoire de chaque
+    algorithme pour un dataset, puis choisit le plus rapide des algorithmes
+    exacts qui tient dans le plafond mémoire (et le délai), sinon la
+    meilleure approximation avec sa garantie.
+
+    Modèle d'estimation (unités de travail / débit de la machine):
+    - Force brute : 2^n combinaisons × (1 + n/2) additions
+    - DP          : n × S états × (1 + L) copies, S = min(2^n, W/p + 1, Σc/p + 1),
+                    L = taille moyenne d'une solution partielle
+    - DP (tables) : n × (W/p + 1) cellules; mémoire O(W/p) plus les décisions
+                    (n × W/8p octets), bornée par le budget dp_memory_mb
+    - Séparation  : nœuds ≈ P, P = estimation du front de Pareto
+                    (min(2^n, W/pgcd + 1, n²): O(n²) attendu sur instances aléatoires)
+    - Glouton     : n log2 n par stratégie
+    """
+
+    # Débits par défaut (unités de travail par seconde), remplacés par les
+    # mesures de utils.calibration lorsque la machine a été calibrée
+    DEFAULT_RATES = {
+        "brute_force": 5.5e6,
+        "dynamic_programming": 1.0e7,
+        "dynamic_programming_table": 2.0e8,
+        "branch_and_bound": 1.3e6,
+        "greedy": 5.0e7
+    }
+
+    # Mémoire d'un état de la DP (entrée de dict + tuple + float + liste), en octets
+    DP_STATE_BYTES = 240
+    # Plus grossière précision proposée pour la DP approchée (F CFA)
+    MAX_DP_PRECISION = 10000
+
+    def __init__(self, budget=500000, memory_limit_mb=1024, time_limit=60.0, rates=None,
+                 brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS, dp_storage='dict', dp_memory_mb=None):
+        """
+        Args:
+            budget: Budget d'investissement
+            memory_limit_mb: Plafond mémoire d'une résolution (Mo)
+            time_limit: Délai au-delà duquel un algorithme exact est écarté (s)
+            rates: Débits par algorithme (None: calibration de la machine si
+                disponible, sinon DEFAULT_RATES)
+            brute_force_max_actions: Taille au-delà de laquelle la force
+                brute refuse de résoudre (jamais proposée)
+            dp_storage: Stockage de la DP ('dict', 'table' ou 'memmap')
+            dp_memory_mb: Budget mémoire de la DP par tables (Mo, None:
+                moitié du plafond)
+        """
+        self.budget = budget
+        self.memory_limit_mb = memory_limit_mb
+        self.time_limit = time_limit
+        self.brute_force_max_actions = brute_force_max_actions
+        self.dp_storage = dp_storage
+        self.dp_memory_mb = dp_memory_mb or memory_limit_mb / 2
+        if rates is None:
+            rates = load_rates() or {}
+            # True si les débits viennent d'une calibration de la machine
+            self.calibrated = bool(rates)
+        else:
+            self.calibrated = False
+        self.rates = dict(self.DEFAULT_RATES, **rates)
+
+    # ------------------------------------------------------------------
+    # Caractéristiques du dataset
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cost_gcd(costs):
+        """PGCD des coûts: précision maximale de la DP exacte"""
+        return reduce(math.gcd, (int(c) for c in costs), 0) or 1
+
+    @staticmethod
+    def pareto_estimate(n, capacity_states):
+        """Taille estimée du front de Pareto (coût, profit) des sous-ensembles"""
+        return min(2.0 ** min(n, 1000), capacity_states, max(n, 1) ** 2)
+
+    def dataset_stats(self, actions):
+        """Grandeurs utilisées par le modèle de coût"""
+        costs = np.array([a.cost for a in actions], dtype=np.int64)
+        profits = np.array([a.profit_fp for a in actions], dtype=np.int64)
+        n = len(actions)
+        mean_cost = float(costs.mean()) if n else 1.0
+        # Bornes en virgule fixe (seul leur rapport est utilisé)
+        lower_bound, _ = greedy_lower_bound(costs, profits, self.budget) if n else (0, [])
+        upper_bound = dantzig_upper_bound(costs, profits, self.budget) if n else 0.0
+        return {
+            'n': n,
+            'budget': self.budget,
+            'gcd': self.cost_gcd(costs.tolist()),
+            'total_cost': int(costs.sum()),
+            # Taille moyenne d'un portefeuille partiel pendant la DP
+            'avg_solution_size': min(n, self.budget / mean_cost) / 2 + 1 if n else 1,
+            'lower_bound': lower_bound,
+            'upper_bound': upper_bound
+        }
+
+    # ------------------------------------------------------------------
+    # Estimations
+    # ------------------------------------------------------------------
+
+    def dp_states(self, stats, precision):
+        return min(
+            2.0 ** min(stats['n'], 1000),
+            stats['budget'] // precision + 1,
+            stats['total_cost'] // precision + 1
+        )
+
+    def work_and_memory(self, algorithm_name, stats, precision=None):
+        """
+        Modèle de coût d'une résolution
+
+        Returns:
+            tuple: (unités de travail, mémoire de pointe en octets)
+        """
+        n = stats['n']
+        if algorithm_name == "brute_force":
+            return 2.0 ** min(n, 1000) * (1 + n / 2), n * 8
+        if algorithm_name == "dynamic_programming" and self.dp_storage != 'dict':
+            capacity = stats['budget'] // (precision or stats['gcd'])
+            decisions = n * row_bytes(capacity)
+            # Décisions en mémoire si elles tiennent dans le budget, sinon
+            # fenêtre du fichier np.memmap (au moins une ligne)
+            resident = min(decisions, max(row_bytes(capacity), self.dp_memory_mb * MB - working_bytes(capacity)))
+            return n * (capacity + 1), working_bytes(capacity) + resident
+        if algorithm_name == "dynamic_programming":
+            states = self.dp_states(stats, precision or stats['gcd'])
+            size = stats['avg_solution_size']
+            # Deux tables vivantes (dp et new_dp)
+            return n * states * (1 + size), 2 * states * (self.DP_STATE_BYTES + 8 * size)
+        if algorithm_name == "branch_and_bound":
+            pareto = self.pareto_estimate(n, stats['budget'] // stats['gcd'] + 1)
+            return pareto, n * n * 8 + n * 200
+        if algorithm_name == "greedy":
+            return 4 * n * max(1.0, math.log2(max(n, 2))), 4 * n * 8
+        raise ValueError(f"Algorithme inconnu: {algorithm_name}")
+
+    def estimate(self, algorithm_name, stats, precision=None):
+        """
+        Estime une résolution
+
+        Returns:
+            dict: time (s), memory_mb, exact (bool), guarantee (str)
+        """
+        if algorithm_name == "dynamic_programming":
+            precision = precision or stats['gcd']
+        work, memory = self.work_and_memory(algorithm_name, stats, precision)
+
+        if algorithm_name == "dynamic_programming":
+            # Coûts tous multiples de la précision: arrondi sans perte
+            exact = precision == stats['gcd']
+            guarantee = "optimal" if exact else f"approche (precision {precision:,}F)"
+        elif algorithm_name == "greedy":
+            exact = False
+            ratio = max(0.5, self.certified_ratio(stats))
+            guarantee = f">= {ratio:.1%} de l'optimum"
+        else:
+            exact, guarantee = True, "optimal"
+
+        return {
+            'time': work / self.rates[self.rate_name(algorithm_name)],
+            'memory_mb': memory / (1024 * 1024),
+            'exact': exact,
+            'guarantee': guarantee,
+            'precision': precision,
+            'calibrated': self.calibrated
+        }
+
+    def rate_name(self, algorithm_name):
+        """Clé du débit de l'algorithme (la DP par tables a son propre débit, en cellules/s)"""
+        if algorithm_name == "dynamic_programming" and self.dp_storage != 'dict':
+            return "dynamic_programming_table"
+        return algorithm_name
+
+    def available(self, algorithm_name, stats):
+        """Faux si le solveur refuse le dataset (force brute au-delà de sa limite)"""
+        return algorithm_name != "brute_force" or stats['n'] <= self.brute_force_max_actions
+
+    @staticmethod
+    def certified_ratio(stats):
+        """Ratio glouton / borne LP: part de l'optimum garantie par le glouton"""
+        if stats['upper_bound'] <= 0:
+            return 1.0
+        return min(1.0, stats['lower_bound'] / stats['upper_bound'])
+
+    def fits(self, estimate):
+        return (estimate['memory_mb'] <= self.memory_limit_mb
+                and estimate['time'] <= self.time_limit)
+
+    def dp_precision(self, stats):
+        """
+        Précision de la DP: le PGCD des coûts (exacte) si elle tient dans les
+        limites, sinon le plus petit multiple du PGCD qui y tient
+        """
+        precision = stats['gcd']
+        while precision <= self.MAX_DP_PRECISION:
+            if self.fits(self.estimate("dynamic_programming", stats, precision)):
+                return precision
+            precision *= 10
+        return None
+
+    # ------------------------------------------------------------------
+    # Plan
+    # ------------------------------------------------------------------
+
+    def plan(self, actions):
+        """
+        Construit le plan de résolution d'un dataset
+
+        Returns:
+            dict: choice (algorithme conseillé), reason, estimates
+            {algorithme: estimation}, recommended (algorithmes proposés),
+            dp_precision, calibrated, stats
+        """
+        stats = self.dataset_stats(actions)
+        estimates = {}
+        for algorithm_name in ("brute_force", "branch_and_bound", "greedy"):
+            estimates[algorithm_name] = self.estimate(algorithm_name, stats)
+
+        precision = self.dp_precision(stats)
+        estimates["dynamic_programming"] = self.estimate(
+            "dynamic_programming", stats, precision or self.MAX_DP_PRECISION
+        )
+
+        exact_fits = [
+            name for name, estimate in estimates.items()
+            if estimate['exact'] and self.fits(estimate) and self.available(name, stats)
+        ]
+        if exact_fits:
+            choice = min(exact_fits, key=lambda name: estimates[name]['time'])
+            reason = "algorithme exact le plus rapide dans les limites"
+        else:
+            choice = "greedy"
+            reason = (f"aucun algorithme exact sous {self.memory_limit_mb:,.0f} Mo / "
+                      f"{self.time_limit:.0f}s: meilleure approximation")
+
+        # Course: le plus rapide des exacts (force brute comprise si elle accepte
+        # le dataset, voir available), mémoire cumulée
+        race_members = exact_fits
+        if race_members:
+            estimates["race"] = {
+                'time': min(estimates[name]['time'] for name in race_members),
+                'memory_mb': sum(estimates[name]['memory_mb'] for name in race_members),
+                'exact': True,
+                'guarantee': "optimal (prouve)",
+                'precision': None,
+                'calibrated': self.calibrated
+            }
+
+        recommended = [
+            name for name in ("brute_force", "dynamic_programming", "branch_and_bound", "greedy", "race")
+            if name in estimates and (name in ("greedy", "race")
+                                      or (self.fits(estimates[name]) and self.available(name, stats)))
+        ]
+
+        return {
+            'choice': choice,
+            'reason': reason,
+            'estimates': estimates,
+            'recommended': recommended,
+            'dp_precision': precision,
+            'calibrated': self.calibrated,
+            'stats': stats
+        }
@@ -0,0 +1,180 @@
+import contextlib
+import io
+import multiprocessing
+import queue as queue_module
+import time
+
+import numpy as np
+
+from controllers.algorithm_controller import AlgorithmController, BRUTE_FORCE_MAX_ACTIONS
+from models.action import PROFIT_SCALE
+from models.portfolio import Portfolio
+from utils.knapsack_bounds import dantzig_upper_bound, greedy_lower_bound, integer_upper_bound
+
+
+def _positions(actions, selected):
+    index = {id(action): i for i, action in enumerate(actions)}
+    return [index[id(action)] for action in selected]
+
+
+def _race_worker(strategy, actions, budget, shared_best, shared_bound, stop, solutions,
+                 brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS):
+    """
+    Processus fils: exécute une stratégie et publie ses résultats
+
+    - chaque amélioration: ('incumbent', stratégie, profit, indices)
+    - fin d'une stratégie exacte: ('proven', stratégie, borne, None)
+
+    Profits et bornes en virgule fixe (entiers): comparaisons exactes
+    """
+    controller = AlgorithmController(budget=budget, brute_force_max_actions=brute_force_max_actions)
+
+    def publish(profit, selected):
+        with shared_best.get_lock():
+            if profit <= shared_best.value:
+                return
+            shared_best.value = profit
+        solutions.put(('incumbent', strategy, profit, _positions(actions, selected)))
+
+    def should_stop():
+        return stop.is_set() or shared_best.value >= shared_bound.value
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if strategy == "branch_and_bound":
+                controller.branch_and_bound(
+                    actions,
+                    incumbent=lambda: shared_best.value,
+                    on_improve=publish,
+                    should_stop=should_stop
+                )
+                if not should_stop():
+                    # Recherche complète: plus rien ne dépasse le meilleur profit partagé
+                    with shared_bound.get_lock():
+                        shared_bound.value = min(shared_bound.value, shared_best.value)
+                    solutions.put(('proven', strategy, shared_best.value, None))
+            else:
+                portfolio = controller.execute_algorithm(strategy, actions)[0]
+                publish(portfolio.total_profit_fp, portfolio.actions)
+                if strategy == "brute_force" and portfolio.actions:
+                    solutions.put(('proven', strategy, portfolio.total_profit_fp, None))
+    finally:
+        solutions.put(('done', strategy, None, None))
+
+
+class RaceController:
+    """
+    Course d'algorithmes: plusieurs stratégies en parallèle, la première
+    réponse certifiée optimale l'emporte
+
+    Les processus partagent la meilleure solution connue (borne inférieure)
+    et la meilleure borne supérieure. La course s'arrête dès que les deux
+    bornes se rejoignent (optimalité prouvée) ou à l'expiration du délai.
+    """
+
+    def __init__(self, budget=500000, brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS):
+        self.budget = budget
+        # La force brute ne court que si elle accepte le dataset
+        self.brute_force_max_actions = brute_force_max_actions
+        self.winner = None
+        self.proven = False
+
+    def strategies(self, n_actions):
+        strategies = ["branch_and_bound", "dynamic_programming"]
+        if n_actions <= self.brute_force_max_actions:
+            strategies.append("brute_force")
+        return strategies
+
+    def run(self, actions, deadline=60.0, token=None):
+        """
+        Retourne le meilleur portefeuille trouvé avant l'arrêt de la course
+
+        Un CancellationToken (délai ou annulation) arrête la course comme
+        l'expiration du délai: la meilleure solution connue est renvoyée.
+        """
+        start_time = time.perf_counter()
+        if token is not None and token.remaining() is not None:
+            deadline = min(deadline, token.remaining())
+        costs = np.array([a.cost for a in actions], dtype=np.int64)
+        profits = np.array([a.profit_fp for a in actions], dtype=np.int64)
+
+        # Bornes initiales immédiates: glouton (inférieure) et Dantzig (supérieure)
+        best_profit, best_indices = greedy_lower_bound(costs, profits, self.budget)
+        best_indices = [int(i) for i in best_indices]
+        upper_bound = integer_upper_bound(dantzig_upper_bound(costs, profits, self.budget))
+        self.winner, self.proven = "greedy", False
+
+        if best_profit >= upper_bound:
+            self.proven = True
+            print(f"🏁 Course: glouton prouvé optimal par la borne LP ({upper_bound / PROFIT_SCALE:,.0f} F)")
+            return Portfolio([actions[i] for i in best_indices])
+
+        # Entiers 64 bits partagés (profits en virgule fixe)
+        shared_best = multiprocessing.Value('q', best_profit)
+        shared_bound = multiprocessing.Value('q', upper_bound)
+        stop = multiprocessing.Event()
+        solutions = multiprocessing.Queue()
+
+        strategies = self.strategies(len(actions))
+        print(f"🏁 Course: {', '.join(strategies)} (délai {deadline:.0f}s)")
+        print(f"   Bornes initiales: {best_profit / PROFIT_SCALE:,.0f} ≤ optimum ≤ "
+              f"{upper_bound / PROFIT_SCALE:,.0f} F")
+
+        processes = [
+            multiprocessing.Process(
+                target=_race_worker,
+                args=(strategy, actions, self.budget, shared_best, shared_bound, stop, solutions,
+                      self.brute_force_max_actions),
+                daemon=True
+            )
+            for strategy in strategies
+        ]
+        for process in processes:
+            process.start()
+
+        running = set(strategies)
+        try:
+            while running:
+                remaining = deadline - (time.perf_counter() - start_time)
+                if remaining <= 0:
+                    print(f"⏱️  Délai de {deadline:.0f}s atteint")
+                    break
+                if token is not None and token.reason == 'cancelled':
+                    print("⏹️  Course annulée")
+                    break
+                try:
+                    kind, strategy, value, indices = solutions.get(timeout=min(remaining, 0.2))
+                except queue_module.Empty:
+                    if not any(process.is_alive() for process in processes) and solutions.empty():
+                        break
+                    continue
+
+                if kind == 'incumbent' and value > best_profit:
+                    best_profit, best_indices, self.winner = value, indices, strategy
+                elif kind == 'proven':
+                    upper_bound = min(upper_bound, value)
+                    if best_profit >= upper_bound:
+                        self.proven = True
+                elif kind == 'done':
+                    running.discard(strategy)
+
+                if self.proven or best_profit >= shared_bound.value:
+                    self.proven = True
+                    break
+        finally:
+            # Les stratégies perdantes sont arrêtées immédiatement
+            stop.set()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            solutions.close()
+
+        elapsed = time.perf_counter() - start_time
+        if self.proven:
+            print(f"🏁 Optimal prouvé en {elapsed:.3f}s (solution: {self.winner})")
+        else:
+            gap = (shared_bound.value - best_profit) / shared_bound.value * 100 if shared_bound.value > 0 else 0
+            print(f"🏁 Meilleure solution: {self.winner} (écart max à l'optimum: {gap:.2f}%)")
+
+        return Portfolio([actions[i] for i in best_indices])
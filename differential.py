@@ -0,0 +1,355 @@
+"""
+Test différentiel des solveurs contre un oracle exhaustif
+Génère des milliers de petites instances (graine fixe), exécute chaque
+algorithme dans un pool de processus, vérifie la faisabilité et
+l'optimalité, réduit chaque échec à un cas minimal et mesure la vitesse
+de chaque algorithme
+
+Exemple:
+    python differential.py --cases 5000 --max-items 14 --workers 4
+    python differential.py --algorithms dynamic_programming branch_and_bound --seed 7
+
+Code de sortie 1 si au moins un échec; les cas minimaux sont écrits dans
+results/differential/ (CSV + fichier compagnon .json avec le budget,
+rejouables avec batch.py --instance-budget)
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from controllers.algorithm_controller import AlgorithmController
+from controllers.brute_force_controller import BruteForceController
+from controllers.planner_controller import PlannerController
+from models.action import PROFIT_SCALE, Action
+from models.portfolio import Portfolio
+from utils.instance_generator import INSTANCE_CLASSES, generate_actions
+from views.console_view import ConsoleView
+
+# Solveurs testés: clé -> fonction (actions, budget) -> Portfolio
+# Appels directs (sans execute_algorithm): les dépassements de budget ne sont pas corrigés
+SOLVERS = {
+    "brute_force": lambda actions, budget: _controller(actions, budget).brute_force(actions),
+    "brute_force_controller": lambda actions, budget: Portfolio(
+        BruteForceController().optimize(actions, budget)['selected']
+    ),
+    "dynamic_programming": lambda actions, budget: _controller(actions, budget).dynamic_programming(actions),
+    "dynamic_programming_table": lambda actions, budget: _controller(
+        actions, budget, dp_storage='table'
+    ).dynamic_programming(actions),
+    "dynamic_programming_memmap": lambda actions, budget: _controller(
+        actions, budget, dp_storage='memmap', dp_memory_mb=1
+    ).dynamic_programming(actions),
+    "branch_and_bound": lambda actions, budget: _controller(actions, budget).branch_and_bound(actions),
+    "greedy": lambda actions, budget: _controller(actions, budget).greedy_optimized(actions),
+    "race": lambda actions, budget: _controller(actions, budget, race_deadline=10.0)._run_solver(
+        "race", actions, None
+    )
+}
+
+# Solveurs dont le résultat doit égaler l'optimum (le glouton doit en atteindre la moitié)
+EXACT_SOLVERS = ("brute_force", "brute_force_controller", "dynamic_programming",
+                 "dynamic_programming_table", "dynamic_programming_memmap", "branch_and_bound", "race")
+
+# Instances par tâche du pool
+CASES_PER_TASK = 50
+
+
+def _controller(actions, budget, race_deadline=60.0, dp_storage='dict', dp_memory_mb=None):
+    """Contrôleur configuré comme en production: DP à la précision du PGCD (exacte)"""
+    precision = PlannerController.cost_gcd(a.cost for a in actions)
+    return AlgorithmController(
+        budget=budget, dp_precision=precision, race_deadline=race_deadline,
+        dp_storage=dp_storage, dp_memory_mb=dp_memory_mb
+    )
+
+
+# ----------------------------------------------------------------------
+# Instances
+# ----------------------------------------------------------------------
+
+def make_instance(seed, max_items):
+    """
+    Petite instance aléatoire reproductible
+
+    Mélange des actions uniformes (petits et grands coûts, doublons) et les
+    classes de utils.instance_generator; budget nul, inférieur au plus petit
+    coût, fraction du coût total ou supérieur au coût total.
+
+    Returns:
+        tuple: (liste de (coût, profit_pct), budget)
+    """
+    rng = random.Random(seed)
+    n = rng.randint(0, max_items)
+    style = rng.choice(("uniform", "small_costs", "duplicates") + INSTANCE_CLASSES)
+
+    if style == "uniform":
+        items = [(rng.randint(1, 50000), rng.uniform(0.01, 1.0)) for _ in range(n)]
+    elif style == "small_costs":
+        items = [(rng.randint(1, 20), rng.choice((0.05, 0.1, 0.25, 0.5, 1.0))) for _ in range(n)]
+    elif style == "duplicates":
+        pool = [(rng.randrange(100, 5000, 100), rng.choice((0.1, 0.2, 0.3))) for _ in range(3)]
+        items = [rng.choice(pool) for _ in range(n)]
+    else:
+        cost_max = rng.choice((20, 1000, 50000))
+        items = [(a.cost, a.profit_pct)
+                 for a in generate_actions(style, n, seed, max(1, cost_max // 50), cost_max)]
+
+    total_cost = sum(cost for cost, _ in items)
+    choice = rng.random()
+    if choice < 0.05:
+        budget = 0
+    elif choice < 0.10 and items:
+        budget = max(0, min(cost for cost, _ in items) - 1)
+    elif choice < 0.15:
+        budget = total_cost + rng.randint(0, 10)
+    else:
+        budget = int(total_cost * rng.uniform(0.1, 0.9))
+    return items, budget
+
+
+def to_actions(items):
+    return [Action(f"Item-{i}", cost, profit_pct) for i, (cost, profit_pct) in enumerate(items)]
+
+
+# ----------------------------------------------------------------------
+# Oracle et vérifications
+# ----------------------------------------------------------------------
+
+def oracle(actions, budget):
+    """Profit optimal (virgule fixe) par énumération de tous les sous-ensembles (2^n)"""
+    n = len(actions)
+    costs = [0] * (1 << n)
+    profits = [0] * (1 << n)
+    best = 0
+    for mask in range(1, 1 << n):
+        low = (mask & -mask).bit_length() - 1
+        previous = mask & (mask - 1)
+        costs[mask] = costs[previous] + actions[low].cost
+        profits[mask] = profits[previous] + actions[low].profit_fp
+        if costs[mask] <= budget and profits[mask] > best:
+            best = profits[mask]
+    return best
+
+
+def check(solver_name, actions, budget, portfolio, optimum):
+    """
+    Vérifie un résultat
+
+    Returns:
+        tuple: (type d'échec, message) ou None si le résultat est correct
+    """
+    members = {id(action) for action in actions}
+    selected = [id(action) for action in portfolio.actions]
+    if any(key not in members for key in selected):
+        return 'foreign_action', "action absente de l'instance"
+    if len(set(selected)) != len(selected):
+        return 'duplicate_action', "action sélectionnée plusieurs fois"
+
+    cost = sum(action.cost for action in portfolio.actions)
+    # Profits en virgule fixe: comparaisons exactes, F CFA pour les messages
+    profit = sum(action.profit_fp for action in portfolio.actions)
+    if cost != portfolio.total_cost or profit != portfolio.total_profit_fp:
+        return 'inconsistent_totals', (f"totaux annoncés {portfolio.total_cost}/{portfolio.total_profit:.6f}, "
+                                       f"réels {cost}/{profit / PROFIT_SCALE:.6f}")
+    if cost > budget:
+        return 'over_budget', f"coût {cost:,} > budget {budget:,}"
+
+    if solver_name in EXACT_SOLVERS:
+        if profit != optimum:
+            return 'suboptimal', (f"profit {profit / PROFIT_SCALE:.6f} != "
+                                  f"optimum {optimum / PROFIT_SCALE:.6f}")
+    elif 2 * profit < optimum:
+        return 'below_guarantee', (f"profit {profit / PROFIT_SCALE:.6f} < "
+                                   f"optimum / 2 ({optimum / PROFIT_SCALE / 2:.6f})")
+    return None
+
+
+def run_solver(solver_name, actions, budget, optimum):
+    """
+    Exécute un solveur sur une instance et vérifie son résultat
+
+    Returns:
+        tuple: (échec ou None, temps en secondes)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.perf_counter()
+        try:
+            portfolio = SOLVERS[solver_name](actions, budget)
+        except Exception as e:
+            return ('exception', f"{type(e).__name__}: {e}"), time.perf_counter() - start_time
+        elapsed = time.perf_counter() - start_time
+    return check(solver_name, actions, budget, portfolio, optimum), elapsed
+
+
+def run_cases(seeds, max_items, solver_names):
+    """
+    Tâche du pool: exécute tous les solveurs sur un lot d'instances
+
+    Returns:
+        tuple: ({solveur: [temps]}, [(graine, solveur, type, message)])
+    """
+    timings = {name: [] for name in solver_names}
+    failures = []
+    for seed in seeds:
+        items, budget = make_instance(seed, max_items)
+        actions = to_actions(items)
+        optimum = oracle(actions, budget)
+        for solver_name in solver_names:
+            failure, elapsed = run_solver(solver_name, actions, budget, optimum)
+            timings[solver_name].append(elapsed)
+            if failure is not None:
+                failures.append((seed, solver_name) + failure)
+    return timings, failures
+
+
+# ----------------------------------------------------------------------
+# Réduction des échecs
+# ----------------------------------------------------------------------
+
+def shrink(solver_name, kind, items, budget):
+    """
+    Réduit une instance en échec tant que le même type d'échec se reproduit
+
+    Passes successives jusqu'au point fixe: retrait d'un objet, budget
+    divisé puis décrémenté, coûts divisés par 2 puis décrémentés,
+    profit_pct arrondi.
+
+    Returns:
+        tuple: (objets, budget) minimaux
+    """
+    def fails(candidate_items, candidate_budget):
+        actions = to_actions(candidate_items)
+        failure, _ = run_solver(solver_name, actions, candidate_budget, oracle(actions, candidate_budget))
+        return failure is not None and failure[0] == kind
+
+    changed = True
+    while changed:
+        changed = False
+
+        i = 0
+        while i < len(items):
+            candidate = items[:i] + items[i + 1:]
+            if fails(candidate, budget):
+                items, changed = candidate, True
+            else:
+                i += 1
+
+        for candidate_budget in (budget // 2, budget - 1):
+            if 0 <= candidate_budget < budget and fails(items, candidate_budget):
+                budget, changed = candidate_budget, True
+                break
+
+        for i, (cost, profit_pct) in enumerate(items):
+            for candidate_item in ((cost // 2, profit_pct), (cost - 1, profit_pct),
+                                   (cost, round(profit_pct, 2)), (cost, round(profit_pct, 1))):
+                if candidate_item[0] < 1 or candidate_item == (cost, profit_pct) or candidate_item[1] <= 0:
+                    continue
+                candidate = items[:i] + [candidate_item] + items[i + 1:]
+                if fails(candidate, budget):
+                    items, changed = candidate, True
+                    break
+
+    return items, budget
+
+
+def write_repro(output_dir, seed, solver_name, kind, message, items, budget):
+    """Écrit un cas minimal au format data/*.csv et son fichier compagnon"""
+    os.makedirs(output_dir, exist_ok=True)
+    name = f"{solver_name}_{kind}_s{seed}"
+    path = os.path.join(output_dir, f"{name}.csv")
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write("id,cost,profit_pct\n")
+        for i, (cost, profit_pct) in enumerate(items):
+            file.write(f"Item-{i},{cost},{profit_pct!r}\n")
+    with open(os.path.join(output_dir, f"{name}.json"), 'w', encoding='utf-8') as file:
+        json.dump({
+            'seed': seed,
+            'algorithm': solver_name,
+            'failure': kind,
+            'message': message,
+            'budget': budget,
+            'n': len(items)
+        }, file, indent=1)
+    return path
+
+
+# ----------------------------------------------------------------------
+# Programme
+# ----------------------------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Test différentiel des solveurs contre un oracle exhaustif")
+    parser.add_argument('--cases', type=int, default=2000)
+    parser.add_argument('--max-items', type=int, default=12,
+                        help="Taille maximale des instances (oracle en 2^n)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine de la première instance")
+    parser.add_argument('--algorithms', nargs='+', choices=list(SOLVERS),
+                        default=[name for name in SOLVERS if name != "race"],
+                        help="Solveurs testés (race démarre des processus: lent)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--output-dir', default=os.path.join('results', 'differential'))
+    parser.add_argument('--no-shrink', action='store_true', help="Ne pas réduire les échecs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.max_items > 20:
+        ConsoleView.display_error("--max-items est limité à 20 (oracle exhaustif)")
+        return 1
+
+    seeds = list(range(args.seed, args.seed + args.cases))
+    batches = [seeds[i:i + CASES_PER_TASK] for i in range(0, len(seeds), CASES_PER_TASK)]
+
+    timings = {name: [] for name in args.algorithms}
+    failures = []
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        for batch_timings, batch_failures in executor.map(
+            run_cases, batches, [args.max_items] * len(batches), [args.algorithms] * len(batches)
+        ):
+            for name, values in batch_timings.items():
+                timings[name].extend(values)
+            failures.extend(batch_failures)
+    total_time = time.time() - start_time
+
+    # Un seul cas minimal par (solveur, type d'échec): la première graine
+    repros = []
+    seen = set()
+    for seed, solver_name, kind, message in sorted(failures):
+        if (solver_name, kind) in seen:
+            continue
+        seen.add((solver_name, kind))
+        items, budget = make_instance(seed, args.max_items)
+        if not args.no_shrink:
+            items, budget = shrink(solver_name, kind, items, budget)
+            actions = to_actions(items)
+            message = run_solver(solver_name, actions, budget, oracle(actions, budget))[0][1]
+        path = write_repro(args.output_dir, seed, solver_name, kind, message, items, budget)
+        repros.append({'solver': solver_name, 'failure': kind, 'seed': seed,
+                       'n': len(items), 'budget': budget, 'message': message, 'path': path})
+
+    speeds = [
+        {
+            'solver': name,
+            'cases': len(values),
+            'failures': sum(1 for failure in failures if failure[1] == name),
+            'median': statistics.median(values) if values else 0.0,
+            'p95': sorted(values)[int(0.95 * (len(values) - 1))] if values else 0.0,
+            'total': sum(values)
+        }
+        for name, values in timings.items()
+    ]
+    ConsoleView.display_differential_report(speeds, repros, args.cases, total_time)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
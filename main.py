@@ -3,23 +3,76 @@ Application principale - Optimisateur d'investissement
 Projet d'Analyse Décisionnelle
 Architecture MVC
 """
+import argparse
+import copy
 import sys
 import os
 # Assurez-vous que ces modules existent dans l'architecture
 from controllers.file_controller import FileController
-from controllers.algorithm_controller import AlgorithmController
+from controllers.algorithm_controller import AlgorithmController, BRUTE_FORCE_MAX_ACTIONS
 from views.console_view import ConsoleView
 from controllers.sienna_comparator import SiennaComparator
+from controllers.concurrent_controller import ConcurrentController
+from utils.dataset_cache import DatasetCache
+from utils.dataset_index import DatasetIndex
+from utils.result_cache import ResultCache
+from utils.session_cache import SessionCache, estimate_actions_size
+from utils.cancellation import CancellationToken
+from utils.checkpoint import CHECKPOINT_INTERVAL, SolveCheckpoints
+from utils.dp_table import DP_STORAGES
+from utils.metrics import SolverMetrics
+from utils.performance_tracker import DISABLED_TRACKER, PerformanceTracker
+from utils.profiler import PROFILE_ENV, PROFILE_MODES
+from utils.progress import NULL_PROGRESS, TqdmProgress
 
 
 class InvestmentApp:
     """Application principale MVC - Version finale optimisée"""
     
-    def __init__(self):
-        """Initialisation des contrôleurs et vue"""
+    def __init__(self, cache_mb=256, concurrent=False, timeout=None, memory_limit_mb=None,
+                 tracker=None, metrics_file=None, progress=None, checkpoints=None,
+                 dp_storage='dict', dp_memory_mb=None, brute_force_max_actions=BRUTE_FORCE_MAX_ACTIONS):
+        """
+        Initialisation des contrôleurs et vue
+        
+        Args:
+            cache_mb: Limite mémoire (Mo) du cache de session
+            concurrent: Exécuter les algorithmes sélectionnés en parallèle
+            timeout: Délai maximal par algorithme (secondes)
+            memory_limit_mb: Si défini, chaque algorithme tourne dans un
+                processus isolé avec ce plafond mémoire
+            tracker: PerformanceTracker (phases affichées après chaque dataset)
+            metrics_file: Fichier OpenMetrics mis à jour après chaque dataset
+            progress: ProgressReporter des résolutions (barre tqdm par défaut)
+            checkpoints: SolveCheckpoints (reprise de la force brute et de la DP)
+            dp_storage: Stockage de la DP ('dict', 'table' ou 'memmap')
+            dp_memory_mb: Budget mémoire de la DP par tables (Mo)
+            brute_force_max_actions: Taille maximale de la force brute
+        """
+        self.concurrent = concurrent
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.tracker = tracker or DISABLED_TRACKER
+        self.metrics_file = metrics_file
+        self.metrics = SolverMetrics() if metrics_file else None
         self.file_controller = FileController()
-        self.algorithm_controller = AlgorithmController()
+        self.algorithm_controller = AlgorithmController(
+            result_cache=ResultCache(), memory_limit_mb=memory_limit_mb or 1024,
+            tracker=self.tracker, metrics=self.metrics,
+            progress=progress or TqdmProgress(), checkpoints=checkpoints,
+            dp_storage=dp_storage, dp_memory_mb=dp_memory_mb,
+            brute_force_max_actions=brute_force_max_actions
+        )
         self.console_view = ConsoleView()
+        self.dataset_cache = DatasetCache()
+        self.dataset_index = DatasetIndex(self.dataset_cache)
+        self.session_cache = SessionCache(max_mb=cache_mb)
+    
+    @staticmethod
+    def _file_key(file_path):
+        """Identifie une version d'un fichier (chemin, date de modification, taille)"""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
     
     def list_data_files(self):
         """
@@ -56,30 +109,35 @@ class InvestmentApp:
             str: Description du fichier (taille et recommandation)
         """
         try:
-            # Compter rapidement les lignes
-            # Note: cela peut être lent pour de très gros fichiers Excel
-            # mais fonctionne bien pour les CSV.
-            if file_path.lower().endswith('.csv'):
-                 with open(file_path, 'r', encoding='utf-8') as f:
-                    line_count = sum(1 for line in f) - 1  # -1 pour l'en-tête
-            else:
-                # Approximation pour les fichiers non CSV (moins précis sans pandas)
-                file_size_bytes = os.path.getsize(file_path)
-                line_count = round(file_size_bytes / 100) # Approximation basée sur 100 bytes/ligne
-            
-            # Classification selon la taille
-            if line_count <= 20:
-                return f"{line_count} actions • PETIT • Rapide"
-            elif line_count <= 100:
-                return f"{line_count} actions • MOYEN • Standard"
-            elif line_count <= 500:
-                return f"{line_count} actions • GRAND • Avance"
-            else:
-                return f"{line_count}+ actions • TRES GRAND • Expert"
-                
+            cache_key = ('meta', self._file_key(file_path))
+            file_info = self.session_cache.get(cache_key)
+            if file_info is not None:
+                return file_info
+            file_info = self._analyze_file(file_path)
+            self.session_cache.put(cache_key, file_info)
+            return file_info
         except Exception as e:
             return f"Infos non disponibles (erreur: {str(e)})"
     
+    def _analyze_file(self, file_path):
+        """Décrit un fichier à partir de l'index de métadonnées (calculé une seule fois)"""
+        entry = self.dataset_index.get(file_path)
+        line_count = entry['rows']
+        labels = {
+            "PETIT": "Rapide",
+            "MOYEN": "Standard",
+            "GRAND": "Avance",
+            "TRES GRAND": "Expert"
+        }
+        size_class = entry['size_class']
+        count = f"{line_count}+" if size_class == "TRES GRAND" else f"{line_count}"
+        description = f"{count} actions • {size_class} • {labels[size_class]}"
+        
+        # Lignes valides connues une fois le dataset chargé (cache des datasets)
+        if entry['valid_rows'] is not None and entry['valid_rows'] != line_count:
+            description += f" ({entry['valid_rows']} valides)"
+        return description
+    
     def process_file(self, file_path):
         """
         Traite un fichier de données complet
@@ -97,7 +155,26 @@ class InvestmentApp:
         # ===================================================================
         
         self.console_view.display_info("Chargement des donnees...")
-        actions = self.file_controller.read_actions(file_path)
+        self.tracker.reset()
+        if self.algorithm_controller.profiler is not None:
+            self.algorithm_controller.profiler.dataset_name = file_name
+        file_key = self._file_key(file_path)
+        actions = self.session_cache.get(('dataset', file_key))
+        if actions is None:
+            actions = self.file_controller.read_actions(
+                file_path,
+                cache=self.dataset_cache,
+                workers=os.cpu_count(),
+                budget=self.algorithm_controller.budget,
+                tracker=self.tracker,
+                metrics=self.metrics
+            )
+            if actions:
+                self.session_cache.put(
+                    ('dataset', file_key), actions, estimate_actions_size(actions)
+                )
+        else:
+            self.console_view.display_info(f"{len(actions)} actions deja en memoire (cache de session)")
         
         if not actions:
             self.console_view.display_error("Aucune action valide chargee")
@@ -114,20 +191,27 @@ class InvestmentApp:
         # ===================================================================
         
         n_actions = len(actions)
-        recommended = self.algorithm_controller.get_recommended_algorithms(n_actions)
+        
+        # Plan: estimations temps/mémoire et précision de la DP pour ce dataset
+        plan = self.algorithm_controller.plan(actions)
+        self.algorithm_controller.dp_precision = plan['dp_precision']
+        recommended = plan['recommended']
         
         # Mapping des noms d'algorithmes
         name_mapping = {
             "brute_force": ("Force Brute", "brute_force"),
             "dynamic_programming": ("Programmation Dynamique", "dynamic_programming"),
-            "greedy": ("Algorithme Glouton", "greedy")
+            "branch_and_bound": ("Separation et Evaluation", "branch_and_bound"),
+            "greedy": ("Algorithme Glouton", "greedy"),
+            "race": ("Course d'Algorithmes", "race")
         }
         
         # NOUVEAU : Menu de sélection interactif
         selected_algorithms = self.console_view.display_algorithm_selection_menu(
             recommended, 
             name_mapping,
-            n_actions
+            n_actions,
+            plan=plan
         )
         
         # Si l'utilisateur quitte
@@ -149,56 +233,49 @@ class InvestmentApp:
         
         file_results = {}
         
-        for algo_name, algo_key in selected_algorithms:
-            try:
-                print(f"[INFO] Execution de {algo_name}...")
-                print()
-                
-                # Exécuter l'algorithme
-                portfolio, exec_time = self.algorithm_controller.execute_algorithm(
-                    algo_key, actions
-                )
-                
-                # Vérifier si une solution a été trouvée
-                if portfolio and hasattr(portfolio, 'actions') and portfolio.actions:
-                    # Stocker les résultats
-                    file_results[algo_name] = {
-                        'profit': portfolio.total_profit,
-                        'cost': portfolio.total_cost,
-                        'time': exec_time,
-                        'count': len(portfolio.actions),
-                        'portfolio': portfolio
-                    }
-                    
-                    # Afficher les résultats
-                    self.console_view.display_algorithm_result(
-                        algo_name, portfolio, exec_time
-                    )
+        if self.concurrent and len(selected_algorithms) > 1:
+            self._execute_concurrently(
+                selected_algorithms, actions, file_key, file_name, file_results
+            )
+        
+        else:
+            for algo_name, algo_key in selected_algorithms:
+                try:
+                    print(f"[INFO] Execution de {algo_name}... (Ctrl-C pour annuler)")
+                    print()
                     
-                    # Afficher la complexité
-                    complexity = self.algorithm_controller.get_complexity(algo_key)
-                    if complexity:
-                        self.console_view.display_complexity(algo_key, complexity)
+                    # Exécuter l'algorithme (ou réutiliser le résultat de la session)
+                    result_key = self._result_key(file_key, algo_key)
+                    cached_result = self._session_result(result_key)
+                    if self.metrics is not None:
+                        self.metrics.observe_cache('session', cached_result is not None)
+                    if cached_result is not None:
+                        portfolio, exec_time = cached_result
+                    else:
+                        # Ctrl-C n'annule que cet algorithme, pas la session
+                        token = CancellationToken(self.timeout)
+                        with token.cancel_on_interrupt():
+                            portfolio, exec_time = self.algorithm_controller.execute_algorithm(
+                                algo_key, actions, token=token,
+                                isolated=self.memory_limit_mb is not None,
+                                memory_limit_mb=self.memory_limit_mb
+                            )
+                        if portfolio.status == 'ok':
+                            self.session_cache.put(
+                                result_key,
+                                (portfolio, exec_time),
+                                estimate_actions_size(portfolio.actions)
+                            )
                     
-                    # Exporter les résultats
-                    os.makedirs('results', exist_ok=True)
-                    export_name = f"results/{file_name.split('.')[0]}_{algo_key}.csv"
-                    self.file_controller.export_results(
-                        export_name, portfolio, algo_name, exec_time
+                    self._record_result(
+                        algo_name, algo_key, portfolio, exec_time, file_name, file_results
                     )
                     
-                else:
-                    self.console_view.display_error(
-                        f"{algo_name}: Aucune solution trouvee"
-                    )
-                
-            except Exception as e:
-                # 💥 CORRECTION DE L'ERREUR ICI (LIGNE 217) 💥
-                # La ligne originale était : self.console_view.display_error(f"{algo_nameself.console_view.display_error(f"{algo_name}: {str(e)}")
-                self.console_view.display_error(f"{algo_name}: {str(e)}")
-                # Décommenter pour debug détaillé:
-                # import traceback
-                # traceback.print_exc()
+                except Exception as e:
+                    self.console_view.display_error(f"{algo_name}: {str(e)}")
+                    # Décommenter pour debug détaillé:
+                    # import traceback
+                    # traceback.print_exc()
         
         # ===================================================================
         # COMPARAISON ENTRE ALGORITHMES
@@ -217,6 +294,12 @@ class InvestmentApp:
             )
             return
         
+        if self.tracker.enabled:
+            self.console_view.display_trace(self.tracker.report())
+        
+        if self.metrics is not None:
+            self.metrics.registry.write(self.metrics_file)
+        
         # ===================================================================
         # COMPARAISON AVEC SIENNA (CRITÈRE D'ÉVALUATION)
         # ===================================================================
@@ -246,6 +329,128 @@ class InvestmentApp:
             if comparison:
                 SiennaComparator.display(comparison)
     
+    def _record_result(self, algo_name, algo_key, portfolio, exec_time, file_name, file_results):
+        """Stocke, affiche et exporte le résultat d'un algorithme"""
+        if portfolio.status != 'ok':
+            labels = {
+                'timeout': "delai depasse",
+                'cancelled': "annule",
+                'out_of_memory': "memoire insuffisante"
+            }
+            message = labels.get(portfolio.status, portfolio.error or portfolio.status)
+            self.console_view.display_warning(f"{algo_name}: {message} ({exec_time:.2f}s)")
+            return
+        
+        # Vérifier si une solution a été trouvée
+        if portfolio and hasattr(portfolio, 'actions') and portfolio.actions:
+            # Stocker les résultats
+            file_results[algo_name] = {
+                'profit': portfolio.total_profit,
+                'cost': portfolio.total_cost,
+                'time': exec_time,
+                'count': len(portfolio.actions),
+                'portfolio': portfolio
+            }
+            
+            # Afficher les résultats
+            self.console_view.display_algorithm_result(
+                algo_name, portfolio, exec_time, cached=portfolio.from_cache
+            )
+            
+            # Fonctions les plus coûteuses (profilage à la demande)
+            profiler = self.algorithm_controller.profiler
+            if (profiler is not None and profiler.last and not portfolio.from_cache
+                    and profiler.last['algorithm'] == algo_key):
+                self.console_view.display_profile_summary(profiler.last)
+            
+            # Afficher la complexité
+            complexity = self.algorithm_controller.get_complexity(algo_key)
+            if complexity:
+                self.console_view.display_complexity(algo_key, complexity)
+            
+            # Exporter les résultats
+            os.makedirs('results', exist_ok=True)
+            export_name = f"results/{file_name.split('.')[0]}_{algo_key}.csv"
+            with self.tracker.span('export'):
+                self.file_controller.export_results(
+                    export_name, portfolio, algo_name, exec_time,
+                    budget=self.algorithm_controller.budget
+                )
+            
+        else:
+            self.console_view.display_error(
+                f"{algo_name}: Aucune solution trouvee"
+            )
+    
+    def _result_key(self, file_key, algo_key):
+        """Clé de session d'un résultat: dataset, algorithme, budget et paramètres des solveurs"""
+        controller = self.algorithm_controller
+        return (
+            'result', file_key, algo_key, controller.budget, controller.dp_precision,
+            controller.dp_storage, controller.race_deadline, controller.brute_force_max_actions
+        )
+    
+    def _session_result(self, result_key):
+        """
+        Résultat déjà calculé pendant la session, ou None
+        
+        Le portefeuille renvoyé est une copie marquée from_cache: l'objet
+        stocké reste tel que calculé.
+        """
+        cached_result = self.session_cache.get(result_key)
+        if cached_result is None:
+            return None
+        portfolio, exec_time = cached_result
+        portfolio = copy.copy(portfolio)
+        portfolio.from_cache = True
+        return portfolio, exec_time
+    
+    def _execute_concurrently(self, selected_algorithms, actions, file_key, file_name, file_results):
+        """
+        Exécute les algorithmes sélectionnés en parallèle (un processus chacun)
+        
+        Chaque résultat est affiché dès qu'il est disponible. Dès qu'un
+        algorithme a trouvé une solution prouvée optimale, les autres sont
+        annulés; Ctrl-C annule ceux encore en cours.
+        """
+        names = {algo_key: algo_name for algo_name, algo_key in selected_algorithms}
+        pending = []
+        
+        # Résultats déjà calculés pendant la session
+        for algo_name, algo_key in selected_algorithms:
+            cached_result = self._session_result(self._result_key(file_key, algo_key))
+            if cached_result is not None:
+                portfolio, exec_time = cached_result
+                self._record_result(algo_name, algo_key, portfolio, exec_time, file_name, file_results)
+            else:
+                pending.append(algo_key)
+        
+        if not pending:
+            return
+        
+        print(f"[INFO] Execution en parallele: {', '.join(names[key] for key in pending)}")
+        print("[INFO] Ctrl-C pour annuler les algorithmes restants")
+        print()
+        
+        runner = ConcurrentController.from_controller(
+            self.algorithm_controller, timeout=self.timeout, memory_limit_mb=self.memory_limit_mb
+        )
+        for event, algo_key, payload, exec_time in runner.run(pending, actions):
+            algo_name = names[algo_key]
+            
+            if event == 'result':
+                if payload.status == 'ok':
+                    self.session_cache.put(
+                        self._result_key(file_key, algo_key),
+                        (payload, exec_time),
+                        estimate_actions_size(payload.actions)
+                    )
+                self._record_result(algo_name, algo_key, payload, exec_time, file_name, file_results)
+            elif event == 'cancelled':
+                self.console_view.display_warning(f"{algo_name}: annule")
+            else:
+                self.console_view.display_error(f"{algo_name}: {payload}")
+    
     def run(self):
         """
         Boucle principale de l'application
@@ -282,6 +487,7 @@ class InvestmentApp:
                 # ============================================================
                 
                 file_mapping = self.console_view.display_dataset_menu(files_info)
+                self.console_view.display_cache_stats(self.session_cache.stats())
                 selected_file = self.console_view.get_file_choice(file_mapping)
                 
                 # Sortie si l'utilisateur quitte
@@ -329,13 +535,69 @@ class InvestmentApp:
                     break
 
 
+def checkpoints_from_args(args):
+    """Points de reprise demandés par --checkpoint-interval / --resume (None sinon)"""
+    if args.checkpoint_interval is None and not args.resume:
+        return None
+    interval = CHECKPOINT_INTERVAL if args.checkpoint_interval is None else args.checkpoint_interval
+    return SolveCheckpoints(interval=interval, resume=args.resume)
+
+
 def main():
     """
     Point d'entrée principal du programme
     """
+    parser = argparse.ArgumentParser(description="Optimisateur d'investissement (mode interactif)")
+    parser.add_argument('--concurrent', action='store_true',
+                        help="Exécuter les algorithmes sélectionnés en parallèle")
+    parser.add_argument('--cache-mb', type=float, default=256,
+                        help="Limite mémoire du cache de session (Mo)")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Délai maximal par algorithme (secondes)")
+    parser.add_argument('--memory-limit-mb', type=float, default=None,
+                        help="Exécuter chaque algorithme dans un processus isolé plafonné (Mo)")
+    parser.add_argument('--trace', action='store_true',
+                        help="Mesurer et afficher les phases (chargement, résolution, export)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Avec --trace: pic d'allocation par phase (tracemalloc, plus lent)")
+    parser.add_argument('--metrics-file', default=None,
+                        help="Exporter les métriques OpenMetrics dans ce fichier après chaque dataset")
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES, default=None,
+                        help="Profiler chaque résolution dans results/profiles/ (défaut: cprofile)")
+    parser.add_argument('--no-progress', action='store_true',
+                        help="Masquer la barre de progression des résolutions longues")
+    parser.add_argument('--checkpoint-interval', type=float, default=None,
+                        help="Enregistrer un point de reprise (force brute, DP) toutes les N secondes")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reprendre les résolutions interrompues depuis leur point de reprise "
+                             "(force brute et DP par dictionnaire)")
+    parser.add_argument('--brute-force-max-actions', type=int, default=BRUTE_FORCE_MAX_ACTIONS,
+                        help="Taille maximale de la force brute (au-delà de 20: avec --checkpoint-interval)")
+    parser.add_argument('--dp-storage', choices=DP_STORAGES, default='dict',
+                        help="DP par dictionnaire, par tables NumPy, ou tables avec décisions sur disque")
+    parser.add_argument('--dp-memory-mb', type=float, default=None,
+                        help="Budget mémoire de la DP par tables (Mo, défaut: moitié du plafond)")
+    args = parser.parse_args()
+    
+    # Variable d'environnement: héritée par les processus isolés et parallèles
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    
     try:
         # Créer et lancer l'application
-        app = InvestmentApp()
+        app = InvestmentApp(
+            cache_mb=args.cache_mb,
+            concurrent=args.concurrent,
+            timeout=args.timeout,
+            memory_limit_mb=args.memory_limit_mb,
+            tracker=PerformanceTracker(trace_memory=args.trace_memory) if args.trace else None,
+            metrics_file=args.metrics_file,
+            progress=NULL_PROGRESS if args.no_progress else None,
+            checkpoints=checkpoints_from_args(args),
+            dp_storage=args.dp_storage,
+            dp_memory_mb=args.dp_memory_mb,
+            brute_force_max_actions=args.brute_force_max_actions
+        )
         app.run()
         
     except Exception as e:
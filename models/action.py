@@ -1,3 +1,14 @@
+# Profits en virgule fixe: unités de 10⁻⁶ F CFA (rendement arrondi à 10⁻⁶).
+# Les solveurs comparent et additionnent des entiers (exacts, indépendants de
+# l'ordre des sommes); int64 suffit tant que budget × rendement max × 10⁶ < 9.2e18
+PROFIT_SCALE = 1_000_000
+
+
+def fixed_profit(cost, profit_pct):
+    """Profit en virgule fixe (entier, unités de 1/PROFIT_SCALE F CFA)"""
+    return int(cost) * round(float(profit_pct) * PROFIT_SCALE)
+
+
 class Action:
     """Modèle représentant une action"""
     
@@ -5,7 +16,10 @@ class Action:
         self.id = action_id
         self.cost = int(cost)
         self.profit_pct = float(profit_pct)
-        self.profit = self.cost * self.profit_pct
+        # Profit entier calculé une fois au chargement (comparaisons des solveurs)
+        self.profit_fp = fixed_profit(self.cost, self.profit_pct)
+        # Profit en F CFA (affichage et export)
+        self.profit = self.profit_fp / PROFIT_SCALE
     
     def __repr__(self):
         return f"Action({self.id}, cost={self.cost}, profit={self.profit:.0f})"
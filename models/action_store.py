@@ -0,0 +1,57 @@
+from array import array
+from collections import Counter
+
+from models.action import Action
+
+
+class ActionStore:
+    """Modèle colonnaire représentant un ensemble d'actions nettoyées"""
+
+    def __init__(self, ids=None, costs=None, profit_pcts=None):
+        # Une colonne par champ: évite un objet Python par ligne pendant le chargement
+        self.ids = ids if ids is not None else []
+        self.costs = costs if costs is not None else array('q')
+        self.profit_pcts = profit_pcts if profit_pcts is not None else array('d')
+
+        # Statistiques de nettoyage (lignes lues / rejetées par motif)
+        self.total_rows = 0
+        self.rejected = Counter()
+        # Lignes valides écartées par le pré-filtrage budgétaire (par motif)
+        self.pruned = Counter()
+
+    def append(self, action_id, cost, profit_pct):
+        self.ids.append(action_id)
+        self.costs.append(cost)
+        self.profit_pcts.append(profit_pct)
+
+    def reject(self, reason):
+        self.rejected[reason] += 1
+
+    def prune(self, reason):
+        self.pruned[reason] += 1
+
+    def subset(self, indices):
+        """Nouveau store restreint aux positions données (statistiques conservées)"""
+        store = ActionStore(
+            [self.ids[i] for i in indices],
+            array('q', [int(self.costs[i]) for i in indices]),
+            array('d', [float(self.profit_pcts[i]) for i in indices])
+        )
+        store.total_rows = self.total_rows
+        store.rejected = Counter(self.rejected)
+        store.pruned = Counter(self.pruned)
+        return store
+
+    def __len__(self):
+        return len(self.ids)
+
+    def to_actions(self):
+        """Construit les objets Action (une seule fois, après le chargement)"""
+        # tolist() convertit aussi bien un array.array qu'une colonne NumPy (mmap)
+        return [
+            Action(action_id, cost, profit_pct)
+            for action_id, cost, profit_pct in zip(self.ids, self.costs.tolist(), self.profit_pcts.tolist())
+        ]
+
+    def __repr__(self):
+        return f"ActionStore(actions={len(self)}, rejected={sum(self.rejected.values())})"
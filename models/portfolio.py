@@ -1,15 +1,29 @@
+from models.action import PROFIT_SCALE
+
+
 class Portfolio:
     """Modèle représentant un portefeuille d'actions"""
     
     def __init__(self, actions=None):
         self.actions = actions or []
         self.total_cost = sum(action.cost for action in self.actions)
-        self.total_profit = sum(action.profit for action in self.actions)
+        # Profit total en virgule fixe (exact), converti en F CFA pour l'affichage
+        self.total_profit_fp = sum(action.profit_fp for action in self.actions)
+        self.total_profit = self.total_profit_fp / PROFIT_SCALE
+        # True si le résultat provient du cache de résultats
+        self.from_cache = False
+        # True si l'optimalité de la solution est prouvée (algorithme exact
+        # sans arrondi, course terminée avant son délai)
+        self.proven = False
+        # Issue de la résolution: 'ok', 'timeout', 'cancelled', 'out_of_memory' ou 'error'
+        self.status = 'ok'
+        self.error = None
     
     def add_action(self, action):
         self.actions.append(action)
         self.total_cost += action.cost
-        self.total_profit += action.profit
+        self.total_profit_fp += action.profit_fp
+        self.total_profit = self.total_profit_fp / PROFIT_SCALE
     
     def __repr__(self):
         return f"Portfolio(cost={self.total_cost}, profit={self.total_profit:.0f}, actions={len(self.actions)})"
\ No newline at end of file
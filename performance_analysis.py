@@ -1,4 +1,5 @@
 # performance_analysis.py
+import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 import time
@@ -7,39 +8,47 @@ from itertools import combinations
 import sys
 import os
 
+from utils.instance_generator import INSTANCE_CLASSES, generate_actions
+
 class PerformanceAnalyzer:
     def __init__(self):
         self.results = []
         plt.style.use('seaborn-v0_8')
     
-    def generate_test_datasets(self):
-        """Génère des datasets de test de différentes tailles"""
+    def generate_test_datasets(self, sizes=(5, 10, 15, 20), seed=42, instance_class=None,
+                               budget_fraction=0.5):
+        """
+        Génère des datasets de test reproductibles de différentes tailles
+
+        Args:
+            sizes: Nombres d'actions
+            seed: Graine (mêmes datasets d'une exécution à l'autre)
+            instance_class: Classe d'instance difficile (voir
+                utils.instance_generator.INSTANCE_CLASSES), None pour des
+                actions uniformes
+            budget_fraction: Budget en fraction du coût total (classes difficiles)
+
+        Returns:
+            dict: {taille: (actions, budget ou None pour le budget par défaut)}
+        """
         datasets = {}
-        
-        # Dataset de 5 actions
-        datasets[5] = [
-            {"id": f"Action-{i}", "cost": np.random.randint(1000, 50000), "profit_pct": np.random.uniform(0.05, 0.3)}
-            for i in range(5)
-        ]
-        
-        # Dataset de 10 actions
-        datasets[10] = [
-            {"id": f"Action-{i}", "cost": np.random.randint(1000, 50000), "profit_pct": np.random.uniform(0.05, 0.3)}
-            for i in range(10)
-        ]
-        
-        # Dataset de 15 actions
-        datasets[15] = [
-            {"id": f"Action-{i}", "cost": np.random.randint(1000, 50000), "profit_pct": np.random.uniform(0.05, 0.3)}
-            for i in range(15)
-        ]
-        
-        # Dataset de 20 actions
-        datasets[20] = [
-            {"id": f"Action-{i}", "cost": np.random.randint(1000, 50000), "profit_pct": np.random.uniform(0.05, 0.3)}
-            for i in range(20)
-        ]
-        
+        for size in sizes:
+            if instance_class is None:
+                rng = np.random.default_rng([seed, size])
+                actions = [
+                    {"id": f"Action-{i}", "cost": int(rng.integers(1000, 50000)),
+                     "profit_pct": rng.uniform(0.05, 0.3)}
+                    for i in range(size)
+                ]
+                datasets[size] = (actions, None)
+            else:
+                actions = [
+                    {"id": action.id, "cost": action.cost, "profit_pct": action.profit_pct}
+                    for action in generate_actions(instance_class, size, seed)
+                ]
+                budget = int(sum(action['cost'] for action in actions) * budget_fraction)
+                datasets[size] = (actions, budget)
+
         return datasets
     
     def brute_force(self, actions, budget, max_time=30):
@@ -110,20 +119,24 @@ class PerformanceAnalyzer:
         exec_time = time.time() - start_time
         return total_profit, exec_time
     
-    def run_comparative_analysis(self, budget=500000):
+    def run_comparative_analysis(self, budget=500000, instance_class=None, seed=42,
+                                 sizes=(5, 10, 15, 20)):
         """Exécute l'analyse comparative complète"""
-        datasets = self.generate_test_datasets()
+        datasets = self.generate_test_datasets(sizes, seed, instance_class)
         
         print("🔄 EXÉCUTION DE L'ANALYSE COMPARATIVE...")
+        if instance_class is not None:
+            print(f"🧪 Instances {instance_class} (graine {seed}, budget = 50% du coût total)")
         print("=" * 60)
         
-        for size, actions in datasets.items():
+        for size, (actions, dataset_budget) in datasets.items():
+            budget_used = dataset_budget or budget
             print(f"\n📊 Dataset {size} actions:")
             print("-" * 30)
             
             # Force Brute (avec timeout pour grandes tailles)
             if size <= 20:
-                bf_combination, bf_profit, bf_combinations, bf_time = self.brute_force(actions, budget)
+                bf_combination, bf_profit, bf_combinations, bf_time = self.brute_force(actions, budget_used)
                 print(f"🔍 Force Brute: {bf_time:.3f}s | Profit: {bf_profit:,.0f}F | Combinaisons: {bf_combinations}")
             else:
                 bf_time = float('inf')
@@ -131,11 +144,11 @@ class PerformanceAnalyzer:
                 print(f"🔍 Force Brute: TIMEOUT (>30s)")
             
             # Programmation Dynamique
-            dp_profit, dp_time = self.dynamic_programming(actions, budget)
+            dp_profit, dp_time = self.dynamic_programming(actions, budget_used)
             print(f"⚡ Prog. Dyn.: {dp_time:.6f}s | Profit: {dp_profit:,.0f}F")
             
             # Algorithme Glouton
-            greedy_profit, greedy_time = self.greedy_algorithm(actions, budget)
+            greedy_profit, greedy_time = self.greedy_algorithm(actions, budget_used)
             print(f"🚀 Glouton:    {greedy_time:.6f}s | Profit: {greedy_profit:,.0f}F")
             
             # Qualité relative
@@ -259,6 +272,13 @@ class PerformanceAnalyzer:
 
 # UTILISATION
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyse de performance des algorithmes")
+    parser.add_argument('--instance-class', choices=INSTANCE_CLASSES, default=None,
+                        help="Classe d'instances difficiles (défaut: actions uniformes)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[5, 10, 15, 20])
+    args = parser.parse_args()
+
     analyzer = PerformanceAnalyzer()
     
     print("🚀 LANCEMENT DE L'ANALYSE DE PERFORMANCE")
@@ -266,7 +286,8 @@ if __name__ == "__main__":
     print("=" * 70)
     
     # Exécuter l'analyse
-    analyzer.run_comparative_analysis()
+    analyzer.run_comparative_analysis(instance_class=args.instance_class, seed=args.seed,
+                                      sizes=args.sizes)
     
     # Générer les graphiques
     analyzer.plot_performance_comparison()
@@ -0,0 +1,169 @@
+"""
+Calibration du modèle de coût sur la machine courante
+
+Chaque solveur est mesuré sur une instance de référence (générée avec une
+graine fixe). Le débit retenu est le nombre d'unités de travail du modèle
+du planificateur divisé par le temps mesuré. Les débits sont enregistrés
+par machine dans .cache/calibration/<hôte>.json et remplacent les débits
+par défaut des estimations (planificateur, menus, progression, batch).
+
+Usage:
+    python -m utils.calibration
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+# À incrémenter si le modèle de coût du planificateur change
+CALIBRATION_VERSION = 1
+
+CALIBRATION_DIR = os.path.join('.cache', 'calibration')
+
+# Instances de référence: (nombre d'actions, budget, précision DP)
+BENCHMARKS = {
+    "brute_force": (16, 200000, None),
+    "dynamic_programming": (40, 500000, 100),
+    "dynamic_programming_table": (100, 1000000, 1),
+    "branch_and_bound": (400, 500000, None),
+    "greedy": (20000, 500000, None)
+}
+
+
+def host_id():
+    """Identifiant de la machine utilisable comme nom de fichier"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', platform.node() or 'localhost')
+
+
+def calibration_path(cache_dir=CALIBRATION_DIR):
+    return os.path.join(cache_dir, f"{host_id()}.json")
+
+
+def load_calibration(cache_dir=CALIBRATION_DIR):
+    """Calibration enregistrée pour cette machine, ou None"""
+    try:
+        with open(calibration_path(cache_dir), 'r', encoding='utf-8') as file:
+            record = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if record.get('calibration_version') != CALIBRATION_VERSION:
+        return None
+    return record
+
+
+def load_rates(cache_dir=CALIBRATION_DIR):
+    """Débits calibrés {algorithme: unités/s}, ou None si la machine n'est pas calibrée"""
+    record = load_calibration(cache_dir)
+    return record['rates'] if record else None
+
+
+def format_duration(seconds):
+    """Durée estimée lisible (ms, s, min, h, jours)"""
+    if seconds < 0.001:
+        return "< 1 ms"
+    if seconds < 1:
+        return f"~{seconds * 1000:.0f} ms"
+    if seconds < 60:
+        return f"~{seconds:.1f} s"
+    if seconds < 3600:
+        return f"~{seconds / 60:.1f} min"
+    if seconds < 86400:
+        return f"~{seconds / 3600:.1f} h"
+    return f"~{seconds / 86400:,.0f} jours" if seconds < 1e9 else "impraticable"
+
+
+def benchmark_instance(n, seed=42):
+    """Instance de référence: coûts multiples de 10 F, rendements de 5% à 40%"""
+    from models.action import Action
+    rng = random.Random(seed)
+    return [
+        Action(f"Bench-{i}", rng.randrange(1000, 50000, 10), rng.uniform(0.05, 0.40))
+        for i in range(n)
+    ]
+
+
+def _best_time(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def calibrate(cache_dir=CALIBRATION_DIR, repeats=3, verbose=True):
+    """
+    Mesure chaque solveur et enregistre les débits de la machine
+
+    Args:
+        cache_dir: Dossier des calibrations
+        repeats: Répétitions par solveur (le meilleur temps est retenu)
+        verbose: Afficher les mesures
+
+    Returns:
+        dict: Enregistrement de calibration (débits, temps, machine)
+    """
+    # Import local: le planificateur importe ce module
+    from controllers.algorithm_controller import AlgorithmController
+    from controllers.planner_controller import PlannerController
+
+    rates = {}
+    timings = {}
+    solvers = {
+        "brute_force": "brute_force",
+        "dynamic_programming": "dynamic_programming",
+        "dynamic_programming_table": "dynamic_programming",
+        "branch_and_bound": "branch_and_bound",
+        "greedy": "greedy_optimized"
+    }
+    for rate_name, (n, budget, precision) in BENCHMARKS.items():
+        # La DP par tables a son propre débit (cellules/s, voir PlannerController.rate_name)
+        dp_storage = 'table' if rate_name == "dynamic_programming_table" else 'dict'
+        algorithm_name = "dynamic_programming" if dp_storage == 'table' else rate_name
+        actions = benchmark_instance(n)
+        controller = AlgorithmController(budget=budget, dp_precision=precision, dp_storage=dp_storage)
+        planner = PlannerController(budget, rates=PlannerController.DEFAULT_RATES, dp_storage=dp_storage)
+        work, _ = planner.work_and_memory(algorithm_name, planner.dataset_stats(actions), precision)
+
+        solver = getattr(controller, solvers[rate_name])
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = _best_time(lambda: solver(actions), repeats)
+
+        rates[rate_name] = work / elapsed
+        timings[rate_name] = elapsed
+        if verbose:
+            print(f"⏱️  {rate_name:<26} {n:>6} actions  {elapsed:8.4f}s  {rates[rate_name]:,.0f} unités/s")
+
+    record = {
+        'calibration_version': CALIBRATION_VERSION,
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'rates': rates,
+        'timings': timings
+    }
+
+    # Écriture atomique: un lecteur concurrent ne voit jamais un fichier partiel
+    os.makedirs(cache_dir, exist_ok=True)
+    path = calibration_path(cache_dir)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(record, file, indent=1)
+    os.replace(temporary, path)
+
+    if verbose:
+        print(f"✅ Calibration enregistrée: {path}")
+    return record
+
+
+if __name__ == "__main__":
+    calibrate(repeats=int(sys.argv[1]) if len(sys.argv) > 1 else 3)
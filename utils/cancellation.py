@@ -0,0 +1,83 @@
+"""
+Annulation coopérative des résolutions
+
+Les solveurs appellent token.check() à des points sûrs (entre deux objets,
+toutes les N combinaisons ou N nœuds). check() lève SolveCancelled si
+l'utilisateur a annulé ou si le délai est dépassé.
+"""
+import contextlib
+import signal
+import threading
+import time
+
+
+class SolveCancelled(Exception):
+    """Résolution interrompue (reason: 'cancelled' ou 'timeout')"""
+
+    def __init__(self, reason='cancelled'):
+        super().__init__(f"résolution interrompue ({reason})")
+        self.reason = reason
+
+
+class CancellationToken:
+    """Jeton d'annulation partagé entre l'appelant et un solveur"""
+
+    def __init__(self, timeout=None):
+        """
+        Args:
+            timeout: Délai maximal en secondes (None = illimité)
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._cancelled = False
+
+    def cancel(self):
+        """Demande l'arrêt (sûr depuis un gestionnaire de signal ou un autre thread)"""
+        self._cancelled = True
+
+    @property
+    def reason(self):
+        """'cancelled', 'timeout' ou None si la résolution peut continuer"""
+        if self._cancelled:
+            return 'cancelled'
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return 'timeout'
+        return None
+
+    @property
+    def cancelled(self):
+        return self.reason is not None
+
+    def remaining(self):
+        """Secondes restantes avant le délai (None si illimité)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        """Lève SolveCancelled si la résolution doit s'arrêter"""
+        reason = self.reason
+        if reason is not None:
+            raise SolveCancelled(reason)
+
+    @contextlib.contextmanager
+    def cancel_on_interrupt(self):
+        """
+        Pendant le bloc, Ctrl-C annule uniquement ce jeton au lieu de lever
+        KeyboardInterrupt (un second Ctrl-C interrompt normalement)
+        """
+        if threading.current_thread() is not threading.main_thread():
+            yield self
+            return
+
+        previous = signal.getsignal(signal.SIGINT)
+
+        def handler(signum, frame):
+            if self._cancelled:
+                signal.default_int_handler(signum, frame)
+            self.cancel()
+
+        signal.signal(signal.SIGINT, handler)
+        try:
+            yield self
+        finally:
+            signal.signal(signal.SIGINT, previous)
@@ -0,0 +1,162 @@
+"""
+Points de reprise des résolutions longues (force brute, DP)
+
+Un solveur ouvre un point de reprise par résolution (dataset, budget,
+algorithme, paramètres et version du solveur) et y enregistre son état à
+intervalle régulier, aux points où il vérifie déjà l'annulation:
+
+    checkpoint = self.checkpoints.open("dynamic_programming", actions, budget, params)
+    state = checkpoint.restore()          # None: départ à zéro
+    for ...:
+        if checkpoint.due():
+            checkpoint.save(state)
+    checkpoint.complete()                 # résolution terminée: fichier supprimé
+
+L'état est écrit par pickle dans un fichier temporaire renommé ensuite
+(os.replace): une interruption pendant l'écriture laisse le point
+précédent intact. Il conserve exactement les valeurs (flottants, ordre
+des dictionnaires): une résolution reprise donne le même résultat qu'une
+résolution continue. Un point laissé par une résolution interrompue
+(Ctrl-C, délai dépassé, processus tué) est repris avec resume=True.
+"""
+import hashlib
+import os
+import pickle
+import time
+
+from utils.result_cache import dataset_digest
+
+CHECKPOINT_DIR = os.path.join('.cache', 'checkpoints')
+
+# Intervalle par défaut entre deux écritures (secondes)
+CHECKPOINT_INTERVAL = 60.0
+
+# À incrémenter lors d'un changement du format des fichiers
+CHECKPOINT_FORMAT = 1
+
+
+class Checkpoint:
+    """Point de reprise d'une résolution"""
+
+    def __init__(self, path, header, interval, resume):
+        self.path = path
+        self.header = header
+        self.interval = interval
+        self.resume = resume
+        self.last_save = time.monotonic()
+        # Écritures effectuées et temps passé à écrire (coût des points)
+        self.saves = 0
+        self.save_time = 0.0
+
+    def restore(self):
+        """
+        État enregistré par une résolution interrompue
+
+        Returns:
+            L'état passé à save(), ou None (pas de reprise demandée, pas de
+            fichier, ou fichier d'une autre résolution)
+        """
+        if not self.resume or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as file:
+                payload = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if payload.get('header') != self.header:
+            return None
+        return payload['state']
+
+    def due(self):
+        """Vrai si l'intervalle depuis la dernière écriture est écoulé"""
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save(self, state):
+        """Enregistre l'état (atomique)"""
+        start_time = time.perf_counter()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file:
+            pickle.dump({'header': self.header, 'state': state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
+        self.saves += 1
+        self.save_time += time.perf_counter() - start_time
+        self.last_save = time.monotonic()
+
+    def complete(self):
+        """Résolution terminée: le point n'a plus d'utilité"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SolveCheckpoints:
+    """Fabrique des points de reprise (un fichier par résolution)"""
+
+    enabled = True
+
+    def __init__(self, directory=CHECKPOINT_DIR, interval=CHECKPOINT_INTERVAL, resume=False):
+        """
+        Args:
+            directory: Dossier des fichiers de reprise
+            interval: Intervalle minimal entre deux écritures (secondes)
+            resume: Reprendre les points laissés par une résolution interrompue
+        """
+        self.directory = directory
+        self.interval = interval
+        self.resume = resume
+
+    def open(self, algorithm_name, actions, budget, params=None):
+        """
+        Point de reprise d'une résolution
+
+        Args:
+            algorithm_name: Algorithme
+            actions: Liste d'objets Action (identifie le dataset)
+            budget: Budget de la résolution
+            params: Paramètres qui changent le résultat (précision, version)
+        """
+        header = {
+            'format': CHECKPOINT_FORMAT,
+            'algorithm': algorithm_name,
+            'dataset': dataset_digest(actions),
+            'budget': budget,
+            'params': params or {}
+        }
+        key = hashlib.blake2b(repr(sorted(header.items())).encode('utf-8'), digest_size=16).hexdigest()
+        path = os.path.join(self.directory, f"{algorithm_name}_{key}.ckpt")
+        return Checkpoint(path, header, self.interval, self.resume)
+
+
+class _NullCheckpoint:
+    """Point de reprise désactivé: rien n'est lu ni écrit"""
+
+    saves = 0
+
+    def restore(self):
+        return None
+
+    def due(self):
+        return False
+
+    def save(self, state):
+        pass
+
+    def complete(self):
+        pass
+
+
+class _DisabledCheckpoints:
+    """Points de reprise désactivés"""
+
+    enabled = False
+
+    _NULL_CHECKPOINT = _NullCheckpoint()
+
+    def open(self, algorithm_name, actions, budget, params=None):
+        return self._NULL_CHECKPOINT
+
+
+# Points de reprise désactivés partagés (valeur par défaut des contrôleurs)
+DISABLED_CHECKPOINTS = _DisabledCheckpoints()
@@ -0,0 +1,253 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de verrou, un seul processus écrit à la fois
+    fcntl = None
+
+import numpy as np
+
+from controllers.file_controller import cleaning_version
+from models.action_store import ActionStore
+
+# À incrémenter si le format des fichiers du cache change
+CACHE_FORMAT_VERSION = 1
+ID_SEPARATOR = '\0'
+
+# Blocs du début et de la fin du fichier source lus pour son empreinte
+FINGERPRINT_BLOCK = 64 * 1024
+
+
+class DatasetCache:
+    """
+    Cache disque des datasets nettoyés (colonnes .npy mappables + blob d'identifiants)
+
+    Une entrée est identifiée par le chemin, la taille, la date de
+    modification (ns) et une empreinte partielle du contenu du fichier
+    source (premier et dernier blocs), et par la version des règles de
+    nettoyage. Un fichier modifié ou des règles changées rendent l'entrée
+    obsolète: elle est supprimée au prochain accès.
+
+    L'empreinte est vérifiée à chaque lecture sans relire tout le fichier.
+    Limite acceptée: une modification au milieu du fichier qui conserve sa
+    taille, sa date de modification et ses blocs extrêmes n'est pas vue.
+
+    Les écritures de l'index (lecture, modification, remplacement) se font
+    sous un verrou exclusif (fcntl) partagé par les processus d'un batch.
+    """
+
+    INDEX_FILE = 'index.json'
+    LOCK_FILE = 'index.lock'
+
+    def __init__(self, cache_dir=os.path.join('.cache', 'datasets')):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Clés
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def fingerprint(path, size):
+        """Empreinte BLAKE2 du premier et du dernier bloc du fichier (taille comprise dans la clé)"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as file:
+            digest.update(file.read(FINGERPRINT_BLOCK))
+            if size > FINGERPRINT_BLOCK:
+                file.seek(max(FINGERPRINT_BLOCK, size - FINGERPRINT_BLOCK))
+                digest.update(file.read(FINGERPRINT_BLOCK))
+        return digest.hexdigest()
+
+    @classmethod
+    def _entry_key(cls, path, stat):
+        fingerprint = cls.fingerprint(path, stat.st_size)
+        raw = (f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{fingerprint}"
+               f"|rules{cleaning_version()}|v{CACHE_FORMAT_VERSION}")
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Verrou exclusif des écritures de l'index (entre processus)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _save_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(index, file, indent=1)
+        os.replace(tmp_path, self._index_path())
+
+    def _evict(self, key):
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    # ------------------------------------------------------------------
+
+    def _current_entry(self, path, index):
+        """Entrée à jour du fichier, ou None (une entrée obsolète est supprimée)"""
+        entry = index.get(path)
+        if entry is None:
+            return None
+
+        if entry['key'] != self._entry_key(path, os.stat(path)):
+            # Fichier modifié ou règles de nettoyage changées: l'entrée est obsolète
+            self._drop(path, entry['key'])
+            return None
+        return entry
+
+    def _drop(self, path, key):
+        """Supprime l'entrée du fichier si elle porte encore cette clé"""
+        with self._locked():
+            index = self._load_index()
+            if path in index and index[path]['key'] == key:
+                del index[path]
+                self._save_index(index)
+            self._evict(key)
+
+    def get_columns(self, filename):
+        """
+        Colonnes (coûts, pourcentages) en cache pour ce fichier, ou None
+
+        Ouvertes avec np.load(mmap_mode='r'), sans lire les identifiants:
+        suffisant pour les métadonnées (lignes valides, bornes).
+        """
+        path = os.path.abspath(filename)
+        entry = self._current_entry(path, self._load_index())
+        if entry is None:
+            return None
+        entry_dir = os.path.join(self.cache_dir, entry['key'])
+        try:
+            return (
+                np.load(os.path.join(entry_dir, 'cost.npy'), mmap_mode='r'),
+                np.load(os.path.join(entry_dir, 'profit_pct.npy'), mmap_mode='r')
+            )
+        except (OSError, ValueError):
+            return None
+
+    def get(self, filename):
+        """
+        Retourne l'ActionStore en cache pour ce fichier, ou None
+
+        Les colonnes numériques sont ouvertes avec np.load(mmap_mode='r'):
+        aucune copie n'est faite tant qu'elles ne sont pas parcourues.
+        """
+        path = os.path.abspath(filename)
+        index = self._load_index()
+        entry = self._current_entry(path, index)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        entry_dir = os.path.join(self.cache_dir, entry['key'])
+        try:
+            costs = np.load(os.path.join(entry_dir, 'cost.npy'), mmap_mode='r')
+            profit_pcts = np.load(os.path.join(entry_dir, 'profit_pct.npy'), mmap_mode='r')
+            with open(os.path.join(entry_dir, 'ids.bin'), 'rb') as file:
+                blob = file.read().decode('utf-8')
+            with open(os.path.join(entry_dir, 'meta.json'), 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            # Entrée corrompue ou incomplète
+            self._drop(path, entry['key'])
+            self.misses += 1
+            return None
+
+        ids = blob.split(ID_SEPARATOR) if len(costs) else []
+        store = ActionStore(ids, costs, profit_pcts)
+        store.total_rows = meta.get('total_rows', len(ids))
+        store.rejected = Counter(meta.get('rejected', {}))
+        self.hits += 1
+        return store
+
+    def put(self, filename, store):
+        """Enregistre un ActionStore nettoyé pour ce fichier"""
+        if any(ID_SEPARATOR in action_id for action_id in store.ids):
+            return False
+
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        key = self._entry_key(path, stat)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        np.save(os.path.join(tmp_dir, 'cost.npy'), np.asarray(store.costs, dtype=np.int64))
+        np.save(os.path.join(tmp_dir, 'profit_pct.npy'), np.asarray(store.profit_pcts, dtype=np.float64))
+        with open(os.path.join(tmp_dir, 'ids.bin'), 'wb') as file:
+            file.write(ID_SEPARATOR.join(store.ids).encode('utf-8'))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({
+                'source': path,
+                'total_rows': store.total_rows,
+                'rejected': dict(store.rejected)
+            }, file)
+
+        # Remplacement de l'entrée et mise à jour de l'index sous verrou: un
+        # autre processus ne peut ni perdre cette entrée ni la prendre pour
+        # une orpheline entre le renommage et l'écriture de l'index
+        with self._locked():
+            self._evict(key)
+            os.replace(tmp_dir, entry_dir)
+
+            index = self._load_index()
+            previous = index.get(path)
+            if previous and previous['key'] != key:
+                self._evict(previous['key'])
+            index[path] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'key': key
+            }
+            self._evict_orphans(index)
+        return True
+
+    def _evict_orphans(self, index):
+        """
+        Supprime les entrées qui ne sont plus référencées (fichiers déplacés
+        ou supprimés) et enregistre l'index (appelé sous verrou)
+        """
+        for path, entry in list(index.items()):
+            if not os.path.exists(path):
+                self._evict(entry['key'])
+                del index[path]
+        self._save_index(index)
+
+        live_keys = {entry['key'] for entry in index.values()}
+        for name in os.listdir(self.cache_dir):
+            if (name not in (self.INDEX_FILE, self.LOCK_FILE) and name not in live_keys
+                    and not name.endswith('.tmp')):
+                self._evict(name)
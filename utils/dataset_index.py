@@ -0,0 +1,219 @@
+import json
+import mmap
+import os
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+
+from controllers.file_controller import FileController
+from models.action import PROFIT_SCALE
+from utils.knapsack_bounds import fixed_profits
+
+DIMENSION_PATTERN = re.compile(rb'<dimension ref="[A-Z]+\d+(?::[A-Z]+(\d+))?"')
+
+# Espaces de noms SpreadsheetML (classeur et relations)
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+DOC_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def classify_size(line_count):
+    """Classe de taille utilisée par le menu (mêmes seuils qu'auparavant)"""
+    if line_count <= 20:
+        return "PETIT"
+    elif line_count <= 100:
+        return "MOYEN"
+    elif line_count <= 500:
+        return "GRAND"
+    return "TRES GRAND"
+
+
+def count_csv_rows(path, chunk_size=1 << 22):
+    """Compte les lignes de données d'un CSV en octets bruts (mmap), sans décodage"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+
+    newlines = 0
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for offset in range(0, size, chunk_size):
+            newlines += mm[offset:offset + chunk_size].count(b'\n')
+        # Dernière ligne sans retour à la ligne final
+        if mm[size - 1:size] != b'\n':
+            newlines += 1
+
+    return max(0, newlines - 1)  # -1 pour l'en-tête
+
+
+def active_sheet_path(archive):
+    """
+    Chemin dans l'archive de la feuille active (celle lue par le chargement)
+
+    L'ordre des feuilles et l'onglet actif sont lus dans xl/workbook.xml, le
+    fichier de la feuille dans ses relations (xl/_rels/workbook.xml.rels):
+    les noms sheetN.xml ne suivent pas l'ordre des onglets.
+    """
+    try:
+        workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        relations = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    except (KeyError, ElementTree.ParseError):
+        return None
+
+    sheets = workbook.findall(f'{MAIN_NS}sheets/{MAIN_NS}sheet')
+    if not sheets:
+        return None
+    view = workbook.find(f'{MAIN_NS}bookViews/{MAIN_NS}workbookView')
+    active = int(view.get('activeTab', 0)) if view is not None else 0
+    sheet = sheets[active if active < len(sheets) else 0]
+
+    relation_id = sheet.get(f'{DOC_REL_NS}id')
+    for relation in relations.iter(f'{PKG_REL_NS}Relationship'):
+        if relation.get('Id') == relation_id:
+            target = relation.get('Target', '')
+            # Cible relative à xl/, ou absolue depuis la racine de l'archive
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join('xl', target))
+    return None
+
+
+def count_xlsx_rows(path):
+    """Lit la dimension de la feuille active (<dimension ref="A1:C501"/>) sans charger le classeur"""
+    with zipfile.ZipFile(path) as archive:
+        sheet_path = active_sheet_path(archive)
+        if sheet_path is None:
+            return None
+        try:
+            with archive.open(sheet_path) as sheet:
+                head = sheet.read(4096)
+        except KeyError:
+            return None
+
+    match = DIMENSION_PATTERN.search(head)
+    if not match:
+        return None
+    last_row = int(match.group(1)) if match.group(1) else 1
+    return max(0, last_row - 1)  # -1 pour l'en-tête
+
+
+class DatasetIndex:
+    """
+    Index persistant des métadonnées des datasets (un fichier JSON par dossier)
+
+    Pour chaque fichier: nombre de lignes, lignes valides, min/max des coûts et
+    des profits, classe de taille. Une entrée n'est recalculée que si la date
+    de modification (ou la taille) du fichier change.
+
+    Le nombre de lignes est compté sans analyser le fichier. Les lignes
+    valides et les bornes sont lues dans les colonnes .npy du cache des
+    datasets, une fois le dataset chargé: d'ici là elles valent None et
+    l'affichage du menu ne déclenche aucun nettoyage.
+    """
+
+    INDEX_NAME = '.dataset_index.json'
+
+    def __init__(self, dataset_cache=None):
+        self.dataset_cache = dataset_cache
+        self._indexes = {}  # dossier -> {nom de fichier: entrée}
+
+    def _index_path(self, directory):
+        return os.path.join(directory, self.INDEX_NAME)
+
+    def _load(self, directory):
+        if directory not in self._indexes:
+            try:
+                with open(self._index_path(directory), 'r', encoding='utf-8') as file:
+                    self._indexes[directory] = json.load(file)
+            except (FileNotFoundError, ValueError):
+                self._indexes[directory] = {}
+        return self._indexes[directory]
+
+    def _save(self, directory):
+        tmp_path = f"{self._index_path(directory)}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(self._indexes[directory], file, indent=1)
+            os.replace(tmp_path, self._index_path(directory))
+        except OSError:
+            # Dossier en lecture seule: l'index reste en mémoire
+            pass
+
+    def get(self, file_path):
+        """Retourne les métadonnées du fichier, recalculées seulement si nécessaire"""
+        directory = os.path.dirname(os.path.abspath(file_path))
+        name = os.path.basename(file_path)
+        index = self._load(directory)
+        stat = os.stat(file_path)
+
+        entry = index.get(name)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            if entry['valid_rows'] is None and self._add_bounds(file_path, entry):
+                self._save(directory)
+            return entry
+
+        entry = self._compute(file_path)
+        entry['mtime_ns'] = stat.st_mtime_ns
+        entry['size'] = stat.st_size
+        index[name] = entry
+
+        # Oublier les fichiers disparus
+        for stale_name in [n for n in index if not os.path.exists(os.path.join(directory, n))]:
+            del index[stale_name]
+        self._save(directory)
+        return entry
+
+    def _compute(self, file_path):
+        extension = os.path.splitext(file_path)[1].lower()
+
+        if extension == '.csv':
+            rows = count_csv_rows(file_path)
+        elif extension == '.xlsx':
+            rows = count_xlsx_rows(file_path)
+        else:
+            rows = None
+
+        entry = {
+            'rows': rows,
+            'valid_rows': None,
+            'cost_min': None,
+            'cost_max': None,
+            'profit_min': None,
+            'profit_max': None,
+            'size_class': None
+        }
+        if rows is None:
+            # Format sans comptage rapide (.xls): le nettoyage donne aussi les bornes
+            store = FileController.load_store(file_path, cache=self.dataset_cache, verbose=False)
+            entry['rows'] = store.total_rows
+            self._set_bounds(entry, store.costs, store.profit_pcts)
+        else:
+            self._add_bounds(file_path, entry)
+        entry['size_class'] = classify_size(entry['rows'])
+        return entry
+
+    def _add_bounds(self, file_path, entry):
+        """Complète l'entrée depuis les colonnes en cache du dataset (False si absent du cache)"""
+        if self.dataset_cache is None:
+            return False
+        columns = self.dataset_cache.get_columns(file_path)
+        if columns is None:
+            return False
+        self._set_bounds(entry, *columns)
+        return True
+
+    @staticmethod
+    def _set_bounds(entry, costs, profit_pcts):
+        """Lignes valides et min/max des coûts et des profits"""
+        entry['valid_rows'] = len(costs)
+        if len(costs):
+            costs = np.asarray(costs, dtype=np.int64)
+            profits = fixed_profits(costs, profit_pcts)
+            entry.update(
+                cost_min=int(costs.min()),
+                cost_max=int(costs.max()),
+                profit_min=int(profits.min()) / PROFIT_SCALE,
+                profit_max=int(profits.max()) / PROFIT_SCALE
+            )
@@ -0,0 +1,214 @@
+"""
+Programmation dynamique par tables NumPy (décisions en bits)
+
+Variante de la DP pour les grandes capacités: au lieu d'un dictionnaire
+d'états portant chacun la liste de ses actions, la passe avant garde une
+seule ligne de valeurs (meilleur profit par capacité, O(W)) et enregistre
+pour chaque objet un bit "pris" par capacité. La solution est
+reconstruite en remontant les lignes de décision, de la dernière à la
+première.
+
+La matrice des décisions (n lignes de ⌈(W+1)/8⌉ octets) est gardée:
+- en mémoire (DecisionMatrix) si elle tient dans le budget mémoire;
+- sinon dans un fichier np.memmap sur disque local (MemmapDecisionMatrix),
+  projeté par fenêtres de lignes: la mémoire résidente est bornée par le
+  budget, indépendamment de n·W.
+
+Accès au fichier (favorables au cache de pages):
+- passe avant: chaque ligne est écrite une seule fois, dans l'ordre du
+  fichier. Une fenêtre est projetée, remplie, vidée (flush) puis libérée:
+  les pages sales partent en écriture différée séquentielle et ne
+  comptent plus dans la mémoire résidente du processus.
+- reconstruction: une ligne lue par objet, de la dernière à la première,
+  fenêtre par fenêtre, avec une colonne qui ne fait que décroître. Un seul
+  octet (une page) est lu par ligne: environ n lectures de page en ordre
+  inverse du fichier, négligeable devant la passe avant (n·W/8 octets
+  écrits). La lecture anticipée du noyau, orientée vers l'avant, n'aide
+  pas ici et n'est pas nécessaire.
+"""
+import contextlib
+import os
+import tempfile
+
+import numpy as np
+
+# Modes de stockage de la DP d'AlgorithmController
+DP_STORAGES = ('dict', 'table', 'memmap')
+
+# Dossier des fichiers de décisions (disque local, supprimés après la résolution)
+DP_TABLE_DIR = os.path.join('.cache', 'dp')
+
+# Octets de travail par capacité pendant la passe avant: ligne de valeurs,
+# candidats (int64), décisions (bool) et ligne compactée
+WORK_BYTES_PER_CAPACITY = 8 + 8 + 1 + 1
+
+MB = 1024 * 1024
+
+
+def row_bytes(capacity):
+    """Taille d'une ligne de décisions compactée (capacités 0..W)"""
+    return capacity // 8 + 1
+
+
+def working_bytes(capacity):
+    """Mémoire de la passe avant hors matrice des décisions (O(W))"""
+    return (capacity + 1) * WORK_BYTES_PER_CAPACITY
+
+
+class DecisionMatrix:
+    """Matrice des décisions en mémoire"""
+
+    location = "mémoire"
+
+    def __init__(self, n, capacity):
+        self.n = n
+        self.rows = np.zeros((n, row_bytes(capacity)), dtype=np.uint8)
+
+    def write(self, index, packed):
+        self.rows[index] = packed
+
+    def finish(self):
+        pass
+
+    def reverse_rows(self):
+        """Lignes (indice, octets) de la dernière à la première"""
+        for index in range(self.n - 1, -1, -1):
+            yield index, self.rows[index]
+
+    def close(self):
+        self.rows = None
+
+
+class MemmapDecisionMatrix:
+    """Matrice des décisions dans un fichier np.memmap, projeté par fenêtres de lignes"""
+
+    location = "disque"
+
+    def __init__(self, n, capacity, window_rows, directory=DP_TABLE_DIR):
+        """
+        Args:
+            n: Nombre de lignes (objets)
+            capacity: Capacité réduite W
+            window_rows: Lignes projetées à la fois (borne la mémoire résidente)
+            directory: Dossier du fichier (disque local de préférence)
+        """
+        self.n = n
+        self.row_bytes = row_bytes(capacity)
+        self.window_rows = max(1, window_rows)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, self.path = tempfile.mkstemp(suffix='.bits', dir=directory)
+        with os.fdopen(descriptor, 'wb') as file:
+            # Fichier creux: les blocs sont alloués à l'écriture des lignes
+            file.truncate(n * self.row_bytes)
+        self.window = None
+        self.window_start = 0
+
+    def _map(self, start, rows, mode):
+        return np.memmap(
+            self.path, dtype=np.uint8, mode=mode,
+            offset=start * self.row_bytes, shape=(rows, self.row_bytes)
+        )
+
+    def write(self, index, packed):
+        if self.window is None or index >= self.window_start + len(self.window):
+            self.finish()
+            self.window_start = index
+            self.window = self._map(index, min(self.window_rows, self.n - index), 'r+')
+        self.window[index - self.window_start] = packed
+
+    def finish(self):
+        """Vide et libère la fenêtre courante"""
+        if self.window is not None:
+            self.window.flush()
+            self.window = None
+
+    def reverse_rows(self):
+        """Lignes (indice, octets) de la dernière à la première, fenêtre par fenêtre"""
+        self.finish()
+        end = self.n
+        while end > 0:
+            start = max(0, end - self.window_rows)
+            window = self._map(start, end - start, 'r')
+            for index in range(end - 1, start - 1, -1):
+                yield index, window[index - start]
+            del window
+            end = start
+
+    def close(self):
+        self.window = None
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+@contextlib.contextmanager
+def open_matrix(n, capacity, storage='table', memory_mb=512, directory=DP_TABLE_DIR):
+    """
+    Matrice des décisions adaptée au budget mémoire (supprimée à la sortie)
+
+    Args:
+        n: Nombre d'objets
+        capacity: Capacité réduite W
+        storage: 'table' (en mémoire si elle tient dans le budget, sinon
+            sur disque) ou 'memmap' (toujours sur disque)
+        memory_mb: Budget de mémoire résidente de la DP (Mo), ligne de
+            valeurs comprise
+        directory: Dossier des fichiers de décisions
+    """
+    budget = memory_mb * MB - working_bytes(capacity)
+    if storage == 'table' and n * row_bytes(capacity) <= budget:
+        matrix = DecisionMatrix(n, capacity)
+    else:
+        matrix = MemmapDecisionMatrix(n, capacity, int(budget // row_bytes(capacity)), directory)
+    try:
+        yield matrix
+    finally:
+        matrix.close()
+
+
+def forward(costs, profits, capacity, matrix, on_item=None):
+    """
+    Passe avant: meilleur profit par capacité et décisions de chaque objet
+
+    Args:
+        costs: Coûts réduits (entiers positifs)
+        profits: Profits des objets en virgule fixe (int64, voir models.action)
+        capacity: Capacité réduite W
+        matrix: Matrice des décisions (open_matrix)
+        on_item: Rappel on_item(i) avant chaque objet (annulation, progression)
+
+    Returns:
+        int: Meilleur profit (virgule fixe) pour la capacité W
+    """
+    best = np.zeros(capacity + 1, dtype=np.int64)
+    take = np.zeros(capacity + 1, dtype=bool)
+    for index in range(len(costs)):
+        if on_item is not None:
+            on_item(index)
+        weight = int(costs[index])
+        profit = profits[index]
+        take[:] = False
+        if weight <= capacity and profit > 0:
+            # Candidats calculés depuis la ligne précédente (copie): chaque objet pris au plus une fois
+            candidate = best[:capacity + 1 - weight] + profit
+            np.greater(candidate, best[weight:], out=take[weight:])
+            np.copyto(best[weight:], candidate, where=take[weight:])
+        matrix.write(index, np.packbits(take))
+    matrix.finish()
+    return int(best[capacity])
+
+
+def reconstruct(costs, capacity, matrix):
+    """
+    Objets choisis, en remontant les décisions depuis la capacité W
+
+    Returns:
+        list: Indices des objets choisis (croissants)
+    """
+    remaining = capacity
+    selected = []
+    for index, row in matrix.reverse_rows():
+        if (row[remaining >> 3] >> (7 - (remaining & 7))) & 1:
+            selected.append(index)
+            remaining -= int(costs[index])
+    selected.reverse()
+    return selected
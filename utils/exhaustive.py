@@ -0,0 +1,71 @@
+"""
+Énumération exhaustive des sous-ensembles (force brute)
+
+Boucle partagée par AlgorithmController.brute_force et BruteForceController:
+les combinaisons sont parcourues par taille croissante (combinaison vide
+comprise), avec aux mêmes points l'annulation, la progression et le point
+de reprise. L'état enregistré (taille en cours, position dans cette taille,
+combinaisons testées, meilleure solution) permet de reprendre exactement
+là où la résolution s'est arrêtée.
+"""
+from itertools import combinations, islice
+
+# Fréquence par défaut des vérifications (annulation, progression, reprise)
+CHECK_INTERVAL = 4096
+
+
+def best_subset(actions, budget, checkpoint, progress, check_cancelled=None, check_interval=CHECK_INTERVAL):
+    """
+    Meilleur sous-ensemble sous le budget (profits en virgule fixe, exacts)
+
+    Args:
+        actions: Liste d'objets Action
+        budget: Budget maximum
+        checkpoint: Point de reprise ouvert (voir utils.checkpoint)
+        progress: ProgressReporter (tâche "Force brute", reprise comprise)
+        check_cancelled: Rappel levant SolveCancelled si l'annulation est demandée
+        check_interval: Combinaisons entre deux vérifications
+
+    Returns:
+        tuple: (actions choisies, profit en virgule fixe, coût, combinaisons testées)
+    """
+    best_combination, best_profit, best_cost = [], 0, 0
+    start_size, start_offset, tested = 0, 0, 0
+    state = checkpoint.restore()
+    if state is not None:
+        start_size, start_offset, tested = state['size'], state['offset'], state['tested']
+        best_combination = [actions[i] for i in state['best']]
+        best_profit = sum(action.profit_fp for action in best_combination)
+        best_cost = sum(action.cost for action in best_combination)
+        print(f"♻️  Reprise: {tested:,} combinaisons déjà testées")
+    positions = {id(action): i for i, action in enumerate(actions)}
+
+    with progress.task("Force brute", total=2 ** len(actions), unit="combinaisons",
+                       completed=tested) as task:
+        for r in range(start_size, len(actions) + 1):
+            offset = start_offset if r == start_size else 0
+            size_start = tested - offset
+            for combination in islice(combinations(actions, r), offset, None):
+                tested += 1
+                if tested % check_interval == 0:
+                    if check_cancelled is not None:
+                        check_cancelled()
+                    task.update(tested)
+                    if checkpoint.due():
+                        # État avant cette combinaison: elle sera testée à la reprise
+                        checkpoint.save({
+                            'size': r,
+                            'offset': tested - 1 - size_start,
+                            'tested': tested - 1,
+                            'best': [positions[id(action)] for action in best_combination]
+                        })
+
+                total_cost = sum(action.cost for action in combination)
+                # ⚠️ VÉRIFICATION STRICTE DU BUDGET
+                if total_cost <= budget:
+                    total_profit = sum(action.profit_fp for action in combination)
+                    if total_profit > best_profit:
+                        best_combination, best_profit, best_cost = list(combination), total_profit, total_cost
+        task.update(tested)
+    checkpoint.complete()
+    return best_combination, best_profit, best_cost, tested
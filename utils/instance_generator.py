@@ -0,0 +1,253 @@
+"""
+Générateurs d'instances difficiles reproductibles (classes de Pisinger)
+
+Classes disponibles (R = coût maximal, coûts w tirés dans [cost_min, R]):
+- uncorrelated          : profit p uniforme dans [cost_min, R], indépendant de w
+- weakly_correlated     : p uniforme dans [w - R/10, w + R/10] (p >= 1)
+- strongly_correlated   : p = w + R/10
+- inverse_strongly      : p uniforme dans [cost_min, R], w = p + R/10
+- subset_sum            : p = w (seul le remplissage du budget compte)
+- spanner               : v objets générateurs fortement corrélés, réduits
+                          d'un facteur 2/m; chaque objet est un multiple
+                          a ∈ [1, m] d'un générateur tiré au hasard
+
+Le schéma CSV est celui de data/*.csv (id, cost, profit_pct). Le champ
+profit_pct vaut p / (w × k), où k est la borne du ratio p/w de la classe:
+tous les profits sont divisés par la même constante, l'optimum est donc
+inchangé et profit_pct reste <= 1 (au-delà, le chargement l'interpréterait
+comme un pourcentage).
+
+Le budget est une fraction du coût total; il est enregistré avec la graine
+et les paramètres dans un fichier compagnon <nom>.json.
+
+Les objets sont générés par blocs de CHUNK_ROWS lignes, chaque bloc avec
+son propre générateur dérivé de (graine, numéro de bloc): une instance de
+10⁷ objets s'écrit en mémoire constante et reste identique d'une machine à
+l'autre.
+
+Usage:
+    python -m utils.instance_generator --classes strongly_correlated subset_sum \
+        --sizes 10 1000 1000000 --seed 42
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# À incrémenter si la génération change (les fichiers existants ne sont plus reproductibles)
+GENERATOR_VERSION = 1
+
+INSTANCE_CLASSES = (
+    "uncorrelated",
+    "weakly_correlated",
+    "strongly_correlated",
+    "inverse_strongly",
+    "subset_sum",
+    "spanner"
+)
+
+# Lignes générées et écrites par bloc
+CHUNK_ROWS = 100_000
+
+# Paramètres des instances spanner(v, m) de Pisinger
+SPANNER_SPAN = 2
+SPANNER_MULTIPLIER = 10
+
+GENERATED_DIR = os.path.join('data', 'generated')
+
+
+def _chunk_rng(seed, chunk_index):
+    """Générateur d'un bloc, indépendant de la taille totale de l'instance"""
+    return np.random.default_rng([seed, chunk_index + 1])
+
+
+def _spanner_items(seed, cost_min, cost_max):
+    """Objets générateurs (w, p) d'une instance spanner"""
+    rng = np.random.default_rng([seed, 0])
+    weights = rng.integers(cost_min, cost_max + 1, SPANNER_SPAN)
+    profits = weights + cost_max // 10
+    weights = np.maximum(1, np.ceil(2 * weights / SPANNER_MULTIPLIER)).astype(np.int64)
+    profits = np.maximum(1, np.ceil(2 * profits / SPANNER_MULTIPLIER)).astype(np.int64)
+    return weights, profits
+
+
+def profit_scale(instance_class, seed=42, cost_min=1000, cost_max=50000):
+    """
+    Borne k du ratio profit/coût d'une classe (profit_pct = p / (w × k))
+
+    Returns:
+        float: k >= 1
+    """
+    if instance_class == "uncorrelated":
+        return cost_max / cost_min
+    if instance_class in ("weakly_correlated", "strongly_correlated"):
+        return (cost_min + cost_max // 10) / cost_min
+    if instance_class in ("inverse_strongly", "subset_sum"):
+        return 1.0
+    if instance_class == "spanner":
+        weights, profits = _spanner_items(seed, cost_min, cost_max)
+        return max(1.0, float((profits / weights).max()))
+    raise ValueError(f"Classe d'instance inconnue: {instance_class}")
+
+
+def _generate_chunk(instance_class, rng, size, cost_min, cost_max, span):
+    """Coûts et profits bruts (entiers) d'un bloc"""
+    delta = cost_max // 10
+    if instance_class == "inverse_strongly":
+        profits = rng.integers(cost_min, cost_max + 1, size)
+        return profits + delta, profits
+    if instance_class == "spanner":
+        span_weights, span_profits = span
+        picks = rng.integers(0, len(span_weights), size)
+        multipliers = rng.integers(1, SPANNER_MULTIPLIER + 1, size)
+        return span_weights[picks] * multipliers, span_profits[picks] * multipliers
+
+    weights = rng.integers(cost_min, cost_max + 1, size)
+    if instance_class == "uncorrelated":
+        profits = rng.integers(cost_min, cost_max + 1, size)
+    elif instance_class == "weakly_correlated":
+        profits = np.maximum(1, weights + rng.integers(-delta, delta + 1, size))
+    elif instance_class == "strongly_correlated":
+        profits = weights + delta
+    elif instance_class == "subset_sum":
+        profits = weights.copy()
+    else:
+        raise ValueError(f"Classe d'instance inconnue: {instance_class}")
+    return weights, profits
+
+
+def iter_chunks(instance_class, n, seed=42, cost_min=1000, cost_max=50000):
+    """
+    Générateur: blocs (premier indice, coûts int64, profit_pct float64)
+
+    Args:
+        instance_class: Une des INSTANCE_CLASSES
+        n: Nombre d'objets
+        seed: Graine (même graine et mêmes paramètres = même instance)
+        cost_min: Coût minimal d'un objet (F)
+        cost_max: Coût maximal R d'un objet (F)
+    """
+    if instance_class not in INSTANCE_CLASSES:
+        raise ValueError(f"Classe d'instance inconnue: {instance_class}")
+    if not 1 <= cost_min <= cost_max:
+        raise ValueError("Plage de coûts invalide")
+
+    span = _spanner_items(seed, cost_min, cost_max) if instance_class == "spanner" else None
+    scale = profit_scale(instance_class, seed, cost_min, cost_max)
+    for chunk_index, start in enumerate(range(0, n, CHUNK_ROWS)):
+        size = min(CHUNK_ROWS, n - start)
+        costs, profits = _generate_chunk(
+            instance_class, _chunk_rng(seed, chunk_index), size, cost_min, cost_max, span
+        )
+        yield start, costs.astype(np.int64), profits / (costs * scale)
+
+
+def generate_actions(instance_class, n, seed=42, cost_min=1000, cost_max=50000):
+    """Instance en mémoire (liste d'Action), pour les petites tailles"""
+    from models.action import Action
+    actions = []
+    for start, costs, profit_pcts in iter_chunks(instance_class, n, seed, cost_min, cost_max):
+        actions.extend(
+            Action(f"Item-{start + i}", cost, profit_pct)
+            for i, (cost, profit_pct) in enumerate(zip(costs.tolist(), profit_pcts.tolist()))
+        )
+    return actions
+
+
+def instance_name(instance_class, n, seed):
+    return f"{instance_class}_n{n}_s{seed}"
+
+
+def write_instance(instance_class, n, seed=42, budget_fraction=0.5, output_dir=GENERATED_DIR,
+                   cost_min=1000, cost_max=50000):
+    """
+    Écrit une instance CSV (id, cost, profit_pct) et son fichier compagnon JSON
+
+    Args:
+        instance_class: Une des INSTANCE_CLASSES
+        n: Nombre d'objets (jusqu'à 10⁷ et au-delà: écriture par blocs)
+        seed: Graine
+        budget_fraction: Budget = fraction du coût total
+        output_dir: Dossier de sortie
+        cost_min: Coût minimal d'un objet (F)
+        cost_max: Coût maximal R d'un objet (F)
+
+    Returns:
+        tuple: (chemin du CSV, métadonnées de l'instance)
+    """
+    if not 0 < budget_fraction <= 1:
+        raise ValueError("La fraction de budget doit être dans ]0, 1]")
+
+    os.makedirs(output_dir, exist_ok=True)
+    name = instance_name(instance_class, n, seed)
+    path = os.path.join(output_dir, f"{name}.csv")
+
+    # Écriture atomique: un lecteur concurrent ne voit jamais un fichier partiel
+    temporary = f"{path}.{os.getpid()}.tmp"
+    total_cost = 0
+    with open(temporary, 'w', encoding='utf-8', newline='') as file:
+        file.write("id,cost,profit_pct\n")
+        for start, costs, profit_pcts in iter_chunks(instance_class, n, seed, cost_min, cost_max):
+            total_cost += int(costs.sum())
+            file.write("".join(
+                f"Item-{start + i},{cost},{profit_pct:.10g}\n"
+                for i, (cost, profit_pct) in enumerate(zip(costs.tolist(), profit_pcts.tolist()))
+            ))
+    os.replace(temporary, path)
+
+    metadata = {
+        'generator_version': GENERATOR_VERSION,
+        'instance_class': instance_class,
+        'n': n,
+        'seed': seed,
+        'cost_min': cost_min,
+        'cost_max': cost_max,
+        'profit_scale': profit_scale(instance_class, seed, cost_min, cost_max),
+        'total_cost': total_cost,
+        'budget_fraction': budget_fraction,
+        'budget': int(total_cost * budget_fraction)
+    }
+    with open(os.path.join(output_dir, f"{name}.json"), 'w', encoding='utf-8') as file:
+        json.dump(metadata, file, indent=1)
+    return path, metadata
+
+
+def load_instance_metadata(filename):
+    """Métadonnées du fichier compagnon d'une instance générée, ou None"""
+    try:
+        with open(f"{os.path.splitext(filename)[0]}.json", 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Génération d'instances de sac à dos reproductibles")
+    parser.add_argument('--classes', nargs='+', choices=INSTANCE_CLASSES + ('all',), default=['all'])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000, 10000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--budget-fraction', type=float, default=0.5,
+                        help="Budget en fraction du coût total")
+    parser.add_argument('--cost-min', type=int, default=1000)
+    parser.add_argument('--cost-max', type=int, default=50000)
+    parser.add_argument('--output-dir', default=GENERATED_DIR)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    classes = INSTANCE_CLASSES if 'all' in args.classes else args.classes
+    for instance_class in classes:
+        for n in args.sizes:
+            path, metadata = write_instance(
+                instance_class, n, args.seed, args.budget_fraction, args.output_dir,
+                args.cost_min, args.cost_max
+            )
+            print(f"✅ {path} ({n:,} objets, budget {metadata['budget']:,}F)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Bornes pour le sac à dos 0/1 (profit maximal sous contrainte de budget)
+
+- Borne inférieure: glouton par ratio profit/coût (solution réalisable)
+- Borne supérieure: relaxation linéaire de Dantzig (fraction du premier
+  objet qui ne rentre pas)
+
+Les profits sont ceux des actions en virgule fixe (entiers int64, voir
+models.action.PROFIT_SCALE): le glouton est exact, seule la fraction de la
+borne LP est flottante.
+"""
+import math
+
+import numpy as np
+
+from models.action import PROFIT_SCALE
+
+# Erreur relative admise sur une borne LP flottante (sommes de grands entiers)
+LP_RELATIVE_ERROR = 1e-12
+
+
+def fixed_profits(costs, profit_pcts):
+    """Profits en virgule fixe d'une colonne de coûts et de rendements (int64, vectorisé)"""
+    costs = np.asarray(costs, dtype=np.int64)
+    scaled = np.rint(np.asarray(profit_pcts, dtype=np.float64) * PROFIT_SCALE).astype(np.int64)
+    return costs * scaled
+
+
+def integer_upper_bound(bound):
+    """
+    Majorant entier de l'optimum à profits entiers: partie entière de la
+    borne LP, avec une marge pour l'arrondi de son calcul flottant
+    """
+    return math.floor(bound * (1 + LP_RELATIVE_ERROR))
+
+
+def ratio_order(costs, profits):
+    """Indices triés par ratio profit/coût décroissant (tri stable)"""
+    ratios = profits / costs
+    return np.argsort(-ratios, kind='stable')
+
+
+def greedy_lower_bound(costs, profits, budget, order=None):
+    """
+    Glouton par ratio avec saut des objets trop chers
+
+    Returns:
+        tuple: (profit, indices choisis)
+    """
+    if order is None:
+        order = ratio_order(costs, profits)
+
+    remaining = budget
+    total = 0
+    chosen = []
+    for i in order.tolist():
+        cost = costs[i]
+        if cost <= remaining:
+            remaining -= cost
+            # .item(): entier Python (sans débordement) pour des profits entiers
+            total += profits[i].item()
+            chosen.append(i)
+
+    # Le meilleur objet seul peut battre le glouton (garantie 1/2)
+    affordable = np.flatnonzero(costs <= budget)
+    if len(affordable):
+        best_single = affordable[np.argmax(profits[affordable])]
+        if profits[best_single] > total:
+            return profits[best_single].item(), [int(best_single)]
+
+    return total, chosen
+
+
+def dantzig_upper_bound(costs, profits, budget, order=None):
+    """Borne supérieure de la relaxation linéaire pour un budget donné"""
+    if order is None:
+        order = ratio_order(costs, profits)
+    return float(_lp_bounds(costs[order], profits[order], np.array([budget]))[0])
+
+
+def _lp_bounds(sorted_costs, sorted_profits, capacities):
+    """Relaxation linéaire vectorisée pour plusieurs capacités (objets triés par ratio)"""
+    cost_prefix = np.concatenate(([0], np.cumsum(sorted_costs)))
+    profit_prefix = np.concatenate(([0.0], np.cumsum(sorted_profits)))
+    n = len(sorted_costs)
+
+    # Nombre d'objets entiers qui rentrent dans chaque capacité
+    whole = np.searchsorted(cost_prefix, capacities, side='right') - 1
+    bounds = profit_prefix[whole].astype(np.float64)
+
+    # Fraction de l'objet critique
+    partial = whole < n
+    critical = whole[partial]
+    leftover = capacities[partial] - cost_prefix[critical]
+    bounds[partial] += leftover * sorted_profits[critical] / sorted_costs[critical]
+    return bounds
+
+
+def lp_reduction_mask(costs, profits, budget):
+    """
+    Réduction par borne LP: écarte les objets qui ne peuvent appartenir à
+    aucune solution optimale
+
+    Pour chaque objet j, p_j + LP(budget - c_j) majore tout portefeuille
+    contenant j. Si ce majorant est strictement inférieur au profit du
+    glouton, j est exclu sans perte d'optimalité.
+
+    Returns:
+        tuple: (masque des objets conservés, borne inférieure utilisée)
+    """
+    costs = np.asarray(costs, dtype=np.int64)
+    profits = np.asarray(profits)
+    if len(costs) == 0:
+        return np.zeros(0, dtype=bool), 0
+
+    order = ratio_order(costs, profits)
+    lower_bound, _ = greedy_lower_bound(costs, profits, budget, order)
+
+    capacities = np.maximum(budget - costs, 0)
+    forced_in = profits + _lp_bounds(costs[order], profits[order], capacities)
+    # Marge pour l'arrondi de la borne LP (seule partie flottante)
+    tolerance = LP_RELATIVE_ERROR * max(1.0, abs(lower_bound))
+    keep = (forced_in >= lower_bound - tolerance) & (costs <= budget)
+    return keep, lower_bound
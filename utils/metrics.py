@@ -0,0 +1,325 @@
+"""
+Métriques de performance au format OpenMetrics (texte)
+
+Un MetricsRegistry contient des compteurs, jauges et histogrammes
+étiquetés. SolverMetrics y déclare les métriques de l'application et
+reçoit les observations de FileController.load_store et
+AlgorithmController.execute_algorithm:
+
+- invest_solve_duration_seconds   histogramme (algorithm, size_class)
+- invest_solves_total             compteur (algorithm, size_class, status)
+- invest_solve_items_total        compteur d'actions traitées (algorithm, size_class)
+- invest_solve_items_per_second   jauge, débit de la dernière résolution
+- invest_cache_requests_total     compteur (cache, outcome=hit|miss)
+- invest_load_duration_seconds    histogramme (source=file|cache)
+- invest_actions_loaded_total     compteur
+- invest_rows_rejected_total      compteur
+- invest_peak_memory_bytes        jauge, pic RSS du processus et de ses fils
+
+Export: fichier texte (écriture atomique) ou point d'accès HTTP local
+(/metrics) pendant le mode batch. Les workers du batch et du mode
+parallèle (ConcurrentController) renvoient un instantané (snapshot)
+fusionné par le parent (merge).
+"""
+import http.server
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Bornes des histogrammes de durée (secondes)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 600.0)
+
+# Classes de taille des datasets: (borne supérieure du nombre d'actions, étiquette)
+SIZE_CLASSES = ((20, 'tiny'), (100, 'small'), (1000, 'medium'), (10000, 'large'))
+
+
+def size_class(n_actions):
+    """Classe de taille d'un dataset (étiquette à cardinalité bornée)"""
+    for limit, label in SIZE_CLASSES:
+        if n_actions <= limit:
+            return label
+    return 'huge'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Famille de métriques étiquetées (valeurs indexées par tuple d'étiquettes)"""
+
+    type_name = 'unknown'
+
+    def __init__(self, name, documentation, labels=(), unit=None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.unit = unit
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def header(self):
+        lines = [f"# TYPE {self.name} {self.type_name}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        return lines
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}_total{_format_labels(self.labels, key)} {_format_value(value)}"
+
+    def merge(self, values):
+        for key, value in values.items():
+            self.values[key] = self.values.get(key, 0) + value
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        self.values[self._key(labels)] = value
+
+    def set_max(self, value, **labels):
+        key = self._key(labels)
+        self.values[key] = max(self.values.get(key, value), value)
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+    def merge(self, values):
+        # Jauges fusionnées par maximum (pic mémoire, dernier débit le plus élevé)
+        for key, value in values.items():
+            self.values[key] = max(self.values.get(key, value), value)
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), unit=None, buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labels, unit)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        counts, total = self.values.get(key, ([0] * len(self.buckets), 0.0))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self.values[key] = (counts, total + value)
+
+    def samples(self):
+        for key, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, (('le', _format_value(bound)),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+
+    def merge(self, values):
+        for key, (counts, total) in values.items():
+            current, current_total = self.values.get(key, ([0] * len(self.buckets), 0.0))
+            self.values[key] = ([a + b for a, b in zip(current, counts)], current_total + total)
+
+
+class MetricsRegistry:
+    """Ensemble de métriques rendu au format OpenMetrics"""
+
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=(), unit=None):
+        return self._register(Gauge(name, documentation, labels, unit))
+
+    def histogram(self, name, documentation, labels=(), unit=None, buckets=DURATION_BUCKETS):
+        return self._register(Histogram(name, documentation, labels, unit, buckets))
+
+    def render(self):
+        """Exposition OpenMetrics (texte terminé par # EOF)"""
+        with self._lock:
+            lines = []
+            for metric in self.metrics.values():
+                lines.extend(metric.header())
+                lines.extend(metric.samples())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Valeurs brutes (sérialisables par pickle) à fusionner dans un autre registre"""
+        with self._lock:
+            return {name: dict(metric.values) for name, metric in self.metrics.items()}
+
+    def merge(self, snapshot):
+        with self._lock:
+            for name, values in snapshot.items():
+                if name in self.metrics:
+                    self.metrics[name].merge(values)
+
+    def write(self, path):
+        """Écrit l'exposition dans un fichier (atomique: un collecteur ne lit jamais un fichier partiel)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port, host='127.0.0.1'):
+        """
+        Sert /metrics sur un port local dans un thread démon
+
+        Returns:
+            ThreadingHTTPServer: à arrêter avec shutdown()
+        """
+        registry = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+def _peak_memory_bytes():
+    """Pic RSS du processus et de ses fils terminés (processus isolés)"""
+    if resource is None:
+        return 0
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Ko sous Linux, octets sous macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class SolverMetrics:
+    """Métriques de l'application (voir le module)"""
+
+    enabled = True
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        registry = self.registry
+        self.solve_duration = registry.histogram(
+            'invest_solve_duration_seconds', "Durée des résolutions",
+            ('algorithm', 'size_class'), unit='seconds'
+        )
+        self.solves = registry.counter(
+            'invest_solves', "Résolutions par issue (ok, timeout, cancelled, out_of_memory, error)",
+            ('algorithm', 'size_class', 'status')
+        )
+        self.solve_items = registry.counter(
+            'invest_solve_items', "Actions traitées par les résolutions",
+            ('algorithm', 'size_class')
+        )
+        self.items_per_second = registry.gauge(
+            'invest_solve_items_per_second', "Débit de la dernière résolution (actions/s)",
+            ('algorithm', 'size_class')
+        )
+        self.cache_requests = registry.counter(
+            'invest_cache_requests', "Consultations des caches", ('cache', 'outcome')
+        )
+        self.load_duration = registry.histogram(
+            'invest_load_duration_seconds', "Durée des chargements de datasets",
+            ('source',), unit='seconds'
+        )
+        self.actions_loaded = registry.counter('invest_actions_loaded', "Actions chargées")
+        self.rows_rejected = registry.counter('invest_rows_rejected', "Lignes rejetées au nettoyage")
+        self.peak_memory = registry.gauge(
+            'invest_peak_memory_bytes', "Pic de mémoire résidente (processus et fils)", unit='bytes'
+        )
+
+    def observe_solve(self, algorithm_name, n_actions, duration, status='ok'):
+        labels = {'algorithm': algorithm_name, 'size_class': size_class(n_actions)}
+        self.solves.inc(status=status, **labels)
+        if status != 'ok':
+            return
+        self.solve_duration.observe(duration, **labels)
+        self.solve_items.inc(n_actions, **labels)
+        if duration > 0:
+            self.items_per_second.set(n_actions / duration, **labels)
+        self.peak_memory.set_max(_peak_memory_bytes())
+
+    def observe_cache(self, cache_name, hit):
+        self.cache_requests.inc(cache=cache_name, outcome='hit' if hit else 'miss')
+
+    def observe_load(self, duration, n_actions, rejected, from_cache=False):
+        self.load_duration.observe(duration, source='cache' if from_cache else 'file')
+        self.actions_loaded.inc(n_actions)
+        if rejected:
+            self.rows_rejected.inc(rejected)
+        self.peak_memory.set_max(_peak_memory_bytes())
+
+
+class _DisabledMetrics:
+    """Métriques désactivées: toutes les observations sont ignorées"""
+
+    enabled = False
+
+    def observe_solve(self, algorithm_name, n_actions, duration, status='ok'):
+        pass
+
+    def observe_cache(self, cache_name, hit):
+        pass
+
+    def observe_load(self, duration, n_actions, rejected, from_cache=False):
+        pass
+
+
+# Métriques désactivées partagées (valeur par défaut des contrôleurs)
+DISABLED_METRICS = _DisabledMetrics()
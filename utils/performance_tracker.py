@@ -1,42 +1,169 @@
+import contextlib
+import sys
 import time
-import os
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _max_rss_bytes():
+    """Pic de mémoire résidente du processus depuis son démarrage (ru_maxrss)"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Span:
+    """Phase chronométrée: durée, compteurs, pic d'allocation et sous-phases"""
+
+    __slots__ = ('name', 'start_ns', 'duration_ns', 'counters', 'children',
+                 'start_traced', 'peak_traced', 'max_rss')
+
+    def __init__(self, name):
+        self.name = name
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.counters = {}
+        self.children = []
+        self.start_traced = 0
+        self.peak_traced = 0
+        self.max_rss = 0
+
+    def to_dict(self):
+        report = {
+            'name': self.name,
+            'duration_ms': self.duration_ns / 1e6,
+            'max_rss_mb': self.max_rss / (1024 * 1024)
+        }
+        if self.peak_traced:
+            # Pic des allocations Python pendant la phase, au-delà du niveau initial
+            report['peak_alloc_mb'] = max(0, self.peak_traced - self.start_traced) / (1024 * 1024)
+        if self.counters:
+            report['counters'] = dict(self.counters)
+        if self.children:
+            report['children'] = [child.to_dict() for child in self.children]
+        return report
+
 
 class PerformanceTracker:
-    """Utilitaire pour le suivi des performances"""
-    
-    def __init__(self):
-        self.process = None
+    """
+    Instrumentation par phases imbriquées (chargement, nettoyage,
+    préréduction, résolution, reconstruction, export)
+
+    - Durées en perf_counter_ns
+    - Pic mémoire: ru_maxrss (pic du processus) et, avec trace_memory=True,
+      pic des allocations Python de chaque phase via tracemalloc
+    - Compteurs par phase (cellules DP, nœuds, sous-ensembles...)
+
+    Désactivé, span() renvoie un contexte vide partagé et count() ne fait
+    rien: les solveurs peuvent l'appeler sans coût mesurable. Les compteurs
+    sont ajoutés une fois par phase, jamais dans les boucles internes.
+    """
+
+    _NULL_SPAN = contextlib.nullcontext()
+
+    def __init__(self, enabled=True, trace_memory=False):
+        """
+        Args:
+            enabled: Active la collecte
+            trace_memory: Mesure le pic d'allocation par phase (tracemalloc,
+                ralentit sensiblement le code Python instrumenté)
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.roots = []
+        self._stack = []
         self.start_time = None
-        self.start_memory = None
-        
-        # Import conditionnel de psutil
+
+    def span(self, name):
+        """Contexte chronométrant une phase (imbriquée dans la phase courante)"""
+        if not self.enabled:
+            return self._NULL_SPAN
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _span(self, name):
+        span = Span(name)
+        parent = self._stack[-1] if self._stack else None
+        (parent.children if parent is not None else self.roots).append(span)
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # Le pic du parent jusqu'ici est conservé avant la remise à zéro
+            if parent is not None:
+                parent.peak_traced = max(parent.peak_traced, peak)
+            tracemalloc.reset_peak()
+            span.start_traced = current
+            span.peak_traced = current
+
+        self._stack.append(span)
+        span.start_ns = time.perf_counter_ns()
         try:
-            import psutil
-            self.process = psutil.Process(os.getpid())
-            self.psutil_available = True
-        except ImportError:
-            self.psutil_available = False
-            print("⚠️  psutil non installé. Installation recommandée: pip install psutil")
-    
+            yield span
+        finally:
+            span.duration_ns = time.perf_counter_ns() - span.start_ns
+            self._stack.pop()
+            span.max_rss = _max_rss_bytes()
+            if self.trace_memory:
+                span.peak_traced = max(span.peak_traced, tracemalloc.get_traced_memory()[1])
+                if parent is not None:
+                    parent.peak_traced = max(parent.peak_traced, span.peak_traced)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def count(self, name, amount=1):
+        """Ajoute amount au compteur name de la phase courante"""
+        if not self.enabled or not self._stack:
+            return
+        counters = self._stack[-1].counters
+        counters[name] = counters.get(name, 0) + amount
+
+    def adopt(self, spans):
+        """Rattache à la phase courante des phases mesurées dans un autre processus"""
+        if not self.enabled:
+            return
+        (self._stack[-1].children if self._stack else self.roots).extend(spans)
+
+    def report(self):
+        """Arbre des phases mesurées (liste de dicts imbriqués)"""
+        return [span.to_dict() for span in self.roots]
+
+    def reset(self):
+        self.roots = []
+        self._stack = []
+
+    # ------------------------------------------------------------------
+    # Mesure globale (start / stop)
+    # ------------------------------------------------------------------
+
     def start(self):
         """Démarre le tracking de performance"""
-        self.start_time = time.time()
-        if self.psutil_available and self.process:
-            self.start_memory = self.process.memory_info().rss
-    
+        self.start_time = time.perf_counter_ns()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
     def stop(self):
         """Arrête le tracking et retourne les métriques"""
-        end_time = time.time()
         metrics = {
-            'execution_time': end_time - self.start_time
+            'execution_time': (time.perf_counter_ns() - self.start_time) / 1e9,
+            # Pic réel du processus (et non un écart de RSS)
+            'peak_memory_mb': _max_rss_bytes() / (1024 * 1024)
         }
-        
-        if self.psutil_available and self.process:
-            end_memory = self.process.memory_info().rss
-            metrics['memory_used_mb'] = (end_memory - self.start_memory) / 1024 / 1024
-            metrics['peak_memory_mb'] = self.process.memory_info().rss / 1024 / 1024
-        else:
-            metrics['memory_used_mb'] = 0
-            metrics['peak_memory_mb'] = 0
-            
-        return metrics
\ No newline at end of file
+        if tracemalloc.is_tracing():
+            metrics['peak_alloc_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        return metrics
+
+
+# Traqueur désactivé partagé (valeur par défaut des contrôleurs)
+DISABLED_TRACKER = PerformanceTracker(enabled=False)
@@ -0,0 +1,202 @@
+"""
+Profilage à la demande des résolutions
+
+Activé par la variable d'environnement INVEST_PROFILE (ou --profile de
+main.py / batch.py, qui la positionne):
+- cprofile : cProfile (fichier .pstats, comptes d'appels exacts) et, en
+             parallèle, échantillonnage des piles (fichier .collapsed)
+- sampling : échantillonnage seul (surcoût faible), fichier .collapsed
+
+Les fichiers sont écrits par (dataset, algorithme) dans results/profiles/.
+Le format .collapsed ("racine;appelant;fonction nombre") est celui
+d'entrée de flamegraph.pl, speedscope ou inferno.
+
+Les processus isolés reçoivent le profileur du parent et lui renvoient le
+résumé de leur profil (last); la variable d'environnement est héritée par
+les workers du mode batch: leurs résolutions sont profilées aussi. Un dataset
+dont le nom n'est pas connu est identifié par son empreinte. La course
+(race) résout dans ses propres processus: seul le parent est profilé.
+"""
+import collections
+import contextlib
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+
+PROFILE_ENV = 'INVEST_PROFILE'
+PROFILE_MODES = ('cprofile', 'sampling')
+PROFILE_DIR = os.path.join('results', 'profiles')
+
+# Intervalle d'échantillonnage des piles (secondes)
+SAMPLING_INTERVAL = 0.002
+# Fonctions affichées dans le résumé
+TOP_FUNCTIONS = 10
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Échantillonne la pile d'un thread à intervalle régulier (thread démon)"""
+
+    def __init__(self, thread_id, interval=SAMPLING_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def self_counts(self):
+        """Échantillons par fonction en sommet de pile (temps propre)"""
+        counts = collections.Counter()
+        for stack, count in self.stacks.items():
+            counts[stack.rsplit(";", 1)[-1]] += count
+        return counts
+
+
+class SolveProfiler:
+    """Profileur des appels de execute_algorithm (voir le module)"""
+
+    def __init__(self, mode='cprofile', output_dir=PROFILE_DIR, interval=SAMPLING_INTERVAL):
+        """
+        Args:
+            mode: 'cprofile' ou 'sampling'
+            output_dir: Dossier des fichiers .pstats / .collapsed
+            interval: Intervalle d'échantillonnage (secondes)
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        # Nom du dataset courant (positionné par l'appelant), sinon empreinte
+        self.dataset_name = None
+        # Résumé du dernier profil: algorithm, files, top
+        self.last = None
+
+    @classmethod
+    def from_environment(cls):
+        """Profileur configuré par INVEST_PROFILE, ou None si le profilage est désactivé"""
+        value = os.environ.get(PROFILE_ENV, '').strip().lower()
+        if value in ('', '0', 'off', 'false', 'no'):
+            return None
+        return cls(mode=value if value in PROFILE_MODES else 'cprofile')
+
+    def _base_path(self, dataset_name, algorithm_name):
+        stem = os.path.splitext(os.path.basename(dataset_name))[0]
+        stem = re.sub(r'[^A-Za-z0-9_.-]', '_', stem)
+        return os.path.join(self.output_dir, f"{stem}_{algorithm_name}")
+
+    @contextlib.contextmanager
+    def profile(self, algorithm_name, fallback_name='dataset'):
+        """
+        Profile le bloc et écrit les fichiers à la sortie (y compris si le
+        bloc est interrompu: délai dépassé, annulation)
+
+        Args:
+            algorithm_name: Algorithme profilé
+            fallback_name: Nom du dataset si dataset_name n'est pas positionné
+        """
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        profiler = cProfile.Profile() if self.mode == 'cprofile' else None
+
+        start_time = time.perf_counter()
+        sampler.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+            elapsed = time.perf_counter() - start_time
+            self.last = self._write(
+                self.dataset_name or fallback_name, algorithm_name, profiler, sampler, elapsed
+            )
+
+    def _write(self, dataset_name, algorithm_name, profiler, sampler, elapsed):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = self._base_path(dataset_name, algorithm_name)
+        files = []
+
+        collapsed_path = f"{base}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as file:
+            for stack, count in sampler.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        files.append(collapsed_path)
+
+        if profiler is not None:
+            pstats_path = f"{base}.pstats"
+            profiler.dump_stats(pstats_path)
+            files.append(pstats_path)
+            top = self._top_from_pstats(profiler)
+        else:
+            top = self._top_from_samples(sampler, elapsed)
+
+        return {
+            'algorithm': algorithm_name,
+            'mode': self.mode,
+            'elapsed': elapsed,
+            'samples': sum(sampler.stacks.values()),
+            'files': files,
+            'top': top
+        }
+
+    @staticmethod
+    def _top_from_pstats(profiler):
+        """Fonctions au temps propre le plus élevé (mesure cProfile)"""
+        stats = pstats.Stats(profiler)
+        rows = []
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in stats.stats.items():
+            rows.append({
+                'function': f"{name} ({os.path.basename(filename)}:{line})",
+                'calls': calls,
+                'self_time': self_time,
+                'cumulative': cumulative
+            })
+        rows.sort(key=lambda row: row['self_time'], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+    @staticmethod
+    def _top_from_samples(sampler, elapsed):
+        """
+        Fonctions au temps propre le plus élevé (estimé par échantillonnage)
+
+        Le temps propre est la part des échantillons multipliée par la durée
+        mesurée: le thread d'échantillonnage attend le GIL et prend moins
+        d'échantillons que prévu pendant les boucles serrées.
+        """
+        counts = sampler.self_counts()
+        total = sum(counts.values()) or 1
+        return [
+            {
+                'function': function,
+                'calls': None,
+                'self_time': elapsed * count / total,
+                'cumulative': None
+            }
+            for function, count in counts.most_common(TOP_FUNCTIONS)
+        ]
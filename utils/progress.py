@@ -0,0 +1,219 @@
+"""
+Progression des résolutions longues (débit mesuré et temps restant)
+
+Les solveurs ouvrent une tâche et signalent le travail accompli aux
+points où ils vérifient déjà l'annulation (toutes les N combinaisons, à
+chaque objet de la DP, tous les N nœuds):
+
+    with self.progress.task("DP", total=n, unit="actions") as task:
+        for i, action in enumerate(actions):
+            ...
+            task.update(i + 1)
+
+update() ne fait qu'une comparaison d'horloge tant que l'intervalle
+minimal n'est pas écoulé; le rendu (barre tqdm ou rappel) est limité à
+quelques fois par seconde.
+
+Rapporteurs:
+- NULL_PROGRESS   : aucun affichage (défaut des contrôleurs)
+- TqdmProgress    : barre tqdm sur stderr (débit, temps restant)
+- CallbackProgress: appelle une fonction avec un événement dict (batch,
+                    services)
+"""
+import contextlib
+import sys
+import time
+
+try:
+    from tqdm import tqdm
+except ImportError:  # tqdm absent: ligne de progression simple
+    tqdm = None
+
+
+class ProgressTask:
+    """Tâche en cours: travail accompli, débit lissé, temps restant"""
+
+    __slots__ = ('reporter', 'description', 'total', 'unit', 'initial', 'completed',
+                 'start_time', 'last_emit', 'emitted', 'rate', 'handle')
+
+    # Lissage exponentiel du débit entre deux rendus
+    SMOOTHING = 0.3
+
+    def __init__(self, reporter, description, total, unit, completed=0):
+        self.reporter = reporter
+        self.description = description
+        self.total = total
+        self.unit = unit
+        self.initial = completed
+        self.completed = completed
+        self.start_time = time.monotonic()
+        self.last_emit = self.start_time
+        # Travail accompli lors du dernier rendu
+        self.emitted = completed
+        self.rate = None
+        self.handle = None
+
+    def update(self, completed):
+        """Signale le travail accompli depuis le début de la tâche (valeur absolue)"""
+        now = time.monotonic()
+        if now - self.last_emit < self.reporter.min_interval:
+            self.completed = completed
+            return
+        elapsed = now - self.last_emit
+        instant = (completed - self.emitted) / elapsed if elapsed > 0 else 0.0
+        self.rate = instant if self.rate is None else (
+            self.SMOOTHING * instant + (1 - self.SMOOTHING) * self.rate
+        )
+        self.completed = completed
+        self.last_emit = now
+        self.reporter._emit(self, final=False)
+        self.emitted = completed
+
+    def eta(self):
+        """Secondes restantes estimées (None si le total ou le débit est inconnu)"""
+        if self.total is None or not self.rate:
+            return None
+        return max(0.0, (self.total - self.completed) / self.rate)
+
+    def event(self, final=False):
+        """Événement transmis aux rappels (sérialisable en JSON)"""
+        elapsed = time.monotonic() - self.start_time
+        return {
+            'description': self.description,
+            'unit': self.unit,
+            'completed': self.completed,
+            'total': self.total,
+            'elapsed': elapsed,
+            'rate': self.rate if not final else (
+                (self.completed - self.initial) / elapsed if elapsed > 0 else None
+            ),
+            'eta': self.eta() if not final else 0.0,
+            'done': final
+        }
+
+
+class ProgressReporter:
+    """Interface des rapporteurs de progression"""
+
+    def __init__(self, min_interval=0.25):
+        """
+        Args:
+            min_interval: Intervalle minimal entre deux rendus (secondes)
+        """
+        self.min_interval = min_interval
+
+    @contextlib.contextmanager
+    def task(self, description, total=None, unit='it', completed=0):
+        """
+        Tâche de progression (fermée même si la résolution est interrompue)
+
+        Args:
+            description: Libellé (nom du solveur)
+            total: Travail total en unités (None si inconnu: pas de temps restant)
+            unit: Unité de travail (combinaisons, actions, nœuds)
+            completed: Travail déjà accompli (reprise): exclu du débit
+        """
+        task = ProgressTask(self, description, total, unit, completed)
+        self._begin(task)
+        try:
+            yield task
+        finally:
+            self._emit(task, final=True)
+            self._end(task)
+
+    def for_worker(self, index):
+        """Rapporteur du index-ième processus d'une exécution en parallèle"""
+        return self
+
+    def _begin(self, task):
+        pass
+
+    def _emit(self, task, final):
+        pass
+
+    def _end(self, task):
+        pass
+
+
+class _NullTask:
+    """Tâche sans rapporteur: update() ne fait rien"""
+
+    def update(self, completed):
+        pass
+
+
+class _NullProgress(ProgressReporter):
+    """Aucun affichage: task() renvoie une tâche vide partagée"""
+
+    _NULL_TASK = contextlib.nullcontext(_NullTask())
+
+    def task(self, description, total=None, unit='it', completed=0):
+        return self._NULL_TASK
+
+
+class TqdmProgress(ProgressReporter):
+    """Barre de progression tqdm sur stderr (sans tqdm: ligne réécrite)"""
+
+    def __init__(self, min_interval=0.25, file=None, position=None):
+        """
+        Args:
+            min_interval: Intervalle minimal entre deux rendus (secondes)
+            file: Flux de sortie (None: stderr)
+            position: Ligne de la barre (processus en parallèle, None: courante)
+        """
+        super().__init__(min_interval)
+        self.file = file
+        self.position = position
+
+    def for_worker(self, index):
+        # Une ligne par processus: les barres ne s'écrasent pas
+        return TqdmProgress(self.min_interval, self.file, position=index)
+
+    def _begin(self, task):
+        if tqdm is not None:
+            task.handle = tqdm(
+                total=task.total, initial=task.completed, desc=task.description, unit=task.unit, unit_scale=True,
+                file=self.file or sys.stderr, mininterval=self.min_interval, leave=False,
+                dynamic_ncols=True, position=self.position
+            )
+
+    def _emit(self, task, final):
+        if task.handle is not None:
+            task.handle.update(task.completed - task.handle.n)
+            return
+        stream = self.file or sys.stderr
+        if final:
+            stream.write("\r" + " " * 100 + "\r")
+            return
+        total = f"/{task.total:,.0f}" if task.total is not None else ""
+        eta = task.eta()
+        remaining = f", reste ~{eta:.1f}s" if eta is not None else ""
+        stream.write(f"\r   {task.description}: {task.completed:,.0f}{total} {task.unit} "
+                     f"({task.rate or 0:,.0f}/s{remaining})")
+        stream.flush()
+
+    def _end(self, task):
+        if task.handle is not None:
+            task.handle.close()
+
+
+class CallbackProgress(ProgressReporter):
+    """Appelle callback(événement) à chaque rendu et à la fin de chaque tâche"""
+
+    def __init__(self, callback, min_interval=1.0):
+        """
+        Args:
+            callback: Fonction recevant le dict de ProgressTask.event()
+                (doit être sérialisable par pickle pour les processus isolés
+                sous spawn: fonction de module ou functools.partial)
+            min_interval: Intervalle minimal entre deux appels (secondes)
+        """
+        super().__init__(min_interval)
+        self.callback = callback
+
+    def _emit(self, task, final):
+        self.callback(task.event(final))
+
+
+# Rapporteur désactivé partagé (valeur par défaut des contrôleurs)
+NULL_PROGRESS = _NullProgress()
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import time
+
+
+def dataset_digest(actions):
+    """Empreinte du contenu d'un dataset (identifiants, coûts, rendements)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for action in actions:
+        digest.update(f"{action.id}\x1f{action.cost}\x1f{action.profit_pct!r}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache disque des résultats de résolution, adressé par le contenu
+
+    Une entrée par triplet (dataset, budget, algorithme) et par version du
+    solveur. La taille totale est bornée: les entrées les moins récemment
+    utilisées (date de modification du fichier) sont supprimées en premier.
+    """
+
+    def __init__(self, cache_dir=os.path.join('.cache', 'results'), max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(digest, budget, algorithm_name, solver_version):
+        raw = f"{digest}|{budget}|{algorithm_name}|{solver_version}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=20).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Retourne l'enregistrement en cache, ou None"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                record = json.load(file)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+
+        # Marquer l'entrée comme récemment utilisée (politique LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return record
+
+    def put(self, key, record):
+        """Enregistre un résultat puis applique la limite de taille"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(dict(record, created_at=time.time()), file)
+        os.replace(tmp_path, path)
+        self._enforce_limit()
+
+    def _enforce_limit(self):
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total_size += stat.st_size
+
+        # Supprimer les plus anciennes jusqu'à repasser sous la limite
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -0,0 +1,70 @@
+import sys
+from collections import OrderedDict
+
+
+def estimate_actions_size(actions):
+    """Estimation de l'empreinte mémoire d'une liste d'actions (octets)"""
+    if not actions:
+        return sys.getsizeof(actions)
+    sample = actions[0]
+    per_action = (
+        sys.getsizeof(sample)
+        + sys.getsizeof(sample.__dict__)
+        + sum(sys.getsizeof(value) for value in sample.__dict__.values())
+    )
+    return sys.getsizeof(actions) + per_action * len(actions)
+
+
+class SessionCache:
+    """
+    Cache LRU en mémoire pour la durée d'une session interactive
+
+    La taille de chaque entrée est estimée à l'insertion; les entrées les
+    moins récemment utilisées sont retirées dès que la limite est dépassée.
+    """
+
+    def __init__(self, max_mb=256):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # clé -> (valeur, taille)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size_bytes=None):
+        if size_bytes is None:
+            size_bytes = sys.getsizeof(value)
+        if size_bytes > self.max_bytes:
+            # Trop gros pour le cache: ne pas vider tout le reste pour lui
+            return False
+
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (value, size_bytes)
+        self.current_bytes += size_bytes
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+        return True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'used_mb': self.current_bytes / 1024 / 1024,
+            'max_mb': self.max_bytes / 1024 / 1024
+        }
@@ -7,6 +7,8 @@ import os
 import time
 from typing import List, Dict, Any
 
+from utils.calibration import format_duration
+
 
 class ConsoleView:
     """Vue console professionnelle et compacte"""
@@ -117,6 +119,14 @@ class ConsoleView:
         
         return file_mapping
     
+    @classmethod
+    def display_cache_stats(cls, stats):
+        """Ligne compacte: compteurs du cache de session"""
+        hits = cls._c(f"{stats['hits']} hits", 'green')
+        misses = cls._c(f"{stats['misses']} misses", 'yellow')
+        usage = f"{stats['used_mb']:.1f}/{stats['max_mb']:.0f} Mo"
+        print(cls._c("Cache session: ", 'gray') + f"{hits} / {misses}  |  {cls._c(usage, 'gray')}")
+    
     @classmethod
     def get_file_choice(cls, file_mapping):
         """Prompt de sélection amélioré"""
@@ -157,7 +167,7 @@ class ConsoleView:
     # ========================================================================
     
     @classmethod
-    def display_algorithm_selection_menu(cls, recommended, name_mapping, n_actions):
+    def display_algorithm_selection_menu(cls, recommended, name_mapping, n_actions, plan=None):
         """
         Menu interactif de sélection des algorithmes
         
@@ -165,6 +175,7 @@ class ConsoleView:
             recommended: Liste des algorithmes recommandés
             name_mapping: Dict {key: (name, key)}
             n_actions: Nombre d'actions dans le dataset
+            plan: Plan du planificateur (estimations temps/mémoire), optionnel
         
         Returns:
             Liste des algorithmes sélectionnés [(name, key), ...]
@@ -183,6 +194,16 @@ class ConsoleView:
                 name, key = name_mapping[algo_key]
                 available_algorithms.append((i, name, key))
         
+        if plan is not None:
+            choice_name = name_mapping.get(plan['choice'], (plan['choice'],))[0]
+            print(cls._c("Plan recommande: ", 'white', 'bold') + cls._c(choice_name, 'green', 'bold'))
+            print(cls._c(f"    {plan['reason']}", 'gray'))
+            if plan['calibrated']:
+                print(cls._c("    Estimations calibrees pour cette machine", 'gray'))
+            else:
+                print(cls._c("    Estimations par defaut (calibrer: python -m utils.calibration)", 'gray'))
+            print()
+        
         # Afficher les options avec détails
         print(cls._c("Algorithmes disponibles pour ce dataset:", 'white', 'bold'))
         print()
@@ -197,21 +218,44 @@ class ConsoleView:
                 color = 'cyan'
                 desc = "Programmation dynamique - OPTIMAL et RAPIDE"
                 time_est = f"~{n_actions * 500000 / 1000000:.1f}s"
+            elif "Separation" in name:
+                color = 'blue'
+                desc = "Separation et evaluation (borne LP) - OPTIMAL, souvent tres rapide"
+                time_est = "< 1s (typique)"
+            elif "Course" in name:
+                color = 'yellow'
+                desc = "Strategies en parallele - s'arrete des que l'optimum est prouve"
+                time_est = "meilleur algorithme pour l'instance"
             else:  # Glouton
                 color = 'green'
                 desc = "Heuristique gloutonne - TRES RAPIDE (~98% optimal)"
                 time_est = "< 0.01s"
             
+            estimate = plan['estimates'].get(key) if plan is not None else None
+            if estimate is not None:
+                time_est = (f"{cls._format_duration(estimate['time'])} | "
+                            f"memoire {cls._format_memory(estimate['memory_mb'])} | {estimate['guarantee']}")
+            
             num_str = cls._c(f"[{num}]", color, 'bold')
             name_str = cls._c(name, color, 'bold')
+            if plan is not None and key == plan['choice']:
+                name_str += cls._c("  [RECOMMANDE]", 'green', 'bold')
             
             print(f"{num_str} {name_str}")
             print(f"    {desc}")
             print(f"    Temps estime: {cls._c(time_est, 'gray')}")
             print()
         
-        # Avertissement Force Brute si > 20
-        if n_actions > 20 and "brute_force" not in recommended:
+        # Algorithmes écartés par le planificateur
+        if plan is not None:
+            for key, estimate in plan['estimates'].items():
+                if key not in recommended and key in name_mapping:
+                    print(cls._c(
+                        f"[ECARTE] {name_mapping[key][0]}: {cls._format_duration(estimate['time'])}, "
+                        f"{cls._format_memory(estimate['memory_mb'])} (hors limites)", 'yellow'
+                    ))
+            print()
+        elif n_actions > 20 and "brute_force" not in recommended:
             print(cls._c("[ATTENTION] Force Brute desactivee: dataset trop grand (>20 actions)", 'yellow', 'bold'))
             print()
         
@@ -257,6 +301,18 @@ class ConsoleView:
             except ValueError:
                 print(cls._c("Erreur: Entree invalide", 'red'))
     
+    @staticmethod
+    def _format_duration(seconds):
+        """Durée estimée lisible (ms, s, min, h, jours)"""
+        return format_duration(seconds)
+    
+    @staticmethod
+    def _format_memory(memory_mb):
+        """Mémoire estimée lisible (Ko, Mo)"""
+        if memory_mb < 1:
+            return f"~{max(1, memory_mb * 1024):.0f} Ko"
+        return f"~{memory_mb:,.1f} Mo"
+    
     # ========================================================================
     # EN-TÊTE DE TRAITEMENT
     # ========================================================================
@@ -309,14 +365,16 @@ class ConsoleView:
     # ========================================================================
     
     @classmethod
-    def display_algorithm_result(cls, algorithm_name, portfolio, execution_time):
-        """Affichage compact des résultats"""
+    def display_algorithm_result(cls, algorithm_name, portfolio, execution_time, cached=False):
+        """Affichage compact des résultats (cached: résultat issu du cache, temps d'origine)"""
         
         # Couleurs par algorithme
         algo_colors = {
             "Force Brute": 'magenta',
             "Programmation Dynamique": 'cyan',
-            "Algorithme Glouton": 'green'
+            "Separation et Evaluation": 'blue',
+            "Algorithme Glouton": 'green',
+            "Course d'Algorithmes": 'yellow'
         }
         algo_color = algo_colors.get(algorithm_name, 'blue')
         
@@ -329,7 +387,10 @@ class ConsoleView:
         efficiency = (portfolio.total_profit / portfolio.total_cost) * 100 if portfolio.total_cost > 0 else 0
         
         # Ligne 1: Temps, Coût, Profit
-        l1 = f"Temps: {cls._c(f'{execution_time:.3f}s', 'white', 'bold')}  |  "
+        l1 = f"Temps: {cls._c(f'{execution_time:.3f}s', 'white', 'bold')}"
+        if cached:
+            l1 += f" {cls._c('(cached)', 'gray')}"
+        l1 += "  |  "
         l1 += f"Coût: {cls._c(f'{portfolio.total_cost:,} F', 'yellow', 'bold')}  |  "
         l1 += f"Profit: {cls._c(f'{portfolio.total_profit:,.0f} F', 'green', 'bold')}"
         print(l1)
@@ -387,7 +448,25 @@ class ConsoleView:
         
         avg_return = (portfolio.total_profit / portfolio.total_cost * 100) if portfolio.total_cost > 0 else 0
         print(cls._c(f"Rendement moyen: {avg_return:.2f}%", 'cyan', 'bold'))
-    
+
+    @classmethod
+    def display_profile_summary(cls, profile):
+        """Fonctions au temps propre le plus élevé d'une résolution profilée"""
+        print()
+        source = "cProfile" if profile['mode'] == 'cprofile' else f"{profile['samples']} echantillons"
+        print(cls._c(f"PROFIL ({source}, {profile['elapsed']:.3f}s)", 'white', 'bold'))
+        cls._line("─", 80, 'gray')
+
+        header = f"{'FONCTION':<52} {'APPELS':>9} {'PROPRE':>8} {'CUMULE':>8}"
+        print(cls._c(header, 'white', 'bold'))
+        for row in profile['top']:
+            calls = f"{row['calls']:>9,}" if row['calls'] is not None else f"{'-':>9}"
+            cumulative = f"{row['cumulative']:>7.3f}s" if row['cumulative'] is not None else f"{'-':>8}"
+            print(f"{row['function'][:52]:<52} {calls} {row['self_time']:>7.3f}s {cumulative}")
+
+        for path in profile['files']:
+            print(cls._c(f"[INFO] {path}", 'gray'))
+
     # ========================================================================
     # ANALYSE DE COMPLEXITÉ
     # ========================================================================
@@ -458,7 +537,8 @@ class ConsoleView:
             best_result = file_results[best_algo]
             
             summary = f"Meilleur: {cls._c(best_algo, 'green', 'bold')} "
-            summary += f"({cls._c(f'{best_result['profit']:,.0f} F', 'green', 'bold')})  |  "
+            best_profit_str = f"{best_result['profit']:,.0f} F"
+            summary += f"({cls._c(best_profit_str, 'green', 'bold')})  |  "
             summary += f"Plus rapide: {cls._c(fastest_algo, 'cyan', 'bold')} "
             summary += f"({cls._c(f'{fastest_time:.3f}s', 'cyan', 'bold')})"
             print(summary)
@@ -477,6 +557,162 @@ class ConsoleView:
         
         cls._line("═", 80, 'cyan')
     
+    # ========================================================================
+    # PHASES MESURÉES (PerformanceTracker)
+    # ========================================================================
+    
+    @classmethod
+    def display_trace(cls, spans):
+        """Arbre des phases: durée, pic mémoire et compteurs"""
+        print()
+        cls._header("PHASES D'EXÉCUTION", color='blue')
+        
+        def show(span, depth):
+            label = f"{'  ' * depth}{span['name']}"
+            memory = f"rss max {span['max_rss_mb']:,.0f} Mo"
+            if 'peak_alloc_mb' in span:
+                memory += f" | alloc {span['peak_alloc_mb']:,.2f} Mo"
+            counters = "  ".join(f"{k}={v:,}" for k, v in span.get('counters', {}).items())
+            duration = f"{span['duration_ms']:>10.2f} ms"
+            print(f"{label:<34} {cls._c(duration, 'white', 'bold')}  "
+                  f"{cls._c(memory, 'gray')}  {cls._c(counters, 'cyan')}")
+            for child in span.get('children', []):
+                show(child, depth + 1)
+        
+        for span in spans:
+            show(span, 0)
+        
+        cls._line("═", 80, 'blue')
+    
+    # ========================================================================
+    # BANC D'ESSAI
+    # ========================================================================
+    
+    @classmethod
+    def display_benchmark_results(cls, cases):
+        """Tableau des mesures du banc d'essai (temps en ms)"""
+        print()
+        cls._header("BANC D'ESSAI", color='cyan')
+        
+        header = f"{'SOLVEUR':<24} {'N':>5} {'BUDGET':>9} {'MÉDIANE':>11} {'IQR':>9} {'P95':>11} {'MÉMOIRE':>9}"
+        print(cls._c(header, 'white', 'bold'))
+        cls._line("─", 80, 'gray')
+        
+        for case in cases:
+            stats = case['stats']
+            median = f"{stats['median'] * 1000:>11.3f}"
+            print(
+                f"{case['solver']:<24} {case['n']:>5} {case['budget']:>9,} "
+                f"{cls._c(median, 'green')} {stats['iqr'] * 1000:>9.3f} {stats['p95'] * 1000:>11.3f} "
+                f"{case['peak_memory_mb']:>7.2f}Mo"
+            )
+        
+        cls._line("═", 80, 'cyan')
+    
+    @classmethod
+    def display_benchmark_comparison(cls, rows, threshold):
+        """Comparaison des médianes avec une référence"""
+        print()
+        cls._header("COMPARAISON AVEC LA RÉFÉRENCE", color='cyan')
+        
+        header = f"{'SOLVEUR':<24} {'N':>5} {'BUDGET':>9} {'AVANT':>11} {'APRÈS':>11} {'RATIO':>7}"
+        print(cls._c(header, 'white', 'bold'))
+        cls._line("─", 80, 'gray')
+        
+        for row in rows:
+            ratio = f"{row['ratio']:>6.2f}x"
+            if row['regression']:
+                ratio = cls._c(ratio + " REGRESSION", 'red', 'bold')
+            elif row['ratio'] < 1 - threshold:
+                ratio = cls._c(ratio, 'green')
+            print(
+                f"{row['solver']:<24} {row['n']:>5} {row['budget']:>9,} "
+                f"{row['before'] * 1000:>9.3f}ms {row['after'] * 1000:>9.3f}ms {ratio}"
+            )
+        
+        cls._line("─", 80, 'gray')
+        regressions = sum(1 for row in rows if row['regression'])
+        if regressions:
+            cls.display_error(f"{regressions} regression(s) au-dela de {threshold:.0%}")
+        else:
+            cls.display_success(f"Aucune regression au-dela de {threshold:.0%}")
+        cls._line("═", 80, 'cyan')
+
+    # ========================================================================
+    # TEST DIFFÉRENTIEL
+    # ========================================================================
+
+    @classmethod
+    def display_differential_report(cls, speeds, repros, n_cases, total_time):
+        """Vitesse par solveur et cas minimaux des échecs du test différentiel"""
+        print()
+        cls._header(f"TEST DIFFÉRENTIEL ({n_cases:,} instances, {total_time:.1f}s)", color='cyan')
+
+        header = f"{'SOLVEUR':<28} {'CAS':>7} {'ÉCHECS':>7} {'MÉDIANE':>11} {'P95':>11} {'TOTAL':>9}"
+        print(cls._c(header, 'white', 'bold'))
+        cls._line("─", 80, 'gray')
+
+        for row in speeds:
+            failures = f"{row['failures']:>7}"
+            failures = cls._c(failures, 'red', 'bold') if row['failures'] else cls._c(failures, 'green')
+            print(
+                f"{row['solver']:<28} {row['cases']:>7,} {failures} "
+                f"{row['median'] * 1000:>9.3f}ms {row['p95'] * 1000:>9.3f}ms {row['total']:>8.2f}s"
+            )
+
+        cls._line("─", 80, 'gray')
+        if not repros:
+            cls.display_success("Tous les résultats sont faisables et conformes a l'oracle")
+        for repro in repros:
+            cls.display_error(
+                f"{repro['solver']}: {repro['failure']} (graine {repro['seed']}, "
+                f"{repro['n']} actions, budget {repro['budget']:,})"
+            )
+            print(f"   {repro['message']}")
+            print(f"   Cas minimal: {repro['path']}")
+        cls._line("═", 80, 'cyan')
+
+    # ========================================================================
+    # RÉSUMÉ DU MODE BATCH
+    # ========================================================================
+    
+    @classmethod
+    def display_batch_summary(cls, rows, total_time):
+        """Tableau récapitulatif des résolutions du mode batch"""
+        print()
+        cls._header("RÉSUMÉ DU BATCH", color='cyan')
+        
+        header = f"{'DATASET':<22} {'ALGORITHME':<20} {'BUDGET':>9} {'N':>6} {'PROFIT':>12} {'TEMPS':>9} {'STATUT':<8}"
+        print(cls._c(header, 'white', 'bold'))
+        cls._line("─", 80, 'gray')
+        
+        status_colors = {'ok': 'green', 'timeout': 'yellow', 'cancelled': 'yellow'}
+        ordered = sorted(rows, key=lambda r: (r['dataset'], r['budget'], r['algorithm']))
+        
+        for row in ordered:
+            portfolio = row['portfolio']
+            profit = f"{portfolio.total_profit:,.0f}" if portfolio is not None else "-"
+            cached = "*" if portfolio is not None and portfolio.from_cache else " "
+            dataset = os.path.basename(row['dataset'])[:22]
+            status = cls._c(f"{row['status']:<8}", status_colors.get(row['status'], 'red'))
+            
+            print(
+                f"{dataset:<22} {row['algorithm']:<20} {row['budget']:>9,} {row['n_actions']:>6} "
+                f"{cls._c(f'{profit:>12}', 'green')} {row['execution_time']:>8.3f}s{cached}{status}"
+            )
+        
+        cls._line("─", 80, 'gray')
+        
+        ok_count = sum(1 for row in rows if row['status'] == 'ok')
+        rate = len(rows) / total_time * 60 if total_time > 0 else 0
+        print(f"Résolutions: {cls._c(f'{ok_count}/{len(rows)}', 'cyan', 'bold')}  |  "
+              f"Durée: {cls._c(f'{total_time:.2f}s', 'white', 'bold')}  |  "
+              f"Débit: {cls._c(f'{rate:,.0f}/min', 'magenta', 'bold')}")
+        if any(row['portfolio'] is not None and row['portfolio'].from_cache for row in rows):
+            print(cls._c("* résultat issu du cache (temps d'origine)", 'gray', 'dim'))
+        
+        cls._line("═", 80, 'cyan')
+    
     # ========================================================================
     # MENU DE CONTINUATION
     # ========================================================================